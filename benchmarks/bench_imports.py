@@ -0,0 +1,68 @@
+"""Cold-start import time of the dashboard and CLI, before vs after lazy imports.
+
+Each case runs in a fresh interpreter; modules that are not installed are
+reported and skipped.
+
+    python benchmarks/bench_imports.py --repeat 5
+"""
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMMON = ["streamlit", "pandas", "plotly.graph_objects", "plotly.express"]
+
+CASES = {
+    # What pages/dashboard.py imported at the top of every run before
+    "dashboard (eager)": COMMON + [
+        "matplotlib.pyplot", "requests",
+        "reportlab.platypus", "reportlab.lib.styles", "reportlab.lib.pagesizes",
+        "reportlab.lib", "tempfile"
+    ],
+    # What it imports now; report/reportlab load only when a PDF is requested
+    "dashboard (lazy)": COMMON + [
+        "crypto_risk.config", "crypto_risk.fetcher", "crypto_risk.price_store",
+        "crypto_risk.bars", "crypto_risk.risk_engine", "crypto_risk.scheduler"
+    ],
+    "cli --help": ["crypto_risk.__main__"],
+}
+
+
+def available(module):
+    try:
+        return importlib.util.find_spec(module.split(".")[0]) is not None
+    except ValueError:
+        return False
+
+
+def cold_import(modules):
+    code = "; ".join(f"import {m}" for m in modules) or "pass"
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    interpreter = min(cold_import([]) for _ in range(args.repeat))
+    print(f"bare interpreter: {interpreter * 1000:.0f} ms (subtracted below)")
+
+    for label, modules in CASES.items():
+        missing = [m for m in modules if not available(m)]
+        present = [m for m in modules if m not in missing]
+
+        seconds = min(cold_import(present) for _ in range(args.repeat)) - interpreter
+        note = f"  (not installed: {', '.join(missing)})" if missing else ""
+        print(f"  {label:<20} {seconds * 1000:7.0f} ms{note}")
+
+
+if __name__ == "__main__":
+    main()
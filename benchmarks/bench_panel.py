@@ -0,0 +1,122 @@
+"""Memory benchmark: per-coin DataFrames vs one PricePanel.
+
+Synthetic hourly prices are written to a throwaway PriceStore and loaded
+back in each layout. Resident size is `memory_usage(deep=True)` for the
+DataFrames and `nbytes` for the panel; build peak is the tracemalloc peak
+while the layout is created from the store.
+
+    python benchmarks/bench_panel.py                     # 1,000 coins x 1 year
+    python benchmarks/bench_panel.py --coins 200 --days 90
+
+Per-coin layouts are independent, so they are measured on `--sample`
+coins and scaled to `--coins` (the string-date layout alone would need
+several GB at full size); the panels are always built in full.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crypto_risk.panel import PricePanel  # noqa: E402
+from crypto_risk.price_store import PriceStore  # noqa: E402
+from crypto_risk.synthetic import coin_ids, synthetic_history  # noqa: E402
+
+MB = 1024 * 1024
+
+
+def traced(func):
+    """(result, peak traced MB, seconds) of one call."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = func()
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak / MB, seconds
+
+
+# -------------------------------------------------
+# LAYOUTS
+# -------------------------------------------------
+
+def legacy_frames(store, ids):
+    # data_fetch.py before the PriceStore: date strings + price per coin
+    frames = {}
+    for coin_id in ids:
+        df = store.load(coin_id)
+        frames[coin_id] = pd.DataFrame({"date": df["date"].dt.strftime("%Y-%m-%d"),
+                                        "price": df["price"]})
+    return frames
+
+
+def dashboard_frames(store, ids):
+    # The old dashboard: stored columns plus derived ones, one frame per coin
+    frames = {}
+    for coin_id in ids:
+        df = store.load(coin_id)
+        df["daily_return"] = df["price"].pct_change()
+        df["rolling_volatility"] = df["daily_return"].rolling(window=3).std() * 100
+        frames[coin_id] = df
+    return frames
+
+
+def store_frames(store, ids):
+    return {coin_id: store.load(coin_id) for coin_id in ids}
+
+
+def frames_size(frames):
+    return sum(df.memory_usage(deep=True).sum() for df in frames.values()) / MB
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--coins", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--sample", type=int, default=50,
+                        help="coins actually loaded for the per-coin layouts")
+    args = parser.parse_args()
+
+    ids = coin_ids(args.coins)
+    sample = ids[:min(args.sample, args.coins)]
+    scale = args.coins / len(sample)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PriceStore(tmp)
+        for coin_id, timestamps, prices in synthetic_history(ids, args.days):
+            store.append(coin_id, pd.DataFrame({"timestamp": timestamps, "price": prices}))
+        n_points = len(store.arrays(ids[0])[0])
+
+        rows = []
+        for label, build in [
+            ("legacy frames (str date, price)", legacy_frames),
+            ("dashboard frames (+2 derived)", dashboard_frames),
+            ("store.load() frames", store_frames),
+        ]:
+            frames, peak, seconds = traced(lambda: build(store, sample))
+            rows.append((label, frames_size(frames) * scale, peak * scale, seconds * scale))
+            del frames
+
+        for dtype in ("float64", "float32"):
+            panel, peak, seconds = traced(lambda: PricePanel.from_store(store, ids, dtype=dtype))
+            rows.append((f"PricePanel {dtype}", panel.nbytes / MB, peak, seconds))
+            del panel
+
+    print(f"{args.coins} coins x {args.days} days hourly ({n_points} points per coin); "
+          f"per-coin layouts scaled from {len(sample)} coins")
+    print(f"  {'layout':<34} {'resident MB':>12} {'build peak MB':>14} {'build s':>8}")
+    baseline = rows[2][1]
+    for label, resident, peak, seconds in rows:
+        print(f"  {label:<34} {resident:12.1f} {peak:14.1f} {seconds:8.2f}"
+              f"   ({resident / baseline:5.0%} of store.load)")
+
+
+if __name__ == "__main__":
+    main()
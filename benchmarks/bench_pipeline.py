@@ -0,0 +1,217 @@
+"""Pipeline benchmark: store -> load -> risk scores -> daily bars -> PDF.
+
+Prices come from the synthetic GBM-with-jumps generator, written to a
+throwaway PriceStore, so nothing touches the network. Each stage reports its
+best wall time over `--repeat` runs and its peak traced memory (one extra
+run under tracemalloc).
+
+    python benchmarks/bench_pipeline.py --coins 5 50 500 --days 30 365
+    python benchmarks/bench_pipeline.py --coins 5000 --days 3650 --freq 1d
+    python benchmarks/bench_pipeline.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_pipeline.py --baseline benchmarks/baseline.json
+
+With `--baseline`, stages slower (or hungrier) than the baseline by more than
+`--tolerance` are flagged and the script exits with status 1.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crypto_risk.bars import FREQUENCIES, bar_panel  # noqa: E402
+from crypto_risk.price_store import PriceStore  # noqa: E402
+from crypto_risk.risk_engine import classify, compute_risk, price_matrix, returns_matrix  # noqa: E402
+from crypto_risk.synthetic import coin_ids, synthetic_history  # noqa: E402
+
+MB = 1024 * 1024
+
+# Differences smaller than this are timer / allocator noise, never regressions
+NOISE_FLOOR = {"seconds": 0.005, "peak_mb": 0.5}
+
+
+# -------------------------------------------------
+# MEASUREMENT
+# -------------------------------------------------
+
+def measure(func, repeat):
+    """(best seconds, peak traced MB, result of the last call)."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return min(timings), peak / MB, result
+
+
+def pdf_available():
+    return all(importlib.util.find_spec(m) for m in ("kaleido", "reportlab"))
+
+
+# -------------------------------------------------
+# ONE CASE (n_coins x days)
+# -------------------------------------------------
+
+def run_case(n_coins, days, freq, repeat, backend, with_pdf):
+    results = {}
+    ids = coin_ids(n_coins)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PriceStore(tmp, backend=backend)
+
+        # Ingest once (timed, not traced: it is the setup for the other stages)
+        start = time.perf_counter()
+        for coin_id, timestamps, prices in synthetic_history(ids, days, FREQUENCIES[freq]):
+            store.append(coin_id, pd.DataFrame({"timestamp": timestamps, "price": prices}))
+        results["store append"] = {"seconds": time.perf_counter() - start, "peak_mb": None}
+
+        def stage(name, func):
+            seconds, peak_mb, result = measure(func, repeat)
+            results[name] = {"seconds": seconds, "peak_mb": peak_mb}
+            return result
+
+        prices = stage("load", lambda: price_matrix({c: store.load(c, days=days) for c in ids}))
+        stage("returns", lambda: returns_matrix(prices))
+        risk_df = stage("risk scores", lambda: compute_risk(prices))
+        risk_df["Risk Level"] = stage("classify", lambda: classify(risk_df["Risk Score"]))
+
+        # What the dashboard does on load: daily bars for every coin in one panel
+        stage("daily bars", lambda: bar_panel({c: store.bars(c, "1d", days=days) for c in ids}))
+
+        if with_pdf:
+            results["pdf export"] = pdf_stage(risk_df, repeat)
+
+    return results
+
+
+def pdf_stage(risk_df, repeat):
+    # Imported here: plotly/reportlab are only needed for this stage
+    import plotly.express as px
+    from crypto_risk import report
+
+    counts = risk_df["Risk Level"].value_counts()
+    charts = [
+        ("Risk Score Comparison",
+         px.bar(risk_df, x="Coin", y="Risk Score", color="Risk Level"), 400, 300),
+        ("Risk–Return Comparison",
+         px.scatter(risk_df, x="Overall Volatility (%)", y="Risk Score", color="Risk Level"),
+         400, 300),
+        ("Risk Distribution",
+         px.pie(names=counts.index, values=counts.values, hole=0.55), 300, 300),
+    ]
+
+    def build():
+        # Cold build every time; the figure cache would hide render cost
+        report.clear_cache()
+        return report.build_pdf(risk_df, charts)
+
+    try:
+        seconds, peak_mb, _ = measure(build, repeat)
+    except Exception as e:
+        reason = next((line for line in str(e).splitlines() if line.strip()), type(e).__name__)
+        print(f"    pdf export skipped: {reason}")
+        return None
+    finally:
+        report.shutdown_renderers()
+
+    return {"seconds": seconds, "peak_mb": peak_mb}
+
+
+# -------------------------------------------------
+# BASELINES
+# -------------------------------------------------
+
+def regressions(results, baseline, tolerance):
+    """(case, stage, metric, baseline, now) for every stage over tolerance."""
+    flagged = []
+    for case, stages in results.items():
+        for stage, now in stages.items():
+            before = baseline.get(case, {}).get(stage)
+            if not now or not before:
+                continue
+            for metric in ("seconds", "peak_mb"):
+                if now[metric] is None or not before.get(metric):
+                    continue
+                if (now[metric] > before[metric] * (1 + tolerance)
+                        and now[metric] - before[metric] > NOISE_FLOOR[metric]):
+                    flagged.append((case, stage, metric, before[metric], now[metric]))
+    return flagged
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--coins", type=int, nargs="+", default=[5, 50, 500])
+    parser.add_argument("--days", type=int, nargs="+", default=[30, 365])
+    parser.add_argument("--freq", choices=list(FREQUENCIES), default="1h",
+                        help="spacing of the synthetic prices")
+    parser.add_argument("--max-points", type=int, default=50_000_000,
+                        help="skip cases with more coins x steps than this")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--backend", default="npy")
+    parser.add_argument("--no-pdf", action="store_true", help="skip the PDF export stage")
+    parser.add_argument("--baseline", help="JSON baseline to compare against")
+    parser.add_argument("--save-baseline", help="write these results as a JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown / memory growth before flagging (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    with_pdf = not args.no_pdf and pdf_available()
+    if not args.no_pdf and not with_pdf:
+        print("kaleido/reportlab not installed: skipping the PDF export stage")
+
+    steps_per_day = FREQUENCIES["1d"] // FREQUENCIES[args.freq]
+    results = {}
+
+    print(f"{'case':<30} {'stage':<14} {'time':>10} {'peak mem':>10}")
+    for n_coins in args.coins:
+        for days in args.days:
+            case = f"{n_coins} coins x {days} days @ {args.freq}"
+
+            if n_coins * days * steps_per_day > args.max_points:
+                print(f"{case:<30} skipped (over --max-points)")
+                continue
+
+            results[case] = run_case(n_coins, days, args.freq, args.repeat,
+                                     args.backend, with_pdf)
+
+            for stage, row in results[case].items():
+                if row is None:
+                    continue
+                peak = "" if row["peak_mb"] is None else f"{row['peak_mb']:.1f} MB"
+                print(f"{case:<30} {stage:<14} {row['seconds'] * 1000:>8.1f}ms {peak:>10}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+        flagged = regressions(results, baseline, args.tolerance)
+        for case, stage, metric, before, now in flagged:
+            print(f"REGRESSION {case} / {stage}: {metric} {before:.3f} -> {now:.3f}")
+
+        if flagged:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} of {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Report build-time benchmark for 5, 50 and 500 coins.
+
+Times a cold sequential build, a cold parallel build and a cached rebuild of
+the PDF report. Needs kaleido to be installed.
+
+    python benchmarks/bench_report.py --coins 5 50 500 --per-coin
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crypto_risk import report  # noqa: E402
+from crypto_risk.risk_engine import classify  # noqa: E402
+
+
+def synthetic_results(n_coins, seed=0):
+    rng = np.random.default_rng(seed)
+    overall = rng.uniform(0.2, 3.0, n_coins).round(2)
+    rolling = (overall * rng.uniform(0.6, 0.9, n_coins)).round(2)
+
+    df = pd.DataFrame({
+        "Coin": [f"Coin {i}" for i in range(n_coins)],
+        "Overall Volatility (%)": overall,
+        "Avg Rolling Volatility (%)": rolling,
+        "Risk Score": (overall * 0.6 + rolling * 0.4).round(2)
+    })
+    df["Risk Level"] = classify(df["Risk Score"])
+    return df
+
+
+def dashboard_charts(df, per_coin, seed=0):
+    counts = df["Risk Level"].value_counts()
+
+    charts = [
+        ("Risk Score Comparison",
+         px.bar(df, x="Coin", y="Risk Score", color="Risk Level"), 400, 300),
+        ("Risk–Return Comparison",
+         px.scatter(df, x="Overall Volatility (%)", y="Risk Score", color="Risk Level"), 400, 300),
+        ("Risk Distribution",
+         px.pie(names=counts.index, values=counts.values, hole=0.55), 300, 300),
+    ]
+
+    if per_coin:
+        rng = np.random.default_rng(seed)
+        for coin in df["Coin"]:
+            prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 720)))
+            charts.append((f"{coin} Price", go.Figure(go.Scatter(y=prices)), 400, 200))
+
+    return charts
+
+
+def timed(func, cold=False):
+    if cold:
+        report.clear_cache()
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--coins", type=int, nargs="+", default=[5, 50, 500])
+    parser.add_argument("--per-coin", action="store_true",
+                        help="add one price chart per coin to the report")
+    args = parser.parse_args()
+
+    # Start the worker pool before timing so every run sees warm renderers
+    report.render_figures([go.Figure(), go.Figure(layout={"title": "warm"})])
+
+    print(f"{'coins':>6} {'charts':>7} {'sequential':>12} {'parallel':>10} {'cached':>9}")
+    for n_coins in args.coins:
+        df = synthetic_results(n_coins)
+        charts = dashboard_charts(df, args.per_coin)
+
+        sequential = timed(lambda: report.build_pdf(df, charts, parallel=False), cold=True)
+        cold = timed(lambda: report.build_pdf(df, charts), cold=True)
+        cached = timed(lambda: report.build_pdf(df, charts))
+
+        print(f"{n_coins:>6} {len(charts):>7} {sequential:>11.2f}s {cold:>9.2f}s {cached:>8.2f}s")
+
+    report.shutdown_renderers()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Load-time benchmark: legacy 30-day CSVs vs the PriceStore backends.
+
+Run from the repository root:
+
+    python benchmarks/bench_storage.py --coins 500 --repeat 5
+"""
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crypto_risk.price_store import PriceStore  # noqa: E402
+
+HOUR_MS = 60 * 60 * 1000
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--coins", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    legacy_files = sorted(glob.glob("data/*_price_30_days.csv"))
+    if not legacy_files:
+        sys.exit("No data/*_price_30_days.csv files found; run from the repo root.")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_dir = os.path.join(tmp, "legacy")
+        os.makedirs(legacy_dir)
+
+        stores = {name: PriceStore(os.path.join(tmp, name), backend=name)
+                  for name in ("csv", "npy")}
+
+        # Replicate the committed CSVs until we have `--coins` coins
+        for i in range(args.coins):
+            source = pd.read_csv(legacy_files[i % len(legacy_files)])
+            source.to_csv(os.path.join(legacy_dir, f"coin{i}_price_30_days.csv"),
+                          index=False)
+
+            timestamps = np.arange(len(source), dtype="int64") * HOUR_MS
+            frame = pd.DataFrame({"timestamp": timestamps, "price": source["price"]})
+            for store in stores.values():
+                store.append(f"coin{i}", frame)
+
+        coin_ids = [f"coin{i}" for i in range(args.coins)]
+
+        def load_legacy():
+            for coin_id in coin_ids:
+                pd.read_csv(os.path.join(legacy_dir, f"{coin_id}_price_30_days.csv"))
+
+        def load_arrays(store):
+            return lambda: [store.arrays(coin_id) for coin_id in coin_ids]
+
+        def load_frames(store):
+            return lambda: [store.load(coin_id) for coin_id in coin_ids]
+
+        cases = [
+            ("legacy csv (date,price)", load_legacy),
+            ("csv backend  load()", load_frames(stores["csv"])),
+            ("npy backend  load()", load_frames(stores["npy"])),
+            ("npy backend  arrays()", load_arrays(stores["npy"])),
+        ]
+
+        print(f"{args.coins} coins, best of {args.repeat}")
+        baseline = None
+        for label, func in cases:
+            seconds = best_of(args.repeat, func)
+            baseline = baseline or seconds
+            print(f"  {label:<26} {seconds * 1000:9.1f} ms  ({baseline / seconds:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
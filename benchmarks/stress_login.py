@@ -0,0 +1,57 @@
+"""Concurrency stress test for the login event store.
+
+Many processes log in at the same time; afterwards every event must be
+present exactly once.
+
+    python benchmarks/stress_login.py --workers 32 --logins 200
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crypto_risk.login_store import LoginStore  # noqa: E402
+
+
+def login_many(db_path, worker, logins):
+    store = LoginStore(db_path, legacy_csv=None)
+    for _ in range(logins):
+        store.record(f"user{worker}", f"user{worker}@example.com")
+    return logins
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--logins", type=int, default=200, help="logins per worker")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "users.db")
+        store = LoginStore(db_path, legacy_csv=None)
+
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = [pool.submit(login_many, db_path, w, args.logins)
+                       for w in range(args.workers)]
+            expected = sum(f.result() for f in futures)
+        elapsed = time.perf_counter() - start
+
+        stored = store.count()
+        recent = store.recent("user0", limit=5)
+
+        print(f"{expected} logins from {args.workers} workers in {elapsed:.2f}s "
+              f"({expected / elapsed:,.0f}/s)")
+        print(f"stored: {stored}, latest for user0: {recent[0][2] if recent else None}")
+
+        if stored != expected or len(recent) != min(5, args.logins):
+            sys.exit("FAILED: lost or duplicated login events")
+        print("OK")
+
+
+if __name__ == "__main__":
+    main()
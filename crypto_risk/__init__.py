@@ -0,0 +1 @@
+"""Shared building blocks for the Crypto Volatility & Risk Analyzer."""
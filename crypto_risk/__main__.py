@@ -0,0 +1,44 @@
+"""Command line entry point.
+
+    python -m crypto_risk fetch      # update the local price store
+    python -m crypto_risk analyze    # score coins, write final_risk_analysis.csv
+    python -m crypto_risk schedule   # periodic background refresh
+    python -m crypto_risk sweep      # window / weight / cut-off sensitivity cube
+    python -m crypto_risk var        # VaR / CVaR per coin or portfolio
+    python -m crypto_risk forecast   # EWMA / GARCH(1,1) volatility forecasts
+    python -m crypto_risk perf       # timing / cache summary of data/perf.jsonl
+    python -m crypto_risk alerts     # stream Risk Level changes to sinks
+    python -m crypto_risk backtest   # hit rates of the Risk Levels over history
+    python -m crypto_risk stub-api   # local CoinGecko stand-in
+"""
+import importlib
+import sys
+
+# Sub-commands are imported only when used, so `--help` stays instant
+COMMANDS = {
+    "fetch": "crypto_risk.data_fetch",
+    "analyze": "crypto_risk.risk_analysis",
+    "schedule": "crypto_risk.scheduler",
+    "sweep": "crypto_risk.sweep",
+    "var": "crypto_risk.var",
+    "forecast": "crypto_risk.forecast",
+    "perf": "crypto_risk.perf",
+    "alerts": "crypto_risk.alerts",
+    "backtest": "crypto_risk.backtest",
+    "stub-api": "crypto_risk.stub_api"
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    if not argv or argv[0] not in COMMANDS:
+        print(__doc__.strip())
+        return 0 if argv and argv[0] in ("-h", "--help") else 2
+
+    module = importlib.import_module(COMMANDS[argv[0]])
+    return module.main(argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
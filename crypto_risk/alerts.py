@@ -0,0 +1,454 @@
+"""Streaming Risk Level alerts: one event per Stable / Alert / Extreme change.
+
+The batch run reclassifies every coin against quantiles of the whole
+`final_df`. Here each price tick updates only its own coin, in O(1):
+
+* the coin's StreamingVolatility (crypto_risk/streaming.py) gives the new
+  Risk Score,
+* two P² quantile sketches track the cross-coin low / high cut-offs
+  (30th / 70th percentile by default) without storing or sorting scores,
+* the coin is compared against the current cut-offs and, when its level
+  changes, an event goes to every sink.
+
+    python -m crypto_risk alerts --source synthetic --coins 2000 --speed 3600 --interval 5
+    python -m crypto_risk alerts --sink jsonl:data/alerts.jsonl --sink webhook:http://127.0.0.1:8000/alerts
+
+Sinks are objects with `emit(event)`: JsonlSink (append-only file),
+WebhookSink (JSON POST from a background thread, e.g. to the stub API) and
+QueueSink (in-process queue.Queue for another thread to consume). `emit`
+never blocks the tick loop on the network.
+"""
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from crypto_risk import config
+from crypto_risk.price_store import PriceStore
+from crypto_risk.risk_engine import RISK_LEVELS
+from crypto_risk.sources import SOURCES, get_source
+from crypto_risk.streaming import StreamingRiskMonitor
+from crypto_risk.synthetic import coin_ids as synthetic_coin_ids
+
+ALERTS_FILE = "data/alerts.jsonl"
+
+
+# -------------------------------------------------
+# P² QUANTILE SKETCH (JAIN & CHLAMTAC, 1985)
+# -------------------------------------------------
+
+class P2Quantile:
+    """Running estimate of the `p` quantile from five markers, O(1) per value.
+
+    The first five values are kept exactly; after that the middle marker
+    follows the quantile by piecewise-parabolic adjustment.
+    """
+
+    __slots__ = ("p", "count", "_q", "_n", "_want", "_step")
+
+    def __init__(self, p):
+        self.p = p
+        self.count = 0
+        self._q = []                                    # marker heights
+        self._n = [0, 1, 2, 3, 4]                       # marker positions
+        self._want = [0, 2 * p, 4 * p, 2 + 2 * p, 4]    # desired positions
+        self._step = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def update(self, x):
+        self.count += 1
+        q = self._q
+
+        if self.count <= 5:
+            q.append(x)
+            q.sort()
+            return
+
+        n = self._n
+
+        # Cell the new value falls into, stretching the extremes if needed
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        want = self._want
+        for i in range(5):
+            want[i] += self._step[i]
+
+        # Nudge the three middle markers towards their desired positions
+        for i in (1, 2, 3):
+            d = want[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < height < q[i + 1]:
+                    # Parabola overshot a neighbour; fall back to linear
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = height
+                n[i] += d
+
+    @property
+    def value(self):
+        if not self.count:
+            return None
+        if self.count <= 5:
+            return float(np.quantile(self._q, self.p))
+        return self._q[2]
+
+
+# -------------------------------------------------
+# SINKS
+# -------------------------------------------------
+
+class JsonlSink:
+    """Appends one JSON line per event (kept open; flushed every event)."""
+
+    def __init__(self, path=ALERTS_FILE):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._file = open(path, "a")
+
+    def emit(self, event):
+        self._file.write(json.dumps(event) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class QueueSink:
+    """Puts events on a queue.Queue for a consumer thread.
+
+    With a `maxsize`, events that find the queue full are dropped and
+    counted instead of blocking the caller.
+    """
+
+    def __init__(self, maxsize=0):
+        self.queue = queue.Queue(maxsize)
+        self.dropped = 0
+
+    def emit(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+
+class WebhookSink:
+    """POSTs each event as JSON from a background thread.
+
+    `emit` only queues the event (bounded by `maxsize`; overflow is dropped
+    and counted in `dropped`), so a slow or dead endpoint never stalls
+    `AlertEngine.update`. A failed delivery is reported, not raised.
+    """
+
+    _STOP = object()
+
+    def __init__(self, url, session=None, timeout=5, maxsize=1000):
+        from crypto_risk.fetcher import create_session
+
+        self.url = url
+        self.session = session or create_session(1)
+        self.timeout = timeout
+        self.failed = 0
+
+        self._pending = QueueSink(maxsize)
+        self._thread = threading.Thread(target=self._deliver, name="webhook-sink", daemon=True)
+        self._thread.start()
+
+    @property
+    def dropped(self):
+        return self._pending.dropped
+
+    def emit(self, event):
+        self._pending.emit(event)
+
+    def _deliver(self):
+        import requests
+
+        while True:
+            event = self._pending.queue.get()
+            if event is self._STOP:
+                return
+            try:
+                self.session.post(self.url, json=event, timeout=self.timeout).raise_for_status()
+            except requests.RequestException as e:
+                self.failed += 1
+                print(f"Webhook delivery to {self.url} failed: {e}")
+
+    def close(self, timeout=10):
+        """Deliver what is queued, then stop the thread (waits up to `timeout`)."""
+        try:
+            self._pending.queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+        if self.dropped:
+            print(f"Webhook {self.url}: {self.dropped} events dropped (queue full)")
+
+
+class PrintSink:
+
+    def emit(self, event):
+        print(f"[{time.strftime('%H:%M:%S', time.gmtime(event['timestamp'] / 1000))}] "
+              f"{event['coin']}: {event['from']} -> {event['to']} "
+              f"(score {event['risk_score']:.3f}, cut-offs {event['low']:.3f} / {event['high']:.3f})")
+
+
+def make_sink(spec):
+    """Sink from a CLI spec: print, queue, jsonl[:path] or webhook:url."""
+    kind, _, target = spec.partition(":")
+    if kind == "print":
+        return PrintSink()
+    if kind == "queue":
+        return QueueSink()
+    if kind == "jsonl":
+        return JsonlSink(target or ALERTS_FILE)
+    if kind == "webhook" and target:
+        return WebhookSink(target)
+    raise ValueError(f"Unknown sink '{spec}' (use print, queue, jsonl[:path] or webhook:url)")
+
+
+# -------------------------------------------------
+# ALERT ENGINE
+# -------------------------------------------------
+
+class AlertEngine:
+    """Incremental Risk Levels for any number of coins, one tick at a time.
+
+    `margin` is a relative dead band around the cut-offs: a coin must clear
+    a cut-off by that fraction before its level changes, so scores hovering
+    at a boundary do not flood the sinks.
+
+    The sketches see every score update, so busy coins weigh more than quiet
+    ones and old scores never leave. Every `rebase_every` updates they are
+    rebuilt from the latest score of each coin, which keeps the cut-offs
+    close to the current cross-section (an O(coins) step, amortized).
+
+    Each coin's Risk Score only looks at its last `overall_window` returns
+    (30 days of hourly ticks by default), so a coin's level follows its
+    current volatility however long the engine runs.
+    """
+
+    def __init__(self, sinks=(), window=7, weights=(0.6, 0.4), quantiles=(0.30, 0.70),
+                 margin=0.0, rebase_every=10_000, overall_window=30 * 24):
+        self.sinks = list(sinks)
+        self.quantiles = quantiles
+        self.margin = margin
+        self.rebase_every = rebase_every
+
+        self.monitor = StreamingRiskMonitor(window, weights, overall_window)
+        self.scores = {}   # coin -> latest Risk Score
+        self.levels = {}   # coin -> index into RISK_LEVELS
+
+        self.updates = 0
+        self.events = 0
+        self.rebase()
+
+    # ---------------- CUT-OFFS ----------------
+
+    def rebase(self):
+        """Restart both sketches from the latest score of every coin."""
+        self._low = P2Quantile(self.quantiles[0])
+        self._high = P2Quantile(self.quantiles[1])
+        for score in self.scores.values():
+            self._low.update(score)
+            self._high.update(score)
+        self._since_rebase = 0
+
+    @property
+    def thresholds(self):
+        return self._low.value, self._high.value
+
+    @staticmethod
+    def _level(score, low, high):
+        # Same rule as risk_engine.classify: <= low Stable, <= high Alert
+        return 0 if score <= low else 1 if score <= high else 2
+
+    # ---------------- TICKS ----------------
+
+    def seed(self, coin, prices):
+        """Warm a coin up from history; no events, level set on `prime`."""
+        estimator = self.monitor.estimator(coin)
+        for price in prices:
+            estimator.update(float(price))
+
+        score = estimator.risk_score
+        if score is not None:
+            self.scores[coin] = score
+
+    def prime(self):
+        """Rebuild the cut-offs and set every seeded coin's level silently."""
+        self.rebase()
+        low, high = self.thresholds
+        if low is None:
+            return
+        for coin, score in self.scores.items():
+            self.levels[coin] = self._level(score, low, high)
+
+    def update(self, coin, price, timestamp=None):
+        """Feed one tick; returns the level-change event, if any."""
+        estimator = self.monitor.estimator(coin)
+        estimator.update(price)
+        score = estimator.risk_score
+        if score is None:
+            return None
+
+        self.updates += 1
+        self.scores[coin] = score
+        self._low.update(score)
+        self._high.update(score)
+
+        self._since_rebase += 1
+        if self._since_rebase >= self.rebase_every:
+            self.rebase()
+
+        low, high = self.thresholds
+        current = self.levels.get(coin)
+        if current is None:
+            # First score for this coin: start tracking, nothing to report
+            self.levels[coin] = self._level(score, low, high)
+            return None
+
+        up = self._level(score, low * (1 + self.margin), high * (1 + self.margin))
+        down = self._level(score, low * (1 - self.margin), high * (1 - self.margin))
+        level = up if up > current else down if down < current else current
+        if level == current:
+            return None
+
+        self.levels[coin] = level
+        event = {
+            "coin": coin,
+            "from": RISK_LEVELS[current],
+            "to": RISK_LEVELS[level],
+            "risk_score": score,
+            "low": low,
+            "high": high,
+            "timestamp": int(timestamp if timestamp is not None else time.time() * 1000)
+        }
+        self.events += 1
+        for sink in self.sinks:
+            sink.emit(event)
+        return event
+
+    def update_many(self, coin, timestamps, prices):
+        """Feed a coin's new points in order; returns the events emitted."""
+        events = []
+        for timestamp, price in zip(timestamps, prices):
+            event = self.update(coin, float(price), int(timestamp))
+            if event is not None:
+                events.append(event)
+        return events
+
+    def counts(self):
+        counts = dict.fromkeys(RISK_LEVELS, 0)
+        for level in self.levels.values():
+            counts[RISK_LEVELS[level]] += 1
+        return counts
+
+
+# -------------------------------------------------
+# POLLING LOOP OVER A PRICE SOURCE
+# -------------------------------------------------
+
+def run(engine, store, coin_ids, interval=60, history_days=30, cycles=None):
+    """Seed from the store, then feed every new stored point to the engine."""
+    store.update(coin_ids, backfill_days=history_days)
+
+    fed = {}   # coin_id -> last timestamp fed
+    for coin_id in coin_ids:
+        arrays = store.arrays(coin_id, days=history_days)
+        if arrays is not None and len(arrays[0]):
+            engine.seed(coin_id, arrays[1])
+            fed[coin_id] = int(arrays[0][-1])
+    engine.prime()
+    print(f"Seeded {len(engine.scores)} coins; cut-offs {engine.thresholds}, levels {engine.counts()}")
+
+    cycle = 0
+    while cycles is None or cycle < cycles:
+        time.sleep(interval)
+        cycle += 1
+
+        start = time.perf_counter()
+        store.update(coin_ids, backfill_days=history_days)
+
+        ticks = 0
+        events = 0
+        for coin_id in coin_ids:
+            # Memory-mapped, so only the points after `last` are actually read
+            arrays = store.arrays(coin_id)
+            if arrays is None:
+                continue
+
+            last = fed.get(coin_id)
+            timestamps, prices = arrays
+            new = np.searchsorted(timestamps, last, side="right") if last is not None else 0
+            if new < len(timestamps):
+                events += len(engine.update_many(coin_id, timestamps[new:], prices[new:]))
+                ticks += len(timestamps) - new
+                fed[coin_id] = int(timestamps[-1])
+
+        print(f"cycle {cycle}: {ticks} ticks, {events} level changes in "
+              f"{time.perf_counter() - start:.2f}s; levels {engine.counts()}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream Risk Level changes as alerts")
+    parser.add_argument("--source", choices=list(SOURCES), default=config.DATA_SOURCE,
+                        help="where prices come from (see crypto_risk/sources.py)")
+    parser.add_argument("--data-dir", default=None,
+                        help="store root (default data/, or data/<source>/ for offline sources)")
+    parser.add_argument("--speed", type=float, default=None,
+                        help="replay / synthetic clock as a multiple of real time")
+    parser.add_argument("--coins", type=int, default=None,
+                        help="track N synthetic coin ids instead of config.COINS")
+    parser.add_argument("--interval", type=float, default=60, help="seconds between polls")
+    parser.add_argument("--cycles", type=int, default=None, help="stop after N polls")
+    parser.add_argument("--history-days", type=float, default=30,
+                        help="history used to warm up each coin")
+    parser.add_argument("--window", type=int, default=7)
+    parser.add_argument("--margin", type=float, default=0.0,
+                        help="relative dead band around the cut-offs")
+    parser.add_argument("--sink", action="append",
+                        help="print, jsonl[:path] or webhook:url (repeatable; default print + jsonl)")
+    args = parser.parse_args(argv)
+
+    coin_ids = (synthetic_coin_ids(args.coins) if args.coins
+                else list(config.COINS.values()))
+    sinks = [make_sink(spec) for spec in (args.sink or ["print", "jsonl"])]
+
+    options = {} if args.speed is None or args.source == "live" else {"speed": args.speed}
+    store = PriceStore(args.data_dir, source=get_source(args.source, **options))
+    # Scores cover the same span as the warm-up history (hourly points)
+    engine = AlertEngine(sinks, window=args.window, margin=args.margin,
+                         overall_window=max(int(args.history_days * 24), args.window + 1))
+
+    try:
+        run(engine, store, coin_ids, args.interval, args.history_days, args.cycles)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for sink in sinks:
+            if hasattr(sink, "close"):
+                sink.close()
+
+    print(f"{engine.updates} updates, {engine.events} alerts")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""Backtest of the Stable / Alert / Extreme labels over stored history.
+
+At every step (daily by default) each coin is scored on the trailing
+`days` of prices exactly as risk_analysis does, the scores are classified
+with the same percentile cut-offs, and the label is compared with what
+happened over the next `horizon` days:
+
+* realized forward volatility (std of returns, %),
+* maximum drawdown (%),
+* hit: the coin's forward volatility falls in the bucket it was labelled
+  (bottom 30% = Stable, top 30% = Extreme, by default).
+
+    python -m crypto_risk backtest --days 30 --horizon 7
+    python -m crypto_risk backtest --source synthetic --coins 500 --history-days 1825 \\
+        --refresh
+
+No per-window loop: trailing and forward moments come from running sums,
+so every window of every coin costs O(1), and drawdowns are taken over
+strided window views in chunks of steps. A coin is scored only once it
+has a full window of history, and never where its scoring or forward
+window touches a forward-filled cell (a gap in its history): those zero
+returns would otherwise read as a calm, "Stable" stretch.
+"""
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from crypto_risk import config
+from crypto_risk.bars import freq_ms
+from crypto_risk.panel import PricePanel
+from crypto_risk.planner import QueryPlanner
+from crypto_risk.price_store import MS_PER_DAY, PriceStore
+from crypto_risk.risk_engine import RISK_LEVELS
+from crypto_risk.sources import SOURCES, get_source
+from crypto_risk.storage import write_csv_atomic
+from crypto_risk.synthetic import coin_ids as synthetic_coin_ids
+
+BACKTEST_FILE = "data/backtest_summary.csv"
+
+# Steps per drawdown chunk; bounds the strided view at chunk x coins x horizon
+CHUNK_STEPS = 64
+
+
+# -------------------------------------------------
+# WINDOWED MOMENTS FROM RUNNING SUMS
+# -------------------------------------------------
+
+def window_std(x, n):
+    """Sample std of every length-`n` window along axis 0, aligned at its end.
+
+    Row t of the result covers x[t - n + 1 : t + 1]; rows without a full
+    window of finite values (including t < n - 1) are NaN.
+    """
+    valid = np.isfinite(x)
+
+    def sums(a):
+        c = np.zeros((len(a) + 1,) + a.shape[1:])
+        np.cumsum(a, axis=0, out=c[1:])
+        out = np.full(a.shape, np.nan)
+        out[n - 1:] = c[n:] - c[:-n]
+        return out
+
+    count = sums(valid.astype("float64"))
+    # Centre on the column mean first so the squares do not cancel badly
+    centred = np.where(valid, x - np.nanmean(x, axis=0), 0.0)
+    total_c = sums(centred)
+    total_sq = sums(centred ** 2)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = (total_sq - total_c ** 2 / n) / (n - 1)
+    std = np.sqrt(np.maximum(var, 0.0))
+    std[count < n] = np.nan
+    return std
+
+
+def window_mean(x, n):
+    """Mean of every full length-`n` window along axis 0, aligned at its end."""
+    valid = np.isfinite(x)
+    c = np.zeros((len(x) + 1,) + x.shape[1:])
+    np.cumsum(np.where(valid, x, 0.0), axis=0, out=c[1:])
+    k = np.zeros_like(c)
+    np.cumsum(valid, axis=0, out=k[1:])
+
+    out = np.full(x.shape, np.nan)
+    out[n - 1:] = (c[n:] - c[:-n]) / n
+    out[n - 1:][(k[n:] - k[:-n]) < n] = np.nan
+    return out
+
+
+def _levels(values, low, high):
+    """Per-row percentile labels, same rule as risk_engine.classify; -1 for NaN."""
+    low_threshold = np.nanquantile(values, low, axis=1)[:, None]
+    high_threshold = np.nanquantile(values, high, axis=1)[:, None]
+    levels = np.where(values <= low_threshold, 0, np.where(values <= high_threshold, 1, 2))
+    levels[np.isnan(values)] = -1
+    return levels.astype("int8")
+
+
+def _max_drawdown(prices, ends, horizon):
+    """Worst peak-to-trough fall (%) over prices[e : e + horizon + 1] per end e."""
+    windows = np.lib.stride_tricks.sliding_window_view(prices, horizon + 1, axis=0)
+    path = windows[ends]                                    # (steps, coins, horizon + 1)
+    return -(path / np.maximum.accumulate(path, axis=-1) - 1).min(axis=-1) * 100
+
+
+# -------------------------------------------------
+# BACKTEST
+# -------------------------------------------------
+
+def run_backtest(prices, points_per_day, days=30, horizon=7, step=1, window=7,
+                 weights=(0.6, 0.4), quantiles=(0.30, 0.70), max_workers=None,
+                 observed=None):
+    """Labels and forward outcomes at every step of a time x coin price array
+    (e.g. `PricePanel.prices`).
+
+    `days`, `horizon` and `step` are in days, `window` in points (as in
+    risk_analysis). `observed` (e.g. `PricePanel.observed`) marks the cells
+    that hold a real close; windows touching any other cell get level -1.
+    Returns a dict of (steps x coins) arrays plus `ends`, the row of
+    `prices` each step is scored at.
+    """
+    lookback = int(days * points_per_day)        # returns in the scoring window
+    ahead = int(horizon * points_per_day)        # returns in the forward window
+    stride = max(int(step * points_per_day), 1)
+
+    returns = prices[1:] / prices[:-1] - 1
+    if observed is not None:
+        # Into or out of a filled cell is a padded or gap-spanning return;
+        # as NaN it invalidates every window that contains it
+        returns[~(observed[1:] & observed[:-1])] = np.nan
+    returns = np.vstack([np.full((1, prices.shape[1]), np.nan), returns])
+
+    # Same statistics as risk_engine.compute_risk, for every trailing window
+    overall = window_std(returns, lookback) * 100
+    rolling = window_std(returns, window) * 100
+    avg_rolling = window_mean(rolling, lookback - window + 1)
+    scores = np.round(overall * weights[0] + avg_rolling * weights[1], 2)
+
+    # Forward volatility over the next `ahead` returns, realigned to the step
+    forward = np.full(returns.shape, np.nan)
+    forward[:-ahead] = window_std(returns, ahead)[ahead:] * 100
+
+    ends = np.arange(lookback, len(prices) - ahead, stride)
+    if not len(ends):
+        return None
+
+    scores = scores[ends]
+    forward = forward[ends]
+
+    chunks = [ends[i:i + CHUNK_STEPS] for i in range(0, len(ends), CHUNK_STEPS)]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        drawdown = np.vstack(list(pool.map(lambda c: _max_drawdown(prices, c, ahead), chunks)))
+
+    levels = _levels(scores, *quantiles)
+    realized = _levels(forward, *quantiles)
+    levels[np.isnan(forward)] = -1
+    realized[levels < 0] = -1
+
+    return {
+        "ends": ends,
+        "scores": scores,
+        "levels": levels,
+        "realized": realized,
+        "forward_volatility": forward,
+        "max_drawdown": drawdown
+    }
+
+
+def rank_correlation(scores, forward):
+    """Mean cross-coin Spearman correlation of score vs forward volatility."""
+    a = pd.DataFrame(scores).rank(axis=1).to_numpy()
+    b = pd.DataFrame(forward).rank(axis=1).to_numpy()
+    mask = np.isfinite(a) & np.isfinite(b)
+
+    a = np.where(mask, a - np.nanmean(np.where(mask, a, np.nan), axis=1, keepdims=True), 0.0)
+    b = np.where(mask, b - np.nanmean(np.where(mask, b, np.nan), axis=1, keepdims=True), 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = (a * b).sum(axis=1) / np.sqrt((a ** 2).sum(axis=1) * (b ** 2).sum(axis=1))
+    return float(np.nanmean(corr)) if np.isfinite(corr).any() else None
+
+
+def summarize(result):
+    """One row per Risk Level: outcomes and hit rate against the base rate."""
+    levels = result["levels"]
+    scored = levels >= 0
+
+    rows = []
+    for i, level in enumerate(RISK_LEVELS):
+        labelled = levels == i
+        n = int(labelled.sum())
+        forward = result["forward_volatility"][labelled]
+        drawdown = result["max_drawdown"][labelled]
+        rows.append({
+            "Risk Level": level,
+            "Observations": n,
+            "Fwd Volatility (%)": round(float(np.mean(forward)), 3) if n else None,
+            "Median Fwd Volatility (%)": round(float(np.median(forward)), 3) if n else None,
+            "Avg Max Drawdown (%)": round(float(np.nanmean(drawdown)), 2) if n else None,
+            "Hit Rate (%)": round(100 * float((result["realized"][labelled] == i).mean()), 1) if n else None,
+            # What labelling at random would score
+            "Base Rate (%)": round(100 * float((result["realized"][scored] == i).mean()), 1)
+                             if scored.any() else None
+        })
+    return pd.DataFrame(rows)
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest the Risk Level classifier")
+    parser.add_argument("--days", type=float, default=30, help="scoring lookback in days")
+    parser.add_argument("--horizon", type=float, default=7, help="forward window in days")
+    parser.add_argument("--step", type=float, default=1, help="days between scoring dates")
+    parser.add_argument("--window", type=int, default=7, help="rolling window in points")
+    parser.add_argument("--quantiles", type=float, nargs=2, default=[0.30, 0.70])
+    parser.add_argument("--freq", default="1h", help="price grid (1h, 4h or 1d bars)")
+    parser.add_argument("--history-days", type=float, default=None,
+                        help="only the last N days of stored history")
+    parser.add_argument("--coins", type=int, default=None,
+                        help="backtest N synthetic coin ids instead of config.COINS")
+    parser.add_argument("--refresh", action="store_true",
+                        help="fetch --history-days of prices before the backtest")
+    parser.add_argument("--source", choices=list(SOURCES), default=config.DATA_SOURCE,
+                        help="where prices come from (see crypto_risk/sources.py)")
+    parser.add_argument("--data-dir", default=None,
+                        help="store root (default data/, or data/<source>/ for offline sources)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default=BACKTEST_FILE)
+    args = parser.parse_args(argv)
+
+    coin_ids = (synthetic_coin_ids(args.coins) if args.coins
+                else list(config.COINS.values()))
+    store = PriceStore(args.data_dir, source=get_source(args.source))
+
+    if args.refresh:
+        QueryPlanner(store).execute([(coin_id, args.history_days or 365, config.DEFAULT_CURRENCY)
+                                     for coin_id in coin_ids])
+
+    panel = PricePanel.from_store(store, coin_ids, args.freq, args.history_days)
+    points_per_day = MS_PER_DAY / freq_ms(args.freq)
+
+    result = None
+    if panel.coins:
+        result = run_backtest(panel.prices, points_per_day, args.days, args.horizon, args.step,
+                              args.window, quantiles=tuple(args.quantiles),
+                              max_workers=args.workers, observed=panel.observed)
+    if result is None:
+        print("Not enough stored history for one scoring window plus the horizon.")
+        return 1
+
+    summary = summarize(result)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    write_csv_atomic(summary, args.output)
+
+    first, last = pd.to_datetime(panel.timestamps[result["ends"][[0, -1]]], unit="ms")
+    print(f"{len(result['ends'])} scoring dates x {len(panel.coins)} coins, "
+          f"{first:%Y-%m-%d} .. {last:%Y-%m-%d}")
+    print(summary.to_string(index=False))
+
+    ic = rank_correlation(result["scores"], result["forward_volatility"])
+    if ic is not None:
+        print(f"Mean rank correlation, Risk Score vs forward volatility: {ic:.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+HOUR_MS = 60 * 60 * 1000
+
+# Supported bar sizes (UTC-aligned buckets)
+FREQUENCIES = {
+    "1h": HOUR_MS,
+    "4h": 4 * HOUR_MS,
+    "1d": 24 * HOUR_MS
+}
+
+BAR_DTYPE = np.dtype([
+    ("timestamp", "<i8"),   # bucket start, epoch ms
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("mean", "<f8"),
+    ("count", "<i8")
+])
+
+
+# -------------------------------------------------
+# RESAMPLING (VECTORIZED)
+# -------------------------------------------------
+
+def freq_ms(freq):
+    try:
+        return FREQUENCIES[freq]
+    except KeyError:
+        raise ValueError(f"Unknown bar frequency '{freq}' "
+                         f"(choose from {', '.join(FREQUENCIES)})")
+
+
+def resample(timestamps, prices, freq="1d"):
+    """OHLC, mean and tick count per bucket as a structured array.
+
+    `timestamps` must be sorted ascending (as PriceStore keeps them).
+    """
+    timestamps = np.asarray(timestamps, dtype="int64")
+    prices = np.asarray(prices, dtype="float64")
+
+    if len(timestamps) == 0:
+        return np.empty(0, dtype=BAR_DTYPE)
+
+    step = freq_ms(freq)
+    buckets = timestamps // step
+
+    # First index of every bucket; buckets are contiguous because ts is sorted
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(prices)]
+    counts = ends - starts
+
+    bars = np.empty(len(starts), dtype=BAR_DTYPE)
+    bars["timestamp"] = buckets[starts] * step
+    bars["open"] = prices[starts]
+    bars["close"] = prices[ends - 1]
+    bars["high"] = np.maximum.reduceat(prices, starts)
+    bars["low"] = np.minimum.reduceat(prices, starts)
+    bars["mean"] = np.add.reduceat(prices, starts) / counts
+    bars["count"] = counts
+
+    return bars
+
+
+def to_frame(bars):
+    df = pd.DataFrame(bars)
+    df["date"] = pd.to_datetime(df["timestamp"], unit="ms")
+    return df
+
+
+def bar_panel(bar_frames, column="mean"):
+    """One bar-start x coin DataFrame from per-coin bar frames."""
+    series = {name: bars.set_index("date")[column]
+              for name, bars in bar_frames.items()
+              if bars is not None and len(bars)}
+
+    if not series:
+        return pd.DataFrame()
+
+    panel = pd.DataFrame(series).sort_index()
+    panel.index.name = "Date"
+    return panel
+
+
+# -------------------------------------------------
+# MATERIALIZED BARS ON DISK
+# -------------------------------------------------
+
+class BarStore:
+    """Keeps `<root>/bars/<coin>_<freq>.npy` in step with the raw prices."""
+
+    def __init__(self, root, frequencies=("1d",)):
+        self.root = os.path.join(root, "bars")
+        self.frequencies = tuple(frequencies)
+        os.makedirs(self.root, exist_ok=True)
+
+    def path(self, coin_id, freq):
+        return os.path.join(self.root, f"{coin_id}_{freq}.npy")
+
+    def read(self, coin_id, freq):
+        path = self.path(coin_id, freq)
+        if not os.path.exists(path):
+            return None
+        return np.load(path, mmap_mode="r")
+
+    def rebuild(self, coin_id, timestamps, prices):
+        """Recompute every bar from scratch (history was rewritten)."""
+        for freq in self.frequencies:
+            if os.path.exists(self.path(coin_id, freq)):
+                os.remove(self.path(coin_id, freq))
+        self.refresh(coin_id, timestamps, prices)
+
+    def refresh(self, coin_id, timestamps, prices):
+        """Recompute bars from the last (possibly partial) bar onwards."""
+        for freq in self.frequencies:
+            existing = self.read(coin_id, freq)
+
+            if existing is None or len(existing) == 0:
+                bars = resample(timestamps, prices, freq)
+            else:
+                last_start = existing["timestamp"][-1]
+                start = np.searchsorted(timestamps, last_start, side="left")
+                tail = resample(timestamps[start:], prices[start:], freq)
+                bars = np.concatenate([np.array(existing[:-1]), tail])
+
+            tmp_path = self.path(coin_id, freq) + ".tmp.npy"
+            np.save(tmp_path, bars)
+            os.replace(tmp_path, self.path(coin_id, freq))
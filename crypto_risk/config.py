@@ -0,0 +1,64 @@
+import os
+
+# -------------------------------------------------
+# COINS TO ANALYZE (display name -> CoinGecko ID)
+# -------------------------------------------------
+
+COINS = {
+    "Bitcoin": "bitcoin",
+    "Ethereum": "ethereum",
+    "Solana": "solana",
+    "Cardano": "cardano",
+    "Dogecoin": "dogecoin"
+}
+
+# -------------------------------------------------
+# API SETTINGS
+# -------------------------------------------------
+
+# Point this at a local stub server to run without network access
+API_URL = os.environ.get("COINGECKO_API_URL", "https://api.coingecko.com/api/v3")
+
+DEFAULT_DAYS = "30"
+DEFAULT_CURRENCY = "usd"
+
+# History `fetch` / the scheduler keep stored for the dashboard's trend
+# slider (beyond 90 days CoinGecko only has daily points; see planner.py)
+HISTORY_DAYS = int(os.environ.get("CRYPTO_RISK_HISTORY_DAYS", "365"))
+
+# Currencies the dashboard can convert to (one FX series each)
+CURRENCIES = ["usd", "eur", "gbp", "jpy", "inr"]
+
+# Concurrent requests in flight against the API
+MAX_WORKERS = int(os.environ.get("COINGECKO_MAX_WORKERS", "8"))
+
+# Requests per second allowed across all workers (0 = unlimited)
+RATE_LIMIT = float(os.environ.get("COINGECKO_RATE_LIMIT", "0"))
+
+# get_json retry settings for fetches made while a page renders: one
+# failing coin must not hold the dashboard for long (batch jobs keep the
+# defaults). Worst case per coin is about timeout * 2 + max_wait seconds.
+INTERACTIVE_RETRY = {"retries": 1, "backoff": 0.5, "timeout": 5, "max_wait": 2.0}
+
+# -------------------------------------------------
+# DATA SOURCE (see crypto_risk/sources.py)
+# -------------------------------------------------
+
+# "live" (CoinGecko), "replay" (recorded history) or "synthetic"
+DATA_SOURCE = os.environ.get("CRYPTO_RISK_SOURCE", "live")
+
+# Replay: a PriceStore directory or a folder of <coin>_price_*_days.csv files
+REPLAY_PATH = os.environ.get("CRYPTO_RISK_REPLAY_PATH", "data")
+
+# Replay speed as a multiple of real time (0 = serve the whole archive at once)
+REPLAY_SPEED = float(os.environ.get("CRYPTO_RISK_REPLAY_SPEED", "0"))
+
+SYNTHETIC_SEED = int(os.environ.get("CRYPTO_RISK_SYNTHETIC_SEED", "0"))
+SYNTHETIC_HISTORY_DAYS = float(os.environ.get("CRYPTO_RISK_SYNTHETIC_HISTORY_DAYS", "365"))
+
+# -------------------------------------------------
+# STORAGE SETTINGS
+# -------------------------------------------------
+
+# "npy" (memory-mapped typed columns) or "csv" (plain text)
+STORAGE_BACKEND = os.environ.get("CRYPTO_RISK_STORAGE", "npy")
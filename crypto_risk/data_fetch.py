@@ -0,0 +1,51 @@
+"""Append the latest prices of every coin to the local price store.
+
+    python -m crypto_risk fetch
+"""
+import argparse
+
+from crypto_risk import config
+from crypto_risk.planner import QueryPlanner
+from crypto_risk.price_store import PriceStore
+from crypto_risk.sources import SOURCES, get_source
+
+
+def fetch_prices(store=None, coins=config.COINS, days=config.HISTORY_DAYS,
+                 currencies=config.CURRENCIES):
+    """Fetch only the missing range per coin; returns series_id -> rows written.
+
+    Keeps `days` of history plus the FX series for `currencies` stored, so
+    the dashboard only ever reads locally.
+    """
+    # Append-only store: after the first run only the hours since the last run are fetched
+    store = store or PriceStore()
+    return QueryPlanner(store).execute([(coin_id, days, currency)
+                                        for coin_id in coins.values()
+                                        for currency in currencies])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Update the local price store")
+    parser.add_argument("--data-dir", default=None,
+                        help="store root (default data/, or data/<source>/ for offline sources)")
+    parser.add_argument("--days", type=int, default=config.HISTORY_DAYS,
+                        help="history to keep stored")
+    parser.add_argument("--source", choices=list(SOURCES), default=config.DATA_SOURCE,
+                        help="where prices come from (see crypto_risk/sources.py)")
+    args = parser.parse_args(argv)
+
+    store = PriceStore(args.data_dir, source=get_source(args.source))
+    written = fetch_prices(store, days=args.days)
+
+    # Report each cryptocurrency
+    for coin_name, coin_id in config.COINS.items():
+
+        rows = written.get(coin_id, 0)
+
+        if rows is None:
+            print(f"Skipping {coin_name} (No data found)")
+            continue
+
+        print(f"{coin_name}: {rows} new rows saved to {store.path(coin_id)}")
+
+    return 0
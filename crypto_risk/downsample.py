@@ -0,0 +1,82 @@
+"""Point-count reduction for long time series before they are charted.
+
+Both functions return sorted indices into the input, so any number of
+aligned columns (timestamps, prices, ...) can be sliced with the same
+selection. Inputs at or below the target size come back untouched.
+"""
+import numpy as np
+
+METHODS = ("lttb", "minmax")
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: `n_out` indices that keep the shape.
+
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    kept point and the average of the next bucket.
+    """
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    n = len(x)
+
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype("int64")
+
+    keep = np.empty(n_out, dtype="int64")
+    keep[0], keep[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+
+    return keep
+
+
+def minmax(y, n_out):
+    """Lowest and highest point of each of `n_out // 2` equal buckets.
+
+    Cheaper than LTTB and never hides a spike, at the cost of a slightly
+    jagged line.
+    """
+    y = np.asarray(y, dtype="float64")
+    n = len(y)
+
+    n_buckets = n_out // 2
+    if n_out >= n or n_buckets < 1:
+        return np.arange(n)
+
+    size = -(-n // n_buckets)
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(n_buckets, size)
+
+    # Buckets past the end of the data are all-NaN; drop them
+    valid = ~np.isnan(padded).all(axis=1)
+    offsets = np.arange(n_buckets)[valid] * size
+    padded = padded[valid]
+
+    low = offsets + np.nanargmin(padded, axis=1)
+    high = offsets + np.nanargmax(padded, axis=1)
+
+    return np.unique(np.concatenate([[0, n - 1], low, high]))
+
+
+def downsample(x, y, n_out, method="lttb"):
+    """Indices of at most ~`n_out` points of (x, y) chosen by `method`."""
+    if method == "lttb":
+        return lttb(x, y, n_out)
+    if method == "minmax":
+        return minmax(y, n_out)
+    raise ValueError(f"Unknown downsampling method '{method}' (choose from {', '.join(METHODS)})")
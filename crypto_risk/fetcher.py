@@ -0,0 +1,177 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from crypto_risk import config, perf
+
+
+# -------------------------------------------------
+# SHARED HTTP SESSION
+# -------------------------------------------------
+
+def create_session(pool_size=None):
+    """Return a keep-alive session whose pool fits `pool_size` workers."""
+    pool_size = pool_size or config.MAX_WORKERS
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    return session
+
+
+class RateLimiter:
+    """Spaces calls at least `1 / rate` seconds apart across threads."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# -------------------------------------------------
+# REQUEST WITH RETRY / BACKOFF
+# -------------------------------------------------
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def _retry_delay(response, attempt, backoff):
+    # Honour the server's Retry-After header when it sends one
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+
+    return backoff * (2 ** attempt) + random.uniform(0, backoff)
+
+
+def get_json(session, path, params=None, retries=4, backoff=1.0, timeout=10,
+             limiter=None, max_wait=None):
+    """GET `path` from the API, retrying on rate limits and server errors.
+
+    With `max_wait`, a retry that would mean sleeping longer than that
+    (e.g. a long Retry-After) gives up instead.
+    """
+    url = f"{config.API_URL}{path}"
+
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            limiter.wait()
+
+        response = error = None
+        try:
+            response = session.get(url, params=params, timeout=timeout)
+            if response.status_code not in RETRY_STATUS:
+                response.raise_for_status()
+                return response.json()
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            error = e
+
+        delay = _retry_delay(response, attempt, backoff)
+        if attempt == retries or (max_wait is not None and delay > max_wait):
+            if error is not None:
+                raise error
+            response.raise_for_status()
+
+        time.sleep(delay)
+
+
+# -------------------------------------------------
+# MARKET CHART FETCHING
+# -------------------------------------------------
+
+def _get_prices(coin_id, path, params, session=None, limiter=None, **kwargs):
+    session = session or create_session(1)
+
+    try:
+        data = get_json(session, path, params, limiter=limiter, **kwargs)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"Error fetching data for {coin_id}: {e}")
+        return None
+
+    if "prices" not in data or len(data["prices"]) == 0:
+        return None
+
+    df = pd.DataFrame(data["prices"], columns=["timestamp", "price"])
+    df["timestamp"] = df["timestamp"].astype("int64")
+    df["date"] = pd.to_datetime(df["timestamp"], unit="ms")
+
+    return df
+
+
+def fetch_market_chart(coin_id, days=config.DEFAULT_DAYS,
+                       vs_currency=config.DEFAULT_CURRENCY, session=None,
+                       limiter=None, **kwargs):
+    """Return a timestamp/price/date DataFrame for one coin, or None."""
+    params = {
+        "vs_currency": vs_currency,
+        "days": str(days)
+    }
+    return _get_prices(coin_id, f"/coins/{coin_id}/market_chart", params,
+                       session=session, limiter=limiter, **kwargs)
+
+
+def fetch_market_chart_range(coin_id, start_ms, end_ms,
+                             vs_currency=config.DEFAULT_CURRENCY, session=None,
+                             limiter=None, **kwargs):
+    """Like `fetch_market_chart` for the points between two epoch-ms times.
+
+    CoinGecko answers ranges of 2-90 days with hourly points.
+    """
+    params = {
+        "vs_currency": vs_currency,
+        "from": str(int(start_ms) // 1000),
+        "to": str(int(end_ms) // 1000)
+    }
+    return _get_prices(coin_id, f"/coins/{coin_id}/market_chart/range", params,
+                       session=session, limiter=limiter, **kwargs)
+
+
+@perf.timed("fetch prices")
+def fetch_many(coin_ids, days=config.DEFAULT_DAYS,
+               vs_currency=config.DEFAULT_CURRENCY, max_workers=None,
+               rate_limit=None, session=None, **kwargs):
+    """Fetch several coins concurrently over one pooled session.
+
+    `days` is either one value for every coin or a dict of coin_id -> days.
+    Returns a dict of coin_id -> DataFrame (or None when a coin failed),
+    in the same order as `coin_ids`.
+    """
+    coin_ids = list(coin_ids)
+    max_workers = max(1, min(max_workers or config.MAX_WORKERS, len(coin_ids) or 1))
+    rate_limit = config.RATE_LIMIT if rate_limit is None else rate_limit
+
+    session = session or create_session(max_workers)
+    limiter = RateLimiter(rate_limit)
+
+    def fetch_one(coin_id):
+        coin_days = days.get(coin_id) if isinstance(days, dict) else days
+        return fetch_market_chart(coin_id, coin_days, vs_currency,
+                                  session=session, limiter=limiter, **kwargs)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        frames = list(pool.map(fetch_one, coin_ids))
+
+    return dict(zip(coin_ids, frames))
@@ -0,0 +1,318 @@
+"""EWMA and GARCH(1,1) volatility forecasts with a fitted-model cache.
+
+Forecasts are in % over the next day / week, where a day is
+`steps_per_day` return periods (24 for the hourly series risk_analysis uses).
+
+    python -m crypto_risk forecast
+"""
+import argparse
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from crypto_risk.portfolio import EWMA_LAMBDA
+from crypto_risk.storage import root_lock
+
+# Kept in the PriceStore root, so `--data-dir` scratch stores get their own
+MODEL_CACHE_FILE = "models.json"
+
+STEPS_PER_DAY = 24
+
+
+# -------------------------------------------------
+# EWMA
+# -------------------------------------------------
+
+def ewma_variance(returns, lam=EWMA_LAMBDA):
+    """Next-period variance from the RiskMetrics recursion."""
+    r = np.asarray(returns, dtype="float64")
+    r = r[~np.isnan(r)]
+
+    variance = r.var() if len(r) else 0.0
+    for x in r:
+        variance = lam * variance + (1 - lam) * x * x
+    return variance
+
+
+# -------------------------------------------------
+# GARCH(1,1) WITH VARIANCE TARGETING
+# -------------------------------------------------
+
+def _garch_params(theta, long_run):
+    # Unconstrained (u, v) -> alpha, beta with alpha + beta < 1
+    persistence = 1 / (1 + math.exp(-theta[0]))
+    share = 1 / (1 + math.exp(-theta[1]))
+    alpha = persistence * share
+    beta = persistence * (1 - share)
+    omega = long_run * (1 - persistence)
+    return omega, alpha, beta
+
+
+def _garch_theta(alpha, beta):
+    persistence = min(max(alpha + beta, 1e-6), 1 - 1e-6)
+    share = min(max(alpha / persistence, 1e-6), 1 - 1e-6)
+    return np.array([math.log(persistence / (1 - persistence)),
+                     math.log(share / (1 - share))])
+
+
+def _neg_log_likelihood(theta, r, long_run):
+    omega, alpha, beta = _garch_params(theta, long_run)
+
+    variance = long_run
+    total = 0.0
+    for x in r:
+        total += math.log(variance) + x * x / variance
+        variance = omega + alpha * x * x + beta * variance
+    return 0.5 * total
+
+
+def _nelder_mead(func, x0, step=0.5, tol=1e-6, max_iter=300):
+    # Small dependency-free Nelder-Mead for the 2 GARCH parameters
+    simplex = [np.asarray(x0, dtype="float64")]
+    for i in range(len(x0)):
+        point = simplex[0].copy()
+        point[i] += step
+        simplex.append(point)
+    values = [func(p) for p in simplex]
+
+    for _ in range(max_iter):
+        order = np.argsort(values)
+        simplex = [simplex[i] for i in order]
+        values = [values[i] for i in order]
+
+        if abs(values[-1] - values[0]) < tol:
+            break
+
+        centroid = np.mean(simplex[:-1], axis=0)
+        reflected = centroid + (centroid - simplex[-1])
+        f_reflected = func(reflected)
+
+        if f_reflected < values[0]:
+            expanded = centroid + 2 * (centroid - simplex[-1])
+            f_expanded = func(expanded)
+            if f_expanded < f_reflected:
+                simplex[-1], values[-1] = expanded, f_expanded
+            else:
+                simplex[-1], values[-1] = reflected, f_reflected
+        elif f_reflected < values[-2]:
+            simplex[-1], values[-1] = reflected, f_reflected
+        else:
+            contracted = centroid + 0.5 * (simplex[-1] - centroid)
+            f_contracted = func(contracted)
+            if f_contracted < values[-1]:
+                simplex[-1], values[-1] = contracted, f_contracted
+            else:
+                best = simplex[0]
+                simplex = [best + 0.5 * (p - best) for p in simplex]
+                values = [func(p) for p in simplex]
+
+    best = int(np.argmin(values))
+    return simplex[best], values[best]
+
+
+def fit_garch(returns, start=None):
+    """Fit GARCH(1,1) by Gaussian MLE; `start` = (alpha, beta) warm start."""
+    r = np.asarray(returns, dtype="float64")
+    r = r[~np.isnan(r)]
+    r = r - r.mean()
+
+    long_run = float(r.var())
+    if len(r) < 10 or long_run <= 0:
+        return None
+
+    theta0 = _garch_theta(*(start or (0.08, 0.90)))
+    theta, nll = _nelder_mead(lambda t: _neg_log_likelihood(t, r.tolist(), long_run), theta0)
+    omega, alpha, beta = _garch_params(theta, long_run)
+
+    # Filter through the sample to get next-period variance
+    variance = long_run
+    for x in r:
+        variance = omega + alpha * x * x + beta * variance
+
+    return {
+        "omega": omega,
+        "alpha": alpha,
+        "beta": beta,
+        "long_run_variance": long_run,
+        "next_variance": variance,
+        "neg_log_likelihood": nll
+    }
+
+
+def garch_horizon_variance(model, steps):
+    """Cumulative variance over the next `steps` periods."""
+    persistence = model["alpha"] + model["beta"]
+    long_run = model["long_run_variance"]
+    excess = model["next_variance"] - long_run
+
+    k = np.arange(steps)
+    return float(np.sum(long_run + persistence ** k * excess))
+
+
+# -------------------------------------------------
+# PER-COIN FORECAST + CACHE
+# -------------------------------------------------
+
+def model_key(coin, days=None, currency="usd", freq="raw"):
+    """Cache key: one fitted model per coin, return window, currency and sampling.
+
+    Two series that end at the same watermark (e.g. 7 vs 30 days, USD vs
+    EUR) are different samples and must not share a fit.
+    """
+    return f"{coin}|{'all' if days is None else f'{days}d'}|{currency}|{freq}"
+
+
+def _fit_coin(returns, watermark, cached):
+    """Fit (or reuse) one coin's models; returns the cache entry."""
+    if cached and cached.get("watermark") == watermark:
+        return cached
+
+    start = None
+    if cached and cached.get("garch"):
+        start = (cached["garch"]["alpha"], cached["garch"]["beta"])
+
+    return {
+        "watermark": watermark,
+        "ewma_variance": ewma_variance(returns),
+        "garch": fit_garch(returns, start)
+    }
+
+
+def forecast_entry(entry, steps_per_day=STEPS_PER_DAY):
+    """Volatility forecasts (in %) from a cache entry."""
+    ewma_day = math.sqrt(entry["ewma_variance"] * steps_per_day) * 100
+    row = {
+        "EWMA Vol 1d (%)": ewma_day,
+        "EWMA Vol 7d (%)": ewma_day * math.sqrt(7),
+        "GARCH Vol Next (%)": None,
+        "GARCH Vol 1d (%)": None,
+        "GARCH Vol 7d (%)": None
+    }
+
+    model = entry.get("garch")
+    if model:
+        row["GARCH Vol Next (%)"] = math.sqrt(model["next_variance"]) * 100
+        row["GARCH Vol 1d (%)"] = math.sqrt(garch_horizon_variance(model, steps_per_day)) * 100
+        row["GARCH Vol 7d (%)"] = math.sqrt(garch_horizon_variance(model, 7 * steps_per_day)) * 100
+
+    return row
+
+
+def volatility_path(entry, days=7, steps_per_day=STEPS_PER_DAY):
+    """Cumulative forecast volatility (fraction, not %) for 1..`days` days ahead.
+
+    Uses GARCH when a model was fitted, EWMA otherwise.
+    """
+    model = entry.get("garch")
+    path = []
+    for day in range(1, days + 1):
+        steps = day * steps_per_day
+        if model:
+            variance = garch_horizon_variance(model, steps)
+        else:
+            variance = entry["ewma_variance"] * steps
+        path.append(math.sqrt(variance))
+    return path
+
+
+class ModelCache:
+    """Fitted parameters per `model_key` in a JSON file, checked against the data watermark."""
+
+    def __init__(self, path=None, root="data"):
+        self.path = path or os.path.join(root, MODEL_CACHE_FILE)
+        self.entries = self._read()
+        self._changed = set()
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path) as f:
+            return json.load(f)
+
+    def put(self, key, entry):
+        self.entries[key] = entry
+        self._changed.add(key)
+
+    def save(self):
+        """Write the entries changed here over the file's current contents."""
+        with root_lock(os.path.dirname(self.path) or "."):
+            entries = self._read()
+            entries.update({key: self.entries[key] for key in self._changed})
+            self.entries.update(entries)
+
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+        self._changed.clear()
+
+
+def forecast_volatility(returns, watermarks=None, cache=None, steps_per_day=STEPS_PER_DAY,
+                        max_workers=None, days=None, currency="usd", freq="raw"):
+    """EWMA/GARCH forecasts for every column of a time x coin returns matrix.
+
+    `days`, `currency` and `freq` describe the returns and become part of
+    the cache key (see `model_key`). Coins whose watermark (e.g. last stored
+    timestamp) matches their cached entry are not refitted; the others are
+    refitted in parallel, warm-started from their cached parameters.
+    """
+    cache = cache or ModelCache()
+    watermarks = watermarks or {}
+
+    coins = list(returns.columns)
+    keys = [model_key(coin, days, currency, freq) for coin in coins]
+    marks = [watermarks.get(coin) for coin in coins]
+    cached = [cache.entries.get(key) for key in keys]
+    series = [returns[coin].to_numpy() for coin in coins]
+
+    stale = [i for i, coin in enumerate(coins)
+             if not cached[i] or marks[i] is None or cached[i].get("watermark") != marks[i]]
+
+    if len(stale) > 1 and max_workers != 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            fitted = list(pool.map(_fit_coin, [series[i] for i in stale],
+                                   [marks[i] for i in stale], [cached[i] for i in stale]))
+    else:
+        fitted = [_fit_coin(series[i], marks[i], cached[i]) for i in stale]
+
+    for i, entry in zip(stale, fitted):
+        cached[i] = entry
+        cache.put(keys[i], entry)
+
+    if stale:
+        cache.save()
+
+    rows = [dict(Coin=coin, **forecast_entry(entry, steps_per_day))
+            for coin, entry in zip(coins, cached)]
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    from crypto_risk import config
+    from crypto_risk.price_store import PriceStore
+    from crypto_risk.risk_engine import price_matrix, returns_matrix
+
+    parser = argparse.ArgumentParser(description="EWMA / GARCH(1,1) volatility forecasts")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--data-dir", default=None,
+                        help="store root (default data/, or data/<source>/ for offline sources)")
+    args = parser.parse_args(argv)
+
+    store = PriceStore(args.data_dir)
+    frames = {name: store.load(coin_id, days=args.days) for name, coin_id in config.COINS.items()}
+    returns = returns_matrix(price_matrix(frames))
+
+    if returns.empty:
+        print("No stored prices; run `python -m crypto_risk fetch` first.")
+        return 1
+
+    watermarks = {name: store.last_timestamp(coin_id) for name, coin_id in config.COINS.items()}
+    print(forecast_volatility(returns, watermarks, ModelCache(root=store.root),
+                              max_workers=args.workers, days=args.days,
+                              currency=config.DEFAULT_CURRENCY).round(3))
+    return 0
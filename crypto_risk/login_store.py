@@ -0,0 +1,119 @@
+import csv
+import os
+import sqlite3
+from datetime import datetime
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+# -------------------------------------------------
+# LOGIN EVENT LOG (SQLITE, WAL MODE)
+# -------------------------------------------------
+
+class LoginStore:
+    """Append-only login events in SQLite.
+
+    WAL mode lets many Streamlit sessions insert at the same time without
+    rewriting anything, and the (username, id) index answers "recent logins
+    for this user" without scanning the whole history. On first use the rows
+    of a legacy `users.csv` are imported once.
+    """
+
+    def __init__(self, path="users.db", legacy_csv="users.csv", timeout=30.0):
+        self.path = path
+        self.timeout = timeout
+
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS logins ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " username TEXT NOT NULL,"
+                " email TEXT NOT NULL,"
+                " login_time TEXT NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_logins_user ON logins (username, id)"
+            )
+
+            if legacy_csv and os.path.exists(legacy_csv):
+                self._import_legacy(conn, legacy_csv)
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=self.timeout)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _import_legacy(self, conn, legacy_csv):
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+        # BEGIN IMMEDIATE so two first-time sessions can't both import
+        conn.execute("BEGIN IMMEDIATE")
+        imported = conn.execute(
+            "SELECT 1 FROM meta WHERE key = 'legacy_csv_imported'"
+        ).fetchone()
+
+        if not imported:
+            with open(legacy_csv, newline="") as f:
+                rows = [(row["Username"], row["Email"], row["Login Time"])
+                        for row in csv.DictReader(f)]
+            conn.executemany(
+                "INSERT INTO logins (username, email, login_time) VALUES (?, ?, ?)", rows
+            )
+            conn.execute("INSERT INTO meta VALUES ('legacy_csv_imported', ?)",
+                         (datetime.now().strftime(TIME_FORMAT),))
+
+        conn.commit()
+
+    # ---------------- WRITE ----------------
+
+    def record(self, username, email, login_time=None):
+        """Append one login event in O(1)."""
+        login_time = login_time or datetime.now().strftime(TIME_FORMAT)
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT INTO logins (username, email, login_time) VALUES (?, ?, ?)",
+                    (username, email, login_time)
+                )
+        finally:
+            conn.close()
+
+    # ---------------- READ ----------------
+
+    def recent(self, username, limit=10):
+        """Most recent logins of one user, newest first."""
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT username, email, login_time FROM logins"
+                " WHERE username = ? ORDER BY id DESC LIMIT ?",
+                (username, limit)
+            ).fetchall()
+        finally:
+            conn.close()
+
+    def count(self):
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM logins").fetchone()[0]
+        finally:
+            conn.close()
+
+    def export_csv(self, path):
+        """Write the full history in the old users.csv layout."""
+        conn = self._connect()
+        try:
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["Username", "Email", "Login Time"])
+                writer.writerows(conn.execute(
+                    "SELECT username, email, login_time FROM logins ORDER BY id"
+                ))
+        finally:
+            conn.close()
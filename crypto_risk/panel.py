@@ -0,0 +1,163 @@
+"""Compact price panel: one timestamp axis and one time x coin array.
+
+Per-coin DataFrames repeat the timestamp (and a `date` column) for every
+coin. A PricePanel keeps the bar timestamps once as int64 and all prices
+in a single C-contiguous float64 (or float32) array, so 1,000 coins x one
+year of hourly bars is ~70 MB instead of several times that.
+
+Nothing derived is stored. Per-coin series, date axes and time windows
+are views into the same buffers; returns and volatilities are computed
+when asked for. A bool `observed` array (one byte per cell) marks which
+cells hold a real bar close rather than a forward-filled one:
+
+    panel = PricePanel.from_store(PriceStore("data"), config.COINS.values())
+    panel["bitcoin"]               # view, no copy
+    panel.last(30).returns()       # last 30 days, returns computed on demand
+    panel.frame()                  # wide DataFrame over the same buffer
+"""
+import numpy as np
+import pandas as pd
+
+from crypto_risk.bars import freq_ms, resample
+from crypto_risk.price_store import MS_PER_DAY
+
+
+class PricePanel:
+
+    __slots__ = ("timestamps", "prices", "observed", "coins", "_columns")
+
+    def __init__(self, timestamps, prices, coins, dtype=None, observed=None):
+        self.timestamps = np.asarray(timestamps, dtype="int64")
+        self.prices = np.ascontiguousarray(prices, dtype=dtype)
+        self.coins = list(coins)
+        self._columns = {coin: j for j, coin in enumerate(self.coins)}
+
+        if self.prices.shape != (len(self.timestamps), len(self.coins)):
+            raise ValueError(f"prices shape {self.prices.shape} does not match "
+                             f"{len(self.timestamps)} timestamps x {len(self.coins)} coins")
+
+        # Without a mask every non-NaN cell counts as observed
+        self.observed = (~np.isnan(self.prices) if observed is None
+                         else np.asarray(observed, dtype=bool))
+
+    # ---------------- BUILDING ----------------
+
+    @classmethod
+    def from_arrays(cls, series, freq="1h", dtype="float64"):
+        """Panel on a regular `freq` grid from coin -> (timestamps, prices).
+
+        Each cell holds the bar close. Gaps inside a coin's history carry
+        the last close forward; cells before its first bar and after its
+        last bar (a coin whose history stops early) stay NaN.
+        """
+        step = freq_ms(freq)
+        series = {coin: arrays for coin, arrays in series.items() if len(arrays[0])}
+
+        if not series:
+            return cls(np.empty(0, dtype="int64"), np.empty((0, 0), dtype=dtype), [], dtype,
+                       np.empty((0, 0), dtype=bool))
+
+        # Grid bounds from the raw timestamps, so only one coin's bars exist at a time
+        start = min(int(timestamps[0]) // step for timestamps, _ in series.values()) * step
+        end = max(int(timestamps[-1]) // step for timestamps, _ in series.values()) * step
+        timestamps = np.arange(start, end + step, step, dtype="int64")
+
+        prices = np.full((len(timestamps), len(series)), np.nan, dtype=dtype)
+        observed = np.zeros(prices.shape, dtype=bool)
+        for j, (coin_timestamps, coin_prices) in enumerate(series.values()):
+            bars = resample(coin_timestamps, coin_prices, freq)
+            rows = (bars["timestamp"] - start) // step
+            observed[rows, j] = True
+
+            # Each close repeated up to the next bar (forward fill), the last one only once
+            prices[rows[0]:rows[-1] + 1, j] = np.repeat(bars["close"], np.diff(np.r_[rows, rows[-1] + 1]))
+
+        return cls(timestamps, prices, list(series), dtype, observed)
+
+    @classmethod
+    def from_store(cls, store, coin_ids, freq="1h", days=None, dtype="float64"):
+        """Panel of the stored history (optionally the last `days`) of `coin_ids`."""
+        series = {}
+        for coin_id in coin_ids:
+            arrays = store.arrays(coin_id, days=days)
+            if arrays is not None:
+                series[coin_id] = arrays
+        return cls.from_arrays(series, freq, dtype)
+
+    # ---------------- SIZE ----------------
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __contains__(self, coin):
+        return coin in self._columns
+
+    @property
+    def shape(self):
+        return self.prices.shape
+
+    @property
+    def nbytes(self):
+        return self.timestamps.nbytes + self.prices.nbytes + self.observed.nbytes
+
+    # ---------------- VIEWS (NO COPIES) ----------------
+
+    @property
+    def dates(self):
+        # datetime64 view of the int64 buffer
+        return self.timestamps.view("datetime64[ms]")
+
+    def __getitem__(self, coin):
+        return self.prices[:, self._columns[coin]]
+
+    def column(self, coin):
+        return self[coin]
+
+    def between(self, start_ms=None, end_ms=None):
+        """Panel of rows with start_ms <= timestamp < end_ms, sharing memory."""
+        start = 0 if start_ms is None else np.searchsorted(self.timestamps, start_ms, side="left")
+        end = len(self) if end_ms is None else np.searchsorted(self.timestamps, end_ms, side="left")
+        return PricePanel(self.timestamps[start:end], self.prices[start:end], self.coins,
+                          observed=self.observed[start:end])
+
+    def last(self, days):
+        """The last `days` days (up to the newest bar), sharing memory."""
+        if not len(self):
+            return self
+        return self.between(self.timestamps[-1] - days * MS_PER_DAY)
+
+    def frame(self):
+        """Wide date x coin DataFrame over the same buffer (for risk_engine)."""
+        return pd.DataFrame(self.prices, index=pd.DatetimeIndex(self.dates, name="date"),
+                            columns=self.coins, copy=False)
+
+    # ---------------- DERIVED (COMPUTED ON DEMAND) ----------------
+
+    def returns(self):
+        """Simple returns, same shape as `prices` (first row NaN)."""
+        out = np.empty_like(self.prices)
+        out[:1] = np.nan
+        np.divide(self.prices[1:], self.prices[:-1], out=out[1:])
+        out[1:] -= 1
+        return out
+
+    def log_returns(self):
+        out = np.empty_like(self.prices)
+        out[:1] = np.nan
+        np.log(self.prices[1:] / self.prices[:-1], out=out[1:])
+        return out
+
+    def rolling_volatility(self, window=7):
+        """Rolling std of returns in %, like the dashboard's volatility line."""
+        returns = pd.DataFrame(self.returns(), copy=False)
+        return returns.rolling(window=window).std().to_numpy() * 100
+
+    def to_frame(self, coin):
+        """timestamp/price/date DataFrame of one coin (PriceStore.load layout)."""
+        prices = self[coin]
+        valid = ~np.isnan(prices)
+        return pd.DataFrame({
+            "timestamp": self.timestamps[valid],
+            "price": prices[valid],
+            "date": self.dates[valid]
+        })
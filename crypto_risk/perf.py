@@ -0,0 +1,277 @@
+"""Lightweight timing spans and cache hit/miss counters.
+
+Off by default. Set CRYPTO_RISK_PERF=1 before starting the dashboard or the
+CLI to record one JSON line per dashboard rerun / analysis run in
+CRYPTO_RISK_PERF_LOG (default data/perf.jsonl):
+
+    CRYPTO_RISK_PERF=1 streamlit run login.py
+    python -m crypto_risk perf            # p50 / p95 per span from the log
+
+When switched off, `timed` and `cached` return the undecorated function and
+`section` / `span` return immediately, so instrumented code pays at most
+one function call per section.
+"""
+import argparse
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+ENABLED = os.environ.get("CRYPTO_RISK_PERF", "").lower() in ("1", "true", "yes", "on")
+
+LOG_FILE = os.environ.get("CRYPTO_RISK_PERF_LOG", "data/perf.jsonl")
+
+# Streamlit runs every session's script in its own thread
+_local = threading.local()
+_log_lock = threading.Lock()
+
+_NO_SPAN = contextlib.nullcontext()
+
+
+# -------------------------------------------------
+# ONE RECORDED RUN (A DASHBOARD RERUN OR AN ANALYSIS)
+# -------------------------------------------------
+
+class Run:
+    """Spans and cache counters collected on one thread between start and end."""
+
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.parent = parent
+        self.started = datetime.now(timezone.utc)
+        self.spans = []       # {"name", "at_ms", "ms", "depth"}
+        self.cache = {}       # name -> {"hit": n, "miss": n}
+        self.total_ms = None
+
+        self._start = time.perf_counter()
+        self._depth = 0
+        self._section = None  # (name, start) of the open lap
+
+    def add(self, name, start, end, depth=0):
+        self.spans.append({
+            "name": name,
+            "at_ms": round((start - self._start) * 1000, 3),
+            "ms": round((end - start) * 1000, 3),
+            "depth": depth
+        })
+
+    def section(self, name):
+        now = time.perf_counter()
+        if self._section:
+            self.add(self._section[0], self._section[1], now)
+        self._section = (name, now) if name else None
+
+    def close(self):
+        self.section(None)
+        self.total_ms = round((time.perf_counter() - self._start) * 1000, 3)
+
+        # Nested spans finish before their section; list them in start order
+        self.spans.sort(key=lambda s: (s["at_ms"], s["depth"]))
+
+    def record(self):
+        return {
+            "run": self.name,
+            "started": self.started.isoformat(timespec="milliseconds"),
+            "total_ms": self.total_ms,
+            "spans": self.spans,
+            "cache": self.cache
+        }
+
+
+def current():
+    return getattr(_local, "run", None)
+
+
+def start_run(name):
+    """Begin recording on this thread; returns the Run (None when disabled)."""
+    if not ENABLED:
+        return None
+
+    run = Run(name, parent=current())
+    _local.run = run
+    return run
+
+
+def end_run(run, path=None):
+    """Close `run`, append it to the JSON-lines log and return it."""
+    if run is None:
+        return None
+
+    run.close()
+    _local.run = run.parent
+
+    path = path or LOG_FILE
+    line = json.dumps(run.record())
+    with _log_lock:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a") as f:
+            f.write(line + "\n")
+
+    return run
+
+
+# -------------------------------------------------
+# INSTRUMENTATION POINTS
+# -------------------------------------------------
+
+def section(name):
+    """Close the open lap (if any) and start timing a new one called `name`.
+
+    Suits flat scripts: put one call at the top of each section instead of
+    re-indenting it under a `with` block.
+    """
+    if not ENABLED:
+        return
+    run = current()
+    if run is not None:
+        run.section(name)
+
+
+class _Span:
+    __slots__ = ("run", "name", "start")
+
+    def __init__(self, run, name):
+        self.run = run
+        self.name = name
+
+    def __enter__(self):
+        self.run._depth += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.run._depth -= 1
+        self.run.add(self.name, self.start, time.perf_counter(), self.run._depth + 1)
+        return False
+
+
+def span(name):
+    """`with perf.span("name"):` times a nested block of the current run."""
+    if not ENABLED:
+        return _NO_SPAN
+    run = current()
+    return _NO_SPAN if run is None else _Span(run, name)
+
+
+def timed(name=None):
+    """Decorator version of `span`; a no-op wrapper-free decorator when disabled."""
+    def decorate(func):
+        if not ENABLED:
+            return func
+
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name, outcome):
+    run = current()
+    if run is not None:
+        counters = run.cache.setdefault(name, {"hit": 0, "miss": 0})
+        counters[outcome] += 1
+
+
+def cached(cache_decorator, name=None):
+    """Apply a Streamlit cache decorator and count its hits and misses.
+
+        @perf.cached(st.cache_data(ttl=3600))
+        def load_daily_panel(coin_names): ...
+
+    A call is a miss when the function body actually ran.
+    """
+    def decorate(func):
+        if not ENABLED:
+            return cache_decorator(func)
+
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def body(*args, **kwargs):
+            _local.missed = getattr(_local, "missed", set()) | {label}
+            return func(*args, **kwargs)
+
+        cached_func = cache_decorator(body)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            _local.missed = getattr(_local, "missed", set()) - {label}
+            with span(f"cache {label}"):
+                result = cached_func(*args, **kwargs)
+            count(label, "miss" if label in _local.missed else "hit")
+            return result
+
+        if hasattr(cached_func, "clear"):
+            wrapper.clear = cached_func.clear
+        return wrapper
+    return decorate
+
+
+# -------------------------------------------------
+# LOG SUMMARY
+# -------------------------------------------------
+
+def read_log(path=None):
+    path = path or LOG_FILE
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize(records):
+    """Per (run, span): count, p50 and p95 ms; per cache: hits, misses, hit rate."""
+    timings = {}
+    caches = {}
+    for record in records:
+        timings.setdefault((record["run"], "(total)"), []).append(record["total_ms"])
+        for s in record["spans"]:
+            timings.setdefault((record["run"], s["name"]), []).append(s["ms"])
+        for name, counters in record["cache"].items():
+            totals = caches.setdefault(name, {"hit": 0, "miss": 0})
+            totals["hit"] += counters["hit"]
+            totals["miss"] += counters["miss"]
+
+    spans = [
+        {"Run": run, "Span": name, "Count": len(ms),
+         "p50 (ms)": round(float(np.percentile(ms, 50)), 1),
+         "p95 (ms)": round(float(np.percentile(ms, 95)), 1)}
+        for (run, name), ms in timings.items()
+    ]
+    cache = [
+        {"Cache": name, "Hits": c["hit"], "Misses": c["miss"],
+         "Hit Rate (%)": round(100 * c["hit"] / max(c["hit"] + c["miss"], 1), 1)}
+        for name, c in caches.items()
+    ]
+    return spans, cache
+
+
+def main(argv=None):
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description="Summarize the performance log")
+    parser.add_argument("--log", default=LOG_FILE)
+    parser.add_argument("--last", type=int, default=None, help="only the last N runs")
+    args = parser.parse_args(argv)
+
+    records = read_log(args.log)[-args.last:] if args.last else read_log(args.log)
+    if not records:
+        print(f"No runs in {args.log}; start with CRYPTO_RISK_PERF=1 to record some.")
+        return 1
+
+    spans, cache = summarize(records)
+    print(f"{len(records)} run(s) from {args.log}\n")
+    print(pd.DataFrame(spans).to_string(index=False))
+    if cache:
+        print()
+        print(pd.DataFrame(cache).to_string(index=False))
+    return 0
@@ -0,0 +1,308 @@
+"""Shared fetch plan for many (coin, horizon, currency) queries.
+
+Prices are stored once per coin in the base currency (USD). For a set of
+queries the planner fetches, per coin, only what the longest requested
+horizon still needs: a backfill when the stored history does not reach
+back far enough, otherwise just the hours since the watermark. One fetch
+per coin covers both.
+
+Granularities are never mixed in one series. CoinGecko answers ranges of
+up to 90 days with hourly points and longer ranges with daily ones, so:
+
+* `<coin>` holds hourly points for at most the last HOURLY_MAX_DAYS when
+  first fetched, then grows forward with every update (a longer gap since
+  the watermark is fetched in hourly ranges, see `PriceStore.fetch_since`),
+* `<coin>@1d` holds the daily backfill for longer horizons; only its part
+  older than the hourly history is ever read.
+
+Horizons up to HOURLY_MAX_DAYS are served from the hourly series alone.
+Longer ones are served at daily granularity: the daily backfill followed
+by the hourly history rolled up to days.
+
+Other currencies cost one series each, not one per coin: the FX
+reference coin (Bitcoin) is also stored priced in that currency, and
+price_ccy / price_usd of the reference gives the exchange rate at every
+point. Every shorter horizon and every converted series is then derived
+from local data:
+
+    planner = QueryPlanner(PriceStore("data"))
+    planner.execute([("bitcoin", 365, "usd"), ("solana", 7, "eur")])
+    planner.series("solana", 30, "eur")      # no network
+"""
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from crypto_risk import config
+from crypto_risk.bars import resample, to_frame
+from crypto_risk.price_store import HOURLY_MAX_DAYS, MIN_FETCH_DAYS, MS_PER_DAY
+from crypto_risk.storage import root_lock
+
+FX_REFERENCE = "bitcoin"
+
+# History that starts within this much of the requested start counts as
+# covering it (CoinGecko's first point is never exactly `days` ago)
+COVERAGE_SLACK_MS = MS_PER_DAY
+
+# Largest gap between a coin's point and the FX rate used to convert it
+FX_TOLERANCE_MS = 2 * 60 * 60 * 1000
+
+
+def fx_series_id(currency, reference=FX_REFERENCE):
+    """Store id of the reference coin priced in `currency`."""
+    return f"{reference}@{currency}"
+
+
+def daily_series_id(series_id):
+    """Store id of the daily backfill of `series_id`."""
+    return f"{series_id}@1d"
+
+
+def _frame(timestamps, prices):
+    df = pd.DataFrame({"timestamp": np.asarray(timestamps, dtype="int64"),
+                       "price": np.asarray(prices, dtype="float64")})
+    df["date"] = pd.to_datetime(df["timestamp"], unit="ms")
+    return df
+
+
+def _tolerance(days):
+    # Daily backfill points are a day apart; hourly ones must be close
+    return FX_TOLERANCE_MS if days is not None and days <= HOURLY_MAX_DAYS else MS_PER_DAY
+
+
+def _daily_closes(df):
+    bars = resample(df["timestamp"].to_numpy(), df["price"].to_numpy(), "1d")
+    return _frame(bars["timestamp"], bars["close"])
+
+
+class QueryPlanner:
+
+    def __init__(self, store, base_currency=config.DEFAULT_CURRENCY, fx_reference=FX_REFERENCE):
+        self.store = store
+        self.base_currency = base_currency
+        self.fx_reference = fx_reference
+
+        # Earliest start each series has been fetched for, even if the API
+        # had less history than that; stops refetching young coins forever
+        self.coverage_path = os.path.join(store.root, "coverage.json")
+        self.coverage = {}
+        if os.path.exists(self.coverage_path):
+            with open(self.coverage_path) as f:
+                self.coverage = json.load(f)
+
+    def _series_id(self, coin_id, currency):
+        # Base-currency prices live under the coin id; others only exist
+        # for the FX reference coin
+        return coin_id if currency == self.base_currency else fx_series_id(currency, coin_id)
+
+    # ---------------- PLANNING ----------------
+
+    def _covered(self, series_id, horizon_days, now_ms):
+        start_needed = now_ms - horizon_days * MS_PER_DAY
+        covered_from = self.coverage.get(series_id, self.store.first_timestamp(series_id))
+        return covered_from is not None and covered_from <= start_needed + COVERAGE_SLACK_MS
+
+    def _fetch_days(self, series_id, horizon_days, now_ms):
+        """Days to request for one hourly series, or 0 when nothing is missing."""
+        watermark = self.store.last_timestamp(series_id)
+        if watermark is None or not self._covered(series_id, horizon_days, now_ms):
+            # Backfill: one request for the whole horizon also covers the gap
+            return horizon_days
+
+        # The whole gap, even past the horizon: the series must not get a hole
+        gap_days = (now_ms - watermark) / MS_PER_DAY
+        if gap_days * 24 < 1:
+            return 0
+        return max(int(gap_days) + 1, MIN_FETCH_DAYS)
+
+    def plan(self, queries, now_ms=None):
+        """Requests needed for `queries` of (coin_id, days, currency).
+
+        Returns {(currency, granularity): {coin_id: days}} with granularity
+        "1h" (merged into the hourly series; more than HOURLY_MAX_DAYS only
+        for a long gap since the watermark) or "1d" (longer backfills, kept
+        in the daily series). Coins are
+        requested in the base currency; the FX reference coin also under
+        every other currency. Empty when everything is already stored.
+        """
+        now_ms = now_ms or int(time.time() * 1000)
+
+        horizons = {}      # (coin_id, currency) -> longest days
+        for coin_id, days, currency in queries:
+            units = [(coin_id, self.base_currency)]
+            if currency != self.base_currency:
+                # Converting needs the reference coin in both currencies
+                units += [(self.fx_reference, self.base_currency), (self.fx_reference, currency)]
+            for unit in units:
+                horizons[unit] = max(horizons.get(unit, 0), days)
+
+        requests = {}
+        for (coin_id, currency), days in horizons.items():
+            series_id = self._series_id(coin_id, currency)
+
+            fetch = self._fetch_days(series_id, min(days, HOURLY_MAX_DAYS), now_ms)
+            if fetch:
+                requests.setdefault((currency, "1h"), {})[coin_id] = fetch
+
+            if days > HOURLY_MAX_DAYS and not self._covered(daily_series_id(series_id), days, now_ms):
+                requests.setdefault((currency, "1d"), {})[coin_id] = days
+
+        return requests
+
+    # ---------------- EXECUTION ----------------
+
+    def execute(self, queries, **kwargs):
+        """Fetch what `plan` says is missing; returns series_id -> rows written.
+
+        One concurrent request per coin and granularity in the base
+        currency, plus the FX reference per extra currency. `kwargs` go to
+        the source (session=, max_workers=, ...).
+        """
+        now_ms = int(time.time() * 1000)
+        requests = self.plan(queries, now_ms)
+        written = {}
+
+        for (currency, granularity), days in requests.items():
+            # Hourly gaps too long for one request are fetched range by range
+            frames = {coin_id: self.store.fetch_since(
+                          coin_id, self.store.last_timestamp(self._series_id(coin_id, currency)),
+                          currency, now_ms, **kwargs)
+                      for coin_id, coin_days in days.items()
+                      if granularity == "1h" and coin_days > HOURLY_MAX_DAYS}
+
+            single = {coin_id: coin_days for coin_id, coin_days in days.items()
+                      if coin_id not in frames}
+            if single:
+                frames.update(self.store.source.fetch_many(list(single), days=single,
+                                                           vs_currency=currency, **kwargs))
+
+            for coin_id, df in frames.items():
+                series_id = self._series_id(coin_id, currency)
+                if granularity == "1d":
+                    series_id = daily_series_id(series_id)
+                    # Local sources answer long ranges hourly; store days only
+                    if df is not None and len(df):
+                        df = _daily_closes(df)
+
+                if df is None:
+                    written[series_id] = None
+                    continue
+
+                written[series_id] = self.store.merge(series_id, df)
+
+                start = now_ms - days[coin_id] * MS_PER_DAY
+                self.coverage[series_id] = min(self.coverage.get(series_id, start), start)
+
+        if requests:
+            self._write_coverage()
+        return written
+
+    def _write_coverage(self):
+        # Merge with what other writers recorded since we read the file
+        with root_lock(self.store.root):
+            if os.path.exists(self.coverage_path):
+                with open(self.coverage_path) as f:
+                    on_disk = json.load(f)
+                for series_id, start in on_disk.items():
+                    self.coverage[series_id] = min(self.coverage.get(series_id, start), start)
+
+            tmp_path = self.coverage_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.coverage, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.coverage_path)
+
+    # ---------------- LOCAL DERIVATION ----------------
+
+    def first_timestamp(self, coin_id):
+        """Oldest stored point of a coin, daily backfill included."""
+        firsts = [self.store.first_timestamp(series_id)
+                  for series_id in (coin_id, daily_series_id(coin_id))]
+        firsts = [first for first in firsts if first is not None]
+        return min(firsts) if firsts else None
+
+    def _load(self, series_id, days=None):
+        """Hourly points, preceded by the daily backfill when `days` reaches past them."""
+        hourly = self.store.load(series_id, None if days is None or days > HOURLY_MAX_DAYS
+                                 else days)
+        if days is not None and days <= HOURLY_MAX_DAYS:
+            return hourly
+
+        daily = self.store.load(daily_series_id(series_id))
+        if daily is not None and hourly is not None and len(hourly):
+            daily = daily[daily["timestamp"] < hourly["timestamp"].iloc[0]]
+
+        frames = [f for f in (daily, hourly) if f is not None and len(f)]
+        if not frames:
+            return None
+
+        df = pd.concat(frames, ignore_index=True)
+        if days is not None:
+            df = df[df["timestamp"] >= df["timestamp"].iloc[-1] - days * MS_PER_DAY]
+        return df.reset_index(drop=True)
+
+    def fx_rates(self, currency, days=None):
+        """timestamp/rate frame: units of `currency` per unit of base currency."""
+        converted = self._load(fx_series_id(currency, self.fx_reference), days)
+        base = self._load(self.fx_reference, days)
+        if converted is None or base is None:
+            return None
+
+        rates = pd.merge_asof(converted[["timestamp", "price"]],
+                              base[["timestamp", "price"]].rename(columns={"price": "base"}),
+                              on="timestamp", direction="nearest", tolerance=_tolerance(days))
+        rates["rate"] = rates["price"] / rates["base"]
+        return rates[["timestamp", "rate"]].dropna()
+
+    def points(self, coin_id, days=None, currency=None):
+        """Stored points of the last `days` days in `currency`, as stored.
+
+        Beyond HOURLY_MAX_DAYS this is daily backfill followed by hourly
+        points: fine for charts and for daily bars, not for return
+        statistics (use `series`).
+        """
+        currency = currency or self.base_currency
+        df = self._load(coin_id, days)
+        if df is None or currency == self.base_currency:
+            return df
+
+        # One day of extra rates so the first points have a match
+        rates = self.fx_rates(currency, None if days is None else days + 1)
+        if rates is None or rates.empty:
+            return None
+
+        df = pd.merge_asof(df, rates, on="timestamp", direction="nearest",
+                           tolerance=_tolerance(days))
+        df["price"] = df["price"] * df.pop("rate")
+        return df.dropna(subset=["price"]).reset_index(drop=True)
+
+    def series(self, coin_id, days=None, currency=None):
+        """timestamp/price/date frame of the last `days` days in `currency`.
+
+        Hourly up to HOURLY_MAX_DAYS; daily closes for longer horizons, so
+        one series never mixes hourly and daily returns.
+        """
+        df = self.points(coin_id, days, currency)
+        if df is None or (days is not None and days <= HOURLY_MAX_DAYS):
+            return df
+        return _daily_closes(df)
+
+    def bars(self, coin_id, freq="1d", days=None, currency=None):
+        """OHLC/mean bars in `currency`; base-currency hourly bars come from disk.
+
+        Daily bars over long horizons include the daily backfill; intraday
+        bars only cover the hourly history.
+        """
+        currency = currency or self.base_currency
+        long_daily = freq == "1d" and (days is None or days > HOURLY_MAX_DAYS)
+
+        if currency == self.base_currency and not long_daily:
+            return self.store.bars(coin_id, freq, days=days)
+
+        df = self.points(coin_id, days if long_daily else min(days or HOURLY_MAX_DAYS,
+                                                              HOURLY_MAX_DAYS), currency)
+        if df is None:
+            return None
+        return to_frame(resample(df["timestamp"].to_numpy(), df["price"].to_numpy(), freq))
@@ -0,0 +1,278 @@
+"""Cross-coin covariance / correlation and portfolio volatility.
+
+Returns are aligned on UTC bar timestamps (not row position), so every row
+of the return matrix is the same hour (or day) for every coin.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from crypto_risk.bars import bar_panel, freq_ms, resample, to_frame
+from crypto_risk.risk_engine import returns_matrix
+
+# RiskMetrics decay for hourly/daily crypto returns
+EWMA_LAMBDA = 0.94
+
+STATE_FILE = "data/covariance_state.npz"
+
+
+# -------------------------------------------------
+# ALIGNED RETURN MATRIX
+# -------------------------------------------------
+
+def _bars_since(store, coin_id, freq, since_ms):
+    # Only the raw points from `since_ms` on are resampled
+    arrays = store.arrays(coin_id)
+    if arrays is None:
+        return None
+    timestamps, prices = arrays
+    start = np.searchsorted(timestamps, since_ms, side="left")
+    return to_frame(resample(timestamps[start:], prices[start:], freq))
+
+
+def aligned_returns(store, coins, freq="1h", days=30, since_ms=None):
+    """Time x coin returns of bar closes for `coins` (name -> coin_id).
+
+    With `since_ms` (a bar start), only bars from there on are built and
+    the first return is the one after that bar.
+    """
+    if since_ms is None:
+        bars = {name: store.bars(coin_id, freq, days=days) for name, coin_id in coins.items()}
+    else:
+        bars = {name: _bars_since(store, coin_id, freq, since_ms) for name, coin_id in coins.items()}
+    closes = bar_panel(bars, column="close")
+
+    if closes.empty:
+        return closes
+
+    return returns_matrix(closes).iloc[1:]
+
+
+def _complete(returns):
+    values = returns.to_numpy(dtype="float64") if isinstance(returns, pd.DataFrame) else returns
+    return values[~np.isnan(values).any(axis=1)]
+
+
+# -------------------------------------------------
+# ESTIMATORS
+# -------------------------------------------------
+
+def sample_covariance(returns):
+    return np.cov(_complete(returns), rowvar=False, ddof=1)
+
+
+def ewma_covariance(returns, lam=EWMA_LAMBDA):
+    """Zero-mean exponentially weighted covariance (RiskMetrics)."""
+    x = _complete(returns)
+    weights = (1 - lam) * lam ** np.arange(len(x) - 1, -1, -1)
+    weights /= weights.sum()
+    return (x * weights[:, None]).T @ x
+
+
+def shrinkage_covariance(returns):
+    """Ledoit-Wolf shrinkage towards a scaled identity.
+
+    Returns (covariance, shrinkage intensity). Well-conditioned even when
+    there are more coins than observations.
+    """
+    x = _complete(returns)
+    n, p = x.shape
+    x = x - x.mean(axis=0)
+
+    sample = x.T @ x / n
+    mu = np.trace(sample) / p
+    target = mu * np.eye(p)
+
+    delta = np.sum((sample - target) ** 2) / p
+    x2 = x ** 2
+    beta = (np.sum(x2.T @ x2) / n - np.sum(sample ** 2)) / (n * p)
+    intensity = float(np.clip(beta / delta, 0, 1)) if delta > 0 else 1.0
+
+    return intensity * target + (1 - intensity) * sample, intensity
+
+
+def correlation(cov):
+    std = np.sqrt(np.diag(cov))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = cov / np.outer(std, std)
+    np.fill_diagonal(corr, 1.0)
+    return corr
+
+
+def portfolio_volatility(cov, weights):
+    """Volatility (in %) of a weighted portfolio given a covariance matrix."""
+    w = np.asarray(weights, dtype="float64")
+    w = w / w.sum()
+    return float(np.sqrt(w @ cov @ w) * 100)
+
+
+# -------------------------------------------------
+# INCREMENTAL UPDATES AS NEW BARS ARRIVE
+# -------------------------------------------------
+
+class IncrementalCovariance:
+    """Running sample and EWMA covariance updated one batch of bars at a time.
+
+    A batch of k new return rows costs O(k * N^2) (a decayed outer product
+    for EWMA) instead of O(T * N^2) for recomputing from the full history.
+    State can be saved next to the price store and resumed on the next run.
+
+    The sample moments cover the last `window` complete rows: the rows are
+    kept in a ring, new rows' sums are added and the sums of the rows they
+    overwrite subtracted, and the sums are recomputed from the ring once per
+    full turn of it so rounding errors cannot pile up. With `window=None`
+    they cover every row seen (Chan et al. pairwise merge) and no rows are
+    kept.
+    """
+
+    def __init__(self, coins, lam=EWMA_LAMBDA, window=None):
+        self.coins = list(coins)
+        self.lam = lam
+        self.window = window
+        n_coins = len(self.coins)
+
+        self.n = 0
+        self.mean = np.zeros(n_coins)
+        self.comoment = np.zeros((n_coins, n_coins))
+        self.ewma = np.zeros((n_coins, n_coins))
+        self.watermark = None   # timestamp of the last complete row folded in
+
+        # Windowed only: the last `window` rows and their plain sums
+        self.rows = np.zeros((window or 0, n_coins))
+        self._head = 0          # next slot to write (the oldest row once full)
+        self._sum = np.zeros(n_coins)
+        self._outer = np.zeros((n_coins, n_coins))
+        self._since_anchor = 0
+
+    def update(self, returns):
+        """Fold in new rows (DataFrame indexed by bar time, columns = coins)."""
+        if self.watermark is not None:
+            returns = returns[returns.index > self.watermark]
+
+        values = returns[self.coins].to_numpy(dtype="float64")
+        complete = ~np.isnan(values).any(axis=1)
+        x = values[complete]
+        if len(x) == 0:
+            return self
+
+        if self.window is None:
+            self._merge(x)
+        else:
+            self._slide(x)
+
+        # EWMA: S_t = lam * S_{t-1} + (1 - lam) * r_t r_t'
+        k = len(x)
+        decay = self.lam ** np.arange(k - 1, -1, -1)
+        self.ewma = (self.lam ** k) * self.ewma + (1 - self.lam) * (x * decay[:, None]).T @ x
+
+        # Rows after the last complete one (a coin's bar not in yet) are
+        # picked up by the next update
+        self.watermark = returns.index[complete][-1]
+        return self
+
+    def _merge(self, x):
+        # Merge batch statistics into the running ones
+        k = len(x)
+        batch_mean = x.mean(axis=0)
+        centered = x - batch_mean
+        batch_comoment = centered.T @ centered
+
+        delta = batch_mean - self.mean
+        total = self.n + k
+        self.comoment += batch_comoment + np.outer(delta, delta) * self.n * k / total
+        self.mean += delta * k / total
+        self.n = total
+
+    def _slide(self, x):
+        x = x[-self.window:]
+        k = len(x)
+        slots = (self._head + np.arange(k)) % self.window
+
+        # Empty slots are written first; the rest overwrite the oldest rows
+        evicted = self.rows[slots[k - max(self.n + k - self.window, 0):]]
+        self.rows[slots] = x
+        self._head = (self._head + k) % self.window
+        self.n = min(self.n + k, self.window)
+
+        self._since_anchor += k
+        if self._since_anchor >= self.window:
+            self._anchor()
+            return
+
+        self._sum += x.sum(axis=0) - evicted.sum(axis=0)
+        self._outer += x.T @ x - evicted.T @ evicted
+        self.mean = self._sum / self.n
+        self.comoment = self._outer - self.n * np.outer(self.mean, self.mean)
+
+    def _anchor(self):
+        # Two-pass moments of the rows in the ring
+        rows = self.rows[:self.n]
+        self.mean = rows.mean(axis=0) if self.n else np.zeros(len(self.coins))
+        centered = rows - self.mean
+        self.comoment = centered.T @ centered
+        self._sum = rows.sum(axis=0)
+        self._outer = self.comoment + self.n * np.outer(self.mean, self.mean)
+        self._since_anchor = 0
+
+    @property
+    def covariance(self):
+        return self.comoment / (self.n - 1) if self.n > 1 else None
+
+    @property
+    def correlation(self):
+        cov = self.covariance
+        return None if cov is None else correlation(cov)
+
+    def save(self, path):
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, coins=np.asarray(self.coins, dtype=str), lam=self.lam,
+                 n=self.n, mean=self.mean, comoment=self.comoment, ewma=self.ewma,
+                 watermark=str(self.watermark), window=self.window or 0,
+                 rows=self.rows, head=self._head)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            # States saved before windowing are expanding
+            window = int(data["window"]) if "window" in data.files else 0
+            state = cls(data["coins"].tolist(), float(data["lam"]), window or None)
+            state.n = int(data["n"])
+            state.mean = data["mean"]
+            state.comoment = data["comoment"]
+            state.ewma = data["ewma"]
+            watermark = str(data["watermark"])
+            if window:
+                state.rows = data["rows"]
+                state._head = int(data["head"])
+                state._anchor()
+
+        state.watermark = None if watermark == "None" else pd.Timestamp(watermark)
+        return state
+
+
+def update_covariance_state(store, coins, path=STATE_FILE, freq="1h", backfill_days=30):
+    """Load the saved state, fold in bars newer than its watermark, save it.
+
+    The sample covariance covers the last `backfill_days` of bars. Starts
+    over when the coin list or that window changes. After the first run
+    only the raw points from the watermark bar on are resampled.
+    """
+    window = int(backfill_days * 24 * 60 * 60 * 1000 // freq_ms(freq))
+
+    state = IncrementalCovariance.load(path) if os.path.exists(path) else None
+    if state is None or state.coins != list(coins) or state.window != window:
+        state = IncrementalCovariance(coins, window=window)
+
+    if state.watermark is None:
+        returns = aligned_returns(store, coins, freq=freq, days=backfill_days)
+    else:
+        # From the watermark bar itself, so the first new return has its previous close
+        returns = aligned_returns(store, coins, freq=freq,
+                                  since_ms=state.watermark.value // 1_000_000)
+    if not returns.empty:
+        state.update(returns)
+        state.save(path)
+
+    return state
@@ -0,0 +1,306 @@
+import json
+import math
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from crypto_risk import config
+from crypto_risk.bars import BarStore, freq_ms, resample, to_frame
+from crypto_risk.sources import get_source, store_root
+from crypto_risk.storage import get_backend, root_lock
+
+MS_PER_DAY = 24 * 60 * 60 * 1000
+
+# CoinGecko only returns hourly points for windows of 2+ days
+MIN_FETCH_DAYS = 2
+
+# How far back the first fetch for a new coin goes
+BACKFILL_DAYS = 30
+
+# Longest `days` CoinGecko still answers with hourly points; longer gaps
+# are fetched as consecutive ranges of at most this length
+HOURLY_MAX_DAYS = 90
+
+
+# -------------------------------------------------
+# APPEND-ONLY PRICE STORE
+# -------------------------------------------------
+
+class PriceStore:
+    """Per-coin price history that only ever grows.
+
+    Each coin is stored as typed `timestamp` (epoch ms) and `price` columns
+    by a pluggable backend (see `crypto_risk.storage`). The last stored
+    timestamp of every coin is kept in `<root>/manifest.<backend>.json`, so
+    an update only asks the API for the days that are actually missing.
+    Writes hold the root's lock (see `storage.root_lock`), so several
+    processes can share one root.
+
+    OHLC/mean bars for `bar_frequencies` are materialized on every append,
+    so readers can use `bars()` instead of grouping raw ticks themselves.
+
+    `source` is where `update()` gets new prices (see `crypto_risk.sources`);
+    it defaults to the configured source and is only created on first use.
+    `root` defaults to that source's own directory (`sources.store_root`).
+    """
+
+    def __init__(self, root=None, backend=None, bar_frequencies=("1d",), source=None):
+        root = root or store_root(source.name if source is not None else None)
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+        self._source = source
+
+        self.bar_store = BarStore(root, bar_frequencies)
+
+        self.backend = get_backend(backend or config.STORAGE_BACKEND, root)
+        self.lock = root_lock(root)
+        self.manifest_path = os.path.join(root, f"manifest.{self.backend.name}.json")
+        self._manifest_mtime = None
+        self._manifest = {}
+        self._read_manifest()
+
+    # ---------------- MANIFEST ----------------
+
+    def _read_manifest(self):
+        """Reload the manifest if another writer has replaced it since."""
+        try:
+            mtime = os.stat(self.manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            return self._manifest
+
+        if mtime != self._manifest_mtime:
+            with open(self.manifest_path) as f:
+                self._manifest = json.load(f)
+            self._manifest_mtime = mtime
+        return self._manifest
+
+    def _set_watermark(self, coin_id, timestamp):
+        # Read-modify-write of the file on disk, under the root lock, so
+        # other processes' coins are never dropped
+        with self.lock:
+            self._read_manifest()
+            self._manifest[coin_id] = timestamp
+
+            tmp_path = self.manifest_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._manifest, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.manifest_path)
+            self._manifest_mtime = os.stat(self.manifest_path).st_mtime_ns
+
+    def path(self, coin_id):
+        return self.backend.path(coin_id)
+
+    @property
+    def source(self):
+        if self._source is None:
+            self._source = get_source()
+        return self._source
+
+    def coins(self):
+        return sorted(self._read_manifest())
+
+    def last_timestamp(self, coin_id):
+        return self._read_manifest().get(coin_id)
+
+    def first_timestamp(self, coin_id):
+        arrays = self.arrays(coin_id)
+        if arrays is None or len(arrays[0]) == 0:
+            return None
+        return int(arrays[0][0])
+
+    # ---------------- READ ----------------
+
+    def arrays(self, coin_id, days=None):
+        """Return (timestamps, prices) arrays without copying the backend data.
+
+        With the NumPy backend these are slices of memory-mapped files.
+        """
+        if not self.backend.exists(coin_id):
+            return None
+
+        timestamps, prices = self.backend.read(coin_id)
+
+        if days is not None and len(timestamps):
+            cutoff = timestamps[-1] - days * MS_PER_DAY
+            start = np.searchsorted(timestamps, cutoff, side="left")
+            timestamps, prices = timestamps[start:], prices[start:]
+
+        return timestamps, prices
+
+    def load(self, coin_id, days=None):
+        """Return the stored history, optionally only the last `days` days."""
+        arrays = self.arrays(coin_id, days)
+        if arrays is None:
+            return None
+
+        timestamps, prices = arrays
+        df = pd.DataFrame({"timestamp": timestamps, "price": prices})
+        df["date"] = pd.to_datetime(df["timestamp"], unit="ms")
+        return df
+
+    def bars(self, coin_id, freq="1d", days=None):
+        """OHLC/mean bars for one coin, optionally only the last `days` days.
+
+        Materialized frequencies are read from disk; any other supported
+        frequency is resampled from the raw prices on the fly.
+        """
+        arrays = self.arrays(coin_id)
+        if arrays is None:
+            return None
+
+        timestamps, prices = arrays
+
+        if freq in self.bar_store.frequencies:
+            bars = self.bar_store.read(coin_id, freq)
+            if bars is None:
+                self.bar_store.refresh(coin_id, timestamps, prices)
+                bars = self.bar_store.read(coin_id, freq)
+        else:
+            bars = resample(timestamps, prices, freq)
+
+        if days is not None and len(bars):
+            cutoff = timestamps[-1] - days * MS_PER_DAY
+            bars = bars[bars["timestamp"] + freq_ms(freq) > cutoff]
+
+        return to_frame(bars)
+
+    def export_csv(self, coin_id, path=None, days=None):
+        """Write a human-readable timestamp/date/price CSV for one coin."""
+        df = self.load(coin_id, days)
+        if df is None:
+            return None
+
+        path = path or os.path.join(self.root, f"{coin_id}_export.csv")
+        df[["timestamp", "date", "price"]].to_csv(path, index=False)
+        return path
+
+    # ---------------- WRITE ----------------
+
+    def _stored_last_timestamp(self, coin_id):
+        if not self.backend.exists(coin_id):
+            return None
+        timestamps, _ = self.backend.read(coin_id)
+        return int(timestamps[-1]) if len(timestamps) else None
+
+    def append(self, coin_id, df):
+        """Append rows newer than the stored watermark; returns rows written."""
+        new = df[["timestamp", "price"]].drop_duplicates("timestamp", keep="last")
+        new = new.sort_values("timestamp")
+
+        with self.lock:
+            # Watermark from the data itself: a crash after the backend write but
+            # before the manifest write must not append the same rows twice
+            last = self._stored_last_timestamp(coin_id)
+            if last is not None:
+                new = new[new["timestamp"] > last]
+
+            if new.empty:
+                if last is not None and self.last_timestamp(coin_id) != last:
+                    self._set_watermark(coin_id, last)
+                return 0
+
+            self.backend.append(coin_id, new["timestamp"].to_numpy(),
+                                new["price"].to_numpy())
+
+            # Bring the materialized bars up to date with the new ticks
+            self.bar_store.refresh(coin_id, *self.backend.read(coin_id))
+
+            self._set_watermark(coin_id, int(new["timestamp"].iloc[-1]))
+
+        return len(new)
+
+    def merge(self, coin_id, df):
+        """Add rows older than the stored history as well as newer ones.
+
+        Newer rows are a plain append. Older rows (a backfill for a longer
+        horizon) rewrite the coin's columns and bars once. Returns rows written.
+        """
+        rows = df[["timestamp", "price"]].drop_duplicates("timestamp", keep="last")
+        rows = rows.sort_values("timestamp")
+
+        with self.lock:
+            first = self.first_timestamp(coin_id)
+            if first is None:
+                return self.append(coin_id, rows)
+
+            older = rows[rows["timestamp"] < first]
+            if len(older):
+                timestamps, prices = self.backend.read(coin_id)
+                timestamps = np.concatenate([older["timestamp"].to_numpy(), timestamps])
+                prices = np.concatenate([older["price"].to_numpy(), prices])
+
+                self.backend.replace(coin_id, timestamps, prices)
+                self.bar_store.rebuild(coin_id, timestamps, prices)
+
+            return len(older) + self.append(coin_id, rows)
+
+    # ---------------- INCREMENTAL UPDATE ----------------
+
+    def missing_days(self, coin_id, now_ms=None, backfill_days=BACKFILL_DAYS):
+        """Smallest `days` window that covers everything after the watermark.
+
+        New coins get `backfill_days`; stored ones the whole gap, however
+        long, so an idle store never keeps a hole.
+        """
+        last = self.last_timestamp(coin_id)
+        if last is None:
+            return backfill_days
+
+        now_ms = now_ms or int(time.time() * 1000)
+        gap_days = math.ceil(max(now_ms - last, 0) / MS_PER_DAY)
+
+        return max(gap_days, MIN_FETCH_DAYS)
+
+    def fetch_since(self, coin_id, since_ms, vs_currency=config.DEFAULT_CURRENCY,
+                    now_ms=None, **kwargs):
+        """Every point after `since_ms`, fetched as ranges of <= HOURLY_MAX_DAYS.
+
+        Each range is answered with hourly points, however long the gap.
+        Stops at the first failed range so what is returned has no hole;
+        None when the first one fails.
+        """
+        now_ms = now_ms or int(time.time() * 1000)
+        chunk_ms = HOURLY_MAX_DAYS * MS_PER_DAY
+
+        frames = []
+        start = since_ms
+        while start < now_ms:
+            end = min(start + chunk_ms, now_ms)
+            # A short last range would come back at 5-minute granularity
+            df = self.source.fetch_range(coin_id, min(start, end - MIN_FETCH_DAYS * MS_PER_DAY),
+                                         end, vs_currency, **kwargs)
+            if df is None:
+                break
+            frames.append(df)
+            start = end
+
+        return pd.concat(frames, ignore_index=True) if frames else None
+
+    def update(self, coin_ids, vs_currency=config.DEFAULT_CURRENCY,
+               backfill_days=BACKFILL_DAYS, **kwargs):
+        """Fetch only the missing range for each coin and append it.
+
+        Returns a dict of coin_id -> rows appended (None when the fetch failed).
+        """
+        now_ms = int(time.time() * 1000)
+        plan = {coin_id: self.missing_days(coin_id, now_ms, backfill_days=backfill_days)
+                for coin_id in coin_ids}
+
+        # Gaps beyond the hourly window are fetched range by range
+        recent = {coin_id: days for coin_id, days in plan.items()
+                  if days <= HOURLY_MAX_DAYS or self.last_timestamp(coin_id) is None}
+        frames = (self.source.fetch_many(recent, days=recent, vs_currency=vs_currency, **kwargs)
+                  if recent else {})
+        for coin_id in plan:
+            if coin_id not in recent:
+                frames[coin_id] = self.fetch_since(coin_id, self.last_timestamp(coin_id),
+                                                   vs_currency, now_ms, **kwargs)
+
+        written = {}
+        for coin_id, df in frames.items():
+            written[coin_id] = None if df is None else self.append(coin_id, df)
+
+        return written
@@ -0,0 +1,233 @@
+import hashlib
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from io import BytesIO
+
+import plotly.io as pio
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Image, Paragraph, SimpleDocTemplate, Table, TableStyle
+
+from crypto_risk import perf
+
+# Rendered PNGs kept in memory, keyed by figure spec hash
+CACHE_SIZE = 256
+
+RENDER_WORKERS = int(os.environ.get("CRYPTO_RISK_RENDER_WORKERS", min(4, os.cpu_count() or 1)))
+
+# Renderer workers (one Chromium each) are stopped after this long unused
+RENDER_IDLE_SECONDS = float(os.environ.get("CRYPTO_RISK_RENDER_IDLE_SECONDS", "300"))
+
+
+# -------------------------------------------------
+# WARM RENDERER POOL
+# -------------------------------------------------
+
+def _warm_renderer():
+    # Start the worker's kaleido/Chromium process once, up front, so the
+    # first real chart does not pay the start-up cost
+    pio.to_image({"data": [], "layout": {}}, format="png", width=10, height=10)
+
+
+def _render_spec(spec_json, width, height):
+    return pio.to_image(pio.from_json(spec_json), format="png", width=width, height=height)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+_pool_users = 0
+_idle_timer = None
+
+
+def _get_pool():
+    """The shared pool, started on first use; pair every call with `_release_pool`."""
+    global _pool, _pool_users
+    with _pool_lock:
+        _cancel_idle_timer()
+        if _pool is None:
+            # Spawned, not forked: Streamlit and the scheduler run threads,
+            # and a forked copy of their locks can deadlock the worker
+            _pool = ProcessPoolExecutor(max_workers=RENDER_WORKERS,
+                                        mp_context=multiprocessing.get_context("spawn"),
+                                        initializer=_warm_renderer)
+        _pool_users += 1
+        return _pool
+
+
+def _release_pool():
+    global _pool_users, _idle_timer
+    with _pool_lock:
+        _pool_users -= 1
+        if _pool_users == 0 and _pool is not None:
+            _idle_timer = threading.Timer(RENDER_IDLE_SECONDS, _shutdown_if_idle)
+            _idle_timer.daemon = True
+            _idle_timer.start()
+
+
+def _cancel_idle_timer():
+    global _idle_timer
+    if _idle_timer is not None:
+        _idle_timer.cancel()
+        _idle_timer = None
+
+
+def _shutdown_if_idle():
+    global _pool
+    with _pool_lock:
+        if _pool_users or _pool is None:
+            return
+        pool, _pool = _pool, None
+    pool.shutdown()
+
+
+def shutdown_renderers():
+    global _pool
+    with _pool_lock:
+        _cancel_idle_timer()
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+# -------------------------------------------------
+# RENDER FIGURES (PARALLEL + CACHED)
+# -------------------------------------------------
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def figure_key(spec_json, width=None, height=None):
+    digest = hashlib.sha256(spec_json.encode("utf-8"))
+    digest.update(f"|{width}x{height}".encode("ascii"))
+    return digest.hexdigest()
+
+
+def _spec(figure):
+    return figure if isinstance(figure, str) else pio.to_json(figure)
+
+
+@perf.timed("render figures")
+def render_figures(figures, width=None, height=None, parallel=True):
+    """Render Plotly figures (objects or JSON specs) to PNG bytes.
+
+    Previously rendered specs come from an in-memory LRU cache; the rest are
+    rendered concurrently on a pool of warm kaleido workers.
+    """
+    specs = [_spec(figure) for figure in figures]
+    keys = [figure_key(spec, width, height) for spec in specs]
+
+    with _cache_lock:
+        images = {key: _cache[key] for key in keys if key in _cache}
+        for key in images:
+            _cache.move_to_end(key)
+
+    missing = {key: spec for key, spec in zip(keys, specs) if key not in images}
+
+    if missing:
+        if parallel and RENDER_WORKERS > 1 and len(missing) > 1:
+            pool = _get_pool()
+            try:
+                futures = {key: pool.submit(_render_spec, spec, width, height)
+                           for key, spec in missing.items()}
+                rendered = {key: future.result() for key, future in futures.items()}
+            finally:
+                _release_pool()
+        else:
+            rendered = {key: _render_spec(spec, width, height)
+                        for key, spec in missing.items()}
+
+        images.update(rendered)
+
+        with _cache_lock:
+            _cache.update(rendered)
+            while len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+
+    return [images[key] for key in keys]
+
+
+# -------------------------------------------------
+# PDF REPORT
+# -------------------------------------------------
+
+@perf.timed("build pdf")
+def build_pdf(df, charts, title="Crypto Volatility & Risk Analyzer – Final Dashboard Report",
+              parallel=True):
+    """Build the dashboard PDF and return its bytes.
+
+    `charts` is a list of (heading, figure, width, height); every figure is
+    rendered in one parallel batch and handed to ReportLab as an in-memory
+    PNG, so nothing touches the disk.
+    """
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    styles = getSampleStyleSheet()
+    elements = []
+
+    # Title
+    elements.append(Paragraph(f"<b>{title}</b>", styles["Title"]))
+
+    elements.append(Paragraph(
+        f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        styles["Normal"]
+    ))
+
+    elements.append(Paragraph("<br/>", styles["Normal"]))
+
+    # -------- Risk Classification Summary --------
+    elements.append(Paragraph("<b>Risk Classification Summary</b>", styles["Heading2"]))
+
+    stable = df[df["Risk Level"] == "Stable"]["Coin"].tolist()
+    alert = df[df["Risk Level"] == "Alert"]["Coin"].tolist()
+    extreme = df[df["Risk Level"] == "Extreme"]["Coin"].tolist()
+
+    elements.append(Paragraph(
+        f"<b>Stable:</b> {', '.join(stable) if stable else 'None'}<br/>"
+        f"<b>Alert:</b> {', '.join(alert) if alert else 'None'}<br/>"
+        f"<b>Extreme:</b> {', '.join(extreme) if extreme else 'None'}",
+        styles["Normal"]
+    ))
+
+    elements.append(Paragraph("<br/>", styles["Normal"]))
+
+    # -------- Risk Metrics Table --------
+    elements.append(Paragraph("<b>Final Risk Metrics</b>", styles["Heading2"]))
+
+    table_data = [list(df.columns)] + df.values.tolist()
+    table = Table(table_data, repeatRows=1)
+    table.setStyle(TableStyle([
+        ("GRID", (0,0), (-1,-1), 1, colors.black),
+        ("BACKGROUND", (0,0), (-1,0), colors.darkgray),
+        ("TEXTCOLOR", (0,0), (-1,0), colors.whitesmoke),
+        ("ALIGN", (0,0), (-1,-1), "CENTER"),
+    ]))
+    elements.append(table)
+
+    # -------- Charts (rendered together, kept in memory) --------
+    images = render_figures([figure for _, figure, _, _ in charts], parallel=parallel)
+
+    for (heading, _, width, height), png in zip(charts, images):
+        elements.append(Paragraph("<br/>", styles["Normal"]))
+        elements.append(Paragraph(f"<b>{heading}</b>", styles["Heading2"]))
+        elements.append(Image(BytesIO(png), width=width, height=height))
+
+    # Footer
+    elements.append(Paragraph("<br/><br/>", styles["Normal"]))
+    elements.append(Paragraph(
+        "Internship Project | Crypto Volatility & Risk Analyzer",
+        styles["Normal"]
+    ))
+
+    doc.build(elements)
+    return buffer.getvalue()
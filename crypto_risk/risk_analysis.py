@@ -0,0 +1,183 @@
+"""Score every coin and publish final_risk_analysis.csv.
+
+    python -m crypto_risk analyze [--days 30] [--window 7]
+    python -m crypto_risk analyze --days 7 30 90 --currency usd eur
+
+With several horizons / currencies every combination is scored from one
+shared fetch and written to final_risk_analysis_<days>d_<currency>.csv.
+"""
+import argparse
+import os
+
+from crypto_risk import config, perf
+from crypto_risk.bars import bar_panel
+from crypto_risk.planner import QueryPlanner
+from crypto_risk.price_store import PriceStore
+from crypto_risk.risk_engine import classify, compute_risk, price_matrix, returns_matrix
+from crypto_risk.snapshot import SNAPSHOT_FILE, build_snapshot, write_snapshot
+from crypto_risk.sources import SOURCES, get_source
+from crypto_risk.storage import write_csv_atomic
+from crypto_risk.var import METHODS, var_table
+
+OUTPUT_FILE = "final_risk_analysis.csv"
+
+
+def run_analysis(store=None, coins=config.COINS, days=30, window=7,
+                 weights=(0.6, 0.4), quantiles=(0.30, 0.70),
+                 var_method="historical", confidence=0.95, forecast=False,
+                 currency=config.DEFAULT_CURRENCY, output=OUTPUT_FILE,
+                 snapshot=SNAPSHOT_FILE, refresh=True):
+    """Run the full analysis; returns the risk table, or None without data."""
+    run = perf.start_run("analyze")
+
+    # -------------------------------------------------
+    # STEP 1: REFRESH PRICE STORE AND LOAD LAST `days` DAYS
+    # -------------------------------------------------
+
+    perf.section("step 1: refresh + load")
+    store = store or PriceStore()
+    planner = QueryPlanner(store)
+    if refresh:
+        planner.execute([(coin_id, days, currency) for coin_id in coins.values()])
+
+    # Any horizon / currency is derived from the stored USD history
+    frames = {coin_id: planner.series(coin_id, days, currency) for coin_id in coins.values()}
+
+    # -------------------------------------------------
+    # STEP 2: CALCULATE RISK SCORES (ALL COINS IN ONE PASS)
+    # -------------------------------------------------
+
+    perf.section("step 2: risk scores")
+    for coin_name, coin_id in coins.items():
+        if frames[coin_id] is None:
+            print(f"Skipping {coin_name} (No data found)")
+
+    prices = price_matrix({coin_name: frames[coin_id] for coin_name, coin_id in coins.items()})
+
+    # ✅ SAFETY CHECK (prevents crash)
+    if prices.empty:
+        perf.end_run(run)
+        return None
+
+    final_df = compute_risk(prices, window=window, weights=weights)
+
+    # -------------------------------------------------
+    # STEP 3: DYNAMIC RISK CLASSIFICATION (PERCENTILES)
+    # -------------------------------------------------
+
+    perf.section("step 3: classify")
+    final_df["Risk Level"] = classify(final_df["Risk Score"], *quantiles)
+
+    # -------------------------------------------------
+    # STEP 3b: VALUE-AT-RISK / EXPECTED SHORTFALL
+    # -------------------------------------------------
+
+    perf.section("step 3b: var")
+    if var_method:
+        var_df = var_table(returns_matrix(prices), method=var_method, confidence=confidence)
+        final_df = final_df.merge(var_df, on="Coin", how="left")
+
+    # -------------------------------------------------
+    # STEP 3c (OPTIONAL): FORWARD-LOOKING RISK SCORE
+    # -------------------------------------------------
+
+    if forecast:
+        perf.section("step 3c: forecast")
+
+        # Imported lazily: only needed when forecasting is switched on
+        from crypto_risk.forecast import ModelCache, forecast_volatility
+
+        watermarks = {coin_name: store.last_timestamp(coin_id)
+                      for coin_name, coin_id in coins.items()}
+        returns = returns_matrix(prices)
+        forecast_df = forecast_volatility(returns, watermarks, ModelCache(root=store.root),
+                                          days=days, currency=currency)
+
+        # Same blend as the Risk Score, with the backward-looking rolling
+        # volatility swapped for the next-period GARCH forecast
+        overall = returns.std().to_numpy() * 100
+        next_vol = forecast_df["GARCH Vol Next (%)"].astype("float64").to_numpy()
+
+        final_df["Forecast Volatility (%)"] = next_vol.round(2)
+        final_df["Forward Risk Score"] = ((overall * weights[0]) + (next_vol * weights[1])).round(2)
+
+    # -------------------------------------------------
+    # STEP 4: SAVE RESULTS
+    # -------------------------------------------------
+
+    perf.section("step 4: save")
+    # Temp file + rename, so the dashboard never reads a half-written CSV
+    if output:
+        write_csv_atomic(final_df, output)
+
+    # -------------------------------------------------
+    # STEP 5: PUBLISH DASHBOARD SNAPSHOT (METRICS + FIGURE JSON)
+    # -------------------------------------------------
+
+    if output and snapshot:
+        perf.section("step 5: snapshot")
+
+        # Same daily panel the dashboard's risk-return chart is built from
+        daily_panel = bar_panel({coin_name: planner.bars(coin_id, "1d", days, currency)
+                                 for coin_name, coin_id in coins.items()})
+        watermark = max((store.last_timestamp(coin_id) or 0 for coin_id in coins.values()),
+                        default=None)
+
+        write_snapshot(build_snapshot(final_df, daily_panel, watermark), snapshot)
+
+    perf.end_run(run)
+    return final_df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crypto volatility & risk analysis")
+    parser.add_argument("--days", type=int, nargs="+", default=[30],
+                        help="lookback window(s) in days")
+    parser.add_argument("--currency", nargs="+", default=[config.DEFAULT_CURRENCY],
+                        help="quote currency / currencies (e.g. usd eur)")
+    parser.add_argument("--window", type=int, default=7, help="rolling volatility window")
+    parser.add_argument("--var-method", choices=METHODS, default="historical")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--forecast", action="store_true",
+                        help="add GARCH(1,1) forecast volatility and a Forward Risk Score")
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    parser.add_argument("--snapshot", default=SNAPSHOT_FILE,
+                        help="dashboard snapshot path ('' to skip)")
+    parser.add_argument("--no-refresh", action="store_true",
+                        help="use the stored prices without fetching")
+    parser.add_argument("--data-dir", default=None,
+                        help="store root (default data/, or data/<source>/ for offline sources)")
+    parser.add_argument("--source", choices=list(SOURCES), default=config.DATA_SOURCE,
+                        help="where prices come from (see crypto_risk/sources.py)")
+    args = parser.parse_args(argv)
+
+    store = PriceStore(args.data_dir, source=get_source(args.source))
+    combos = [(days, currency) for days in args.days for currency in args.currency]
+
+    # One plan for every combination: each coin is fetched at most once
+    if not args.no_refresh:
+        QueryPlanner(store).execute([(coin_id, days, currency)
+                                     for days, currency in combos
+                                     for coin_id in config.COINS.values()])
+
+    for i, (days, currency) in enumerate(combos):
+        output = args.output
+        if len(combos) > 1:
+            root, ext = os.path.splitext(args.output)
+            output = f"{root}_{days}d_{currency}{ext}"
+
+        final_df = run_analysis(store=store, days=days, window=args.window,
+                                var_method=args.var_method, confidence=args.confidence,
+                                forecast=args.forecast, currency=currency, output=output,
+                                # The dashboard snapshot follows the first combination
+                                snapshot=args.snapshot if i == 0 else None,
+                                refresh=False)
+
+        if final_df is None:
+            print("No data available. Risk analysis cannot be performed.")
+            return 1
+
+        print(f"Final risk classification completed successfully! ({days}d, {currency.upper()})")
+        print(final_df)
+
+    return 0
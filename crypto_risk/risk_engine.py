@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+# Columns written to final_risk_analysis.csv
+RISK_COLUMNS = [
+    "Coin",
+    "Overall Volatility (%)",
+    "Avg Rolling Volatility (%)",
+    "Risk Score",
+    "Risk Level"
+]
+
+RISK_LEVELS = ["Stable", "Alert", "Extreme"]
+
+
+# -------------------------------------------------
+# WIDE PRICE MATRIX (time x coin)
+# -------------------------------------------------
+
+def price_matrix(frames, column="price"):
+    """Stack per-coin price series into one time x coin DataFrame.
+
+    Series are aligned on their latest point; shorter histories are padded
+    with NaN at the top, which every statistic below skips exactly like the
+    per-coin calculation would.
+    """
+    frames = {name: df for name, df in frames.items() if df is not None and len(df)}
+    n_rows = max((len(df) for df in frames.values()), default=0)
+
+    values = np.full((n_rows, len(frames)), np.nan)
+    for j, df in enumerate(frames.values()):
+        prices = np.asarray(df[column], dtype="float64")
+        values[n_rows - len(prices):, j] = prices
+
+    return pd.DataFrame(values, columns=list(frames))
+
+
+def returns_matrix(prices):
+    # Same arithmetic as Series.pct_change(), for every coin at once
+    return prices / prices.shift(1) - 1
+
+
+# -------------------------------------------------
+# RISK SCORES FOR EVERY COIN IN ONE PASS
+# -------------------------------------------------
+
+def compute_risk(prices, window=7, weights=(0.6, 0.4)):
+    """Overall volatility, average rolling volatility and Risk Score per coin."""
+    returns = returns_matrix(prices)
+
+    overall_volatility = returns.std() * 100
+    avg_rolling_volatility = (returns.rolling(window=window).std() * 100).mean()
+
+    risk_score = (overall_volatility * weights[0]) + (avg_rolling_volatility * weights[1])
+
+    return pd.DataFrame({
+        "Coin": prices.columns,
+        "Overall Volatility (%)": overall_volatility.round(2).to_numpy(),
+        "Avg Rolling Volatility (%)": avg_rolling_volatility.round(2).to_numpy(),
+        "Risk Score": risk_score.round(2).to_numpy()
+    })
+
+
+def classify(risk_scores, low=0.30, high=0.70):
+    """Percentile-based Stable / Alert / Extreme labels."""
+    low_threshold = risk_scores.quantile(low)
+    high_threshold = risk_scores.quantile(high)
+
+    levels = np.select(
+        [risk_scores <= low_threshold, risk_scores <= high_threshold],
+        RISK_LEVELS[:2],
+        default=RISK_LEVELS[2]
+    )
+
+    return pd.Series(levels, index=risk_scores.index)
+
+
+def analyze(prices, window=7, weights=(0.6, 0.4), quantiles=(0.30, 0.70)):
+    """Full risk table (scores + Risk Level) for a wide price matrix."""
+    final_df = compute_risk(prices, window=window, weights=weights)
+    final_df["Risk Level"] = classify(final_df["Risk Score"], *quantiles)
+    return final_df
+
+
+# -------------------------------------------------
+# RISK-RETURN FOR DAILY PRICES
+# -------------------------------------------------
+
+def risk_return(daily_prices):
+    """Mean daily return and volatility (both in %) for every coin."""
+    returns = returns_matrix(daily_prices)
+
+    return pd.DataFrame({
+        "Coin": daily_prices.columns,
+        "Return (%)": (returns.mean() * 100).to_numpy(),
+        "Volatility (%)": (returns.std() * 100).to_numpy()
+    })
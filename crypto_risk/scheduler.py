@@ -0,0 +1,165 @@
+"""Background refresh service: fetch -> risk compute -> atomic publish.
+
+    python -m crypto_risk.scheduler --interval 3600 --jitter 0.1
+    python -m crypto_risk.scheduler --once --api-url http://127.0.0.1:8000
+"""
+import argparse
+import json
+import os
+import random
+import time
+import traceback
+from datetime import datetime, timezone
+
+from crypto_risk import config
+from crypto_risk.data_fetch import fetch_prices
+from crypto_risk.portfolio import update_covariance_state
+from crypto_risk.price_store import PriceStore
+from crypto_risk.risk_analysis import OUTPUT_FILE, run_analysis
+from crypto_risk.sources import SOURCES, get_source
+
+STATUS_FILE = "data/refresh_status.json"
+
+
+# -------------------------------------------------
+# ONE PIPELINE RUN
+# -------------------------------------------------
+
+def run_pipeline(store, coins=config.COINS, output=OUTPUT_FILE, days=30):
+    """Refresh prices, score every coin and publish the CSV atomically."""
+    # Full dashboard history + FX series, so pages never fetch themselves
+    fetch_prices(store, coins)
+
+    final_df = run_analysis(store, coins, days=days, output=output)
+
+    if final_df is None:
+        raise RuntimeError("No data available. Risk analysis cannot be performed.")
+
+    # Fold only the new bars into the running covariance / EWMA state
+    update_covariance_state(store, coins)
+
+    return final_df
+
+
+# -------------------------------------------------
+# STATUS (LAST RUN DURATION / STALENESS)
+# -------------------------------------------------
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def write_status(path, status):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(status, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def read_status(path=STATUS_FILE):
+    """Last run status plus `staleness_seconds` since the last successful run."""
+    if not os.path.exists(path):
+        return None
+
+    with open(path) as f:
+        status = json.load(f)
+
+    last_success = status.get("last_success")
+    if last_success:
+        age = _now() - datetime.fromisoformat(last_success)
+        status["staleness_seconds"] = age.total_seconds()
+    else:
+        status["staleness_seconds"] = None
+
+    return status
+
+
+# -------------------------------------------------
+# SCHEDULER LOOP
+# -------------------------------------------------
+
+class RefreshScheduler:
+    """Runs the pipeline every `interval` seconds, +/- `jitter` (a fraction)."""
+
+    def __init__(self, interval=3600, jitter=0.1, store=None, coins=config.COINS,
+                 output=OUTPUT_FILE, status_path=STATUS_FILE):
+        self.interval = interval
+        self.jitter = jitter
+        self.store = store or PriceStore()
+        self.coins = coins
+        self.output = output
+        self.status_path = status_path
+
+        previous = read_status(status_path) or {}
+        self.status = {
+            "last_run_started": None,
+            "last_run_duration_seconds": None,
+            "last_success": previous.get("last_success"),
+            "last_error": None,
+            "runs": previous.get("runs", 0)
+        }
+
+    def run_once(self):
+        started = _now()
+        start = time.perf_counter()
+
+        self.status["last_run_started"] = started.isoformat()
+        try:
+            final_df = run_pipeline(self.store, self.coins, self.output)
+            self.status["last_success"] = _now().isoformat()
+            self.status["last_error"] = None
+            self.status["coins"] = len(final_df)
+        except Exception as e:
+            final_df = None
+            self.status["last_error"] = f"{type(e).__name__}: {e}"
+            traceback.print_exc()
+
+        self.status["last_run_duration_seconds"] = round(time.perf_counter() - start, 3)
+        self.status["runs"] += 1
+        write_status(self.status_path, self.status)
+
+        return final_df
+
+    def next_delay(self):
+        spread = self.interval * self.jitter
+        return max(0.0, self.interval + random.uniform(-spread, spread))
+
+    def run_forever(self):
+        while True:
+            self.run_once()
+            delay = self.next_delay()
+            print(f"[{_now():%Y-%m-%d %H:%M:%S}] run took "
+                  f"{self.status['last_run_duration_seconds']}s, next in {delay:.0f}s")
+            time.sleep(delay)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Periodic risk analysis refresh")
+    parser.add_argument("--interval", type=float, default=3600, help="seconds between runs")
+    parser.add_argument("--jitter", type=float, default=0.1, help="fraction of interval")
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    parser.add_argument("--status", default=STATUS_FILE)
+    parser.add_argument("--api-url", help="override the CoinGecko base URL (e.g. a local stub)")
+    parser.add_argument("--once", action="store_true", help="run a single refresh and exit")
+    parser.add_argument("--source", choices=list(SOURCES), default=config.DATA_SOURCE,
+                        help="where prices come from (see crypto_risk/sources.py)")
+    parser.add_argument("--data-dir", default=None,
+                        help="store root (default data/, or data/<source>/ for offline sources)")
+    args = parser.parse_args(argv)
+
+    if args.api_url:
+        config.API_URL = args.api_url.rstrip("/")
+
+    store = PriceStore(args.data_dir, source=get_source(args.source))
+    scheduler = RefreshScheduler(args.interval, args.jitter, store=store,
+                                 output=args.output, status_path=args.status)
+
+    if args.once:
+        scheduler.run_once()
+        print(json.dumps(read_status(args.status), indent=2))
+    else:
+        scheduler.run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""Precomputed dashboard snapshot: metrics, risk buckets and figure JSON.
+
+run_analysis publishes it next to final_risk_analysis.csv. The dashboard
+loads it once per file change and then only renders: no CSV parsing,
+filtering or Plotly figure construction happens on a rerun.
+
+The file carries a schema `version` (older files are ignored) and the data
+`watermark`: the newest stored price timestamp the results were built from.
+"""
+import json
+import os
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from crypto_risk.risk_engine import RISK_LEVELS, risk_return
+
+SNAPSHOT_FILE = "data/dashboard_snapshot.json"
+
+SNAPSHOT_VERSION = 1
+
+RISK_COLORS = {
+    "Stable": "#2ecc71",
+    "Alert": "#f1c40f",
+    "Extreme": "#e74c3c"
+}
+
+
+# -------------------------------------------------
+# RISK TABLE STYLE
+# -------------------------------------------------
+
+def risk_level_style(val):
+    if val == "Stable":
+        return f"background-color: {RISK_COLORS['Stable']}; color: black"
+    elif val == "Alert":
+        return f"background-color: {RISK_COLORS['Alert']}; color: black"
+    else:
+        return f"background-color: {RISK_COLORS['Extreme']}; color: white"
+
+
+def styled_table(df, level_css=None):
+    """A new Styler of `df` with its Risk Level cells coloured.
+
+    `level_css` (one CSS string per row, e.g. `Snapshot.level_css`) skips
+    styling cell by cell. Build one per render: a Styler is mutated while
+    it renders, so it must not be shared between sessions.
+    """
+    if level_css is None:
+        return df.style.map(risk_level_style, subset=["Risk Level"])
+    return df.style.apply(lambda _: level_css, subset=["Risk Level"])
+
+
+# -------------------------------------------------
+# FIGURES (SAME DEFINITIONS THE DASHBOARD USED INLINE)
+# -------------------------------------------------
+
+def risk_score_figure(df):
+    import plotly.express as px
+
+    fig = px.bar(
+        df,
+        x="Coin",
+        y="Risk Score",
+        color="Risk Level",
+        color_discrete_map=RISK_COLORS,
+        text="Risk Score",
+        title="Risk Score Comparison Across Cryptocurrencies",
+        template="plotly_dark"
+    )
+
+    fig.update_traces(
+        texttemplate='%{text:.2f}',
+        textposition='outside'
+    )
+
+    fig.update_layout(
+        xaxis_title="Cryptocurrency",
+        yaxis_title="Risk Score",
+        hovermode="x unified",
+        height=450
+    )
+    return fig
+
+
+def risk_return_figure(daily_panel):
+    import plotly.express as px
+
+    # Daily returns, mean return and volatility for every coin at once
+    rr_df = risk_return(daily_panel)
+
+    # 🔧 FIX: Bubble size must be positive
+    rr_df["Bubble Size"] = rr_df["Return (%)"].abs()
+
+    fig = px.scatter(
+        rr_df,
+        x="Volatility (%)",
+        y="Return (%)",
+        color="Coin",
+        size="Bubble Size",
+        hover_name="Coin",
+        template="plotly_dark",
+        title="Risk–Return Comparison Across Cryptocurrencies",
+        height=450
+    )
+
+    fig.update_traces(
+        marker=dict(
+            line=dict(width=1, color="white"),
+            sizemode="area",
+            sizeref=2. * rr_df["Bubble Size"].max() / (40 ** 2),
+            sizemin=8
+        )
+    )
+
+    fig.update_layout(
+        xaxis_title="Volatility (%)",
+        yaxis_title="Return (%)",
+        hovermode="closest"
+    )
+    return fig
+
+
+def risk_distribution_figure(counts):
+    import plotly.express as px
+
+    risk_dist_df = pd.DataFrame({
+        "Risk Level": ["High", "Medium", "Low"],
+        "Count": [counts["Extreme"], counts["Alert"], counts["Stable"]]
+    })
+
+    return px.pie(
+        risk_dist_df,
+        names="Risk Level",
+        values="Count",
+        hole=0.55,
+        color="Risk Level",
+        color_discrete_map={
+            "High": RISK_COLORS["Extreme"],
+            "Medium": RISK_COLORS["Alert"],
+            "Low": RISK_COLORS["Stable"]
+        },
+        title="Risk Distribution",
+        template="plotly_dark"
+    )
+
+
+# -------------------------------------------------
+# BUILD / WRITE / READ
+# -------------------------------------------------
+
+def build_snapshot(final_df, daily_panel=None, watermark=None):
+    """Everything the dashboard shows about the risk table, as plain JSON."""
+    table = json.loads(final_df.to_json(orient="split", index=False))
+
+    buckets = {
+        level: [[coin, score] for coin, score in
+                final_df.loc[final_df["Risk Level"] == level, ["Coin", "Risk Score"]].values.tolist()]
+        for level in RISK_LEVELS
+    }
+    counts = {level: len(rows) for level, rows in buckets.items()}
+
+    figures = {
+        "risk_score": risk_score_figure(final_df).to_json(),
+        "risk_distribution": risk_distribution_figure(counts).to_json()
+    }
+    if daily_panel is not None and not daily_panel.empty:
+        figures["risk_return"] = risk_return_figure(daily_panel).to_json()
+
+    return {
+        "version": SNAPSHOT_VERSION,
+        "watermark": watermark,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "table": table,
+        "metrics": {row[0]: dict(zip(table["columns"], row)) for row in table["data"]},
+        "buckets": buckets,
+        "summary": {
+            "total": len(final_df),
+            "avg_risk": float(final_df["Risk Score"].mean()),
+            "counts": counts
+        },
+        "figures": figures
+    }
+
+
+def write_snapshot(snapshot, path=SNAPSHOT_FILE):
+    # Temp file + rename, like the CSV, so readers never see half a snapshot
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path=SNAPSHOT_FILE):
+    """The snapshot dict, or None if missing or written by another schema."""
+    if not os.path.exists(path):
+        return None
+
+    with open(path) as f:
+        snapshot = json.load(f)
+
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        return None
+    return snapshot
+
+
+# -------------------------------------------------
+# LOADED VIEW FOR THE DASHBOARD
+# -------------------------------------------------
+
+class Snapshot:
+    """A snapshot with its table and figures deserialized once.
+
+    Meant to be cached (e.g. st.cache_resource keyed by file mtime) and
+    shared read-only between every session.
+    """
+
+    def __init__(self, data):
+        import plotly.io as pio
+
+        self.data = data
+        self.watermark = data["watermark"]
+        self.created = data["created"]
+
+        self.table = pd.DataFrame(data["table"]["data"], columns=data["table"]["columns"])
+        self.coins = [row[0] for row in data["table"]["data"]]
+        self.metrics = data["metrics"]
+        self.buckets = data["buckets"]
+        self.summary = data["summary"]
+
+        # Served as-is by the CSV download button
+        self.csv = self.table.to_csv(index=False)
+
+        # Plain strings, safe to share; the Styler itself is built per rerun
+        self.level_css = [risk_level_style(level) for level in self.table["Risk Level"]]
+
+        self.figure_json = data["figures"]
+        self.figures = {name: pio.from_json(spec) for name, spec in self.figure_json.items()}
@@ -0,0 +1,277 @@
+"""Pluggable price sources behind PriceStore.update().
+
+    live       CoinGecko `market_chart` (or COINGECKO_API_URL)
+    replay     stored history played back on a virtual clock
+    synthetic  GBM-with-jumps prices generated on the fly
+
+Every source answers `fetch_many(coin_ids, days, vs_currency)` with the same
+coin_id -> timestamp/price/date DataFrame dict as the live fetcher (and
+`fetch_range(coin_id, start_ms, end_ms, vs_currency)` with one such frame),
+so the store, the pipeline and the dashboard do not care where prices come
+from.
+Pick one with CRYPTO_RISK_SOURCE (and the CRYPTO_RISK_REPLAY_* /
+CRYPTO_RISK_SYNTHETIC_* settings in crypto_risk/config.py), or `--source` on
+the CLI. Unless given a root (`--data-dir`), offline sources store their
+prices under `data/<source>/` (see `store_root`), so replayed or generated
+prices never mix with the real store.
+
+The replay and synthetic sources have no currency conversion: prices are
+served in whatever currency they were recorded / generated in.
+"""
+import glob
+import json
+import os
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from crypto_risk import config
+from crypto_risk.fetcher import fetch_market_chart, fetch_market_chart_range, fetch_many
+from crypto_risk.storage import get_backend
+from crypto_risk.synthetic import HOUR_MS, YEAR_MS, coin_params, gbm_with_jumps
+
+MS_PER_DAY = 24 * HOUR_MS
+
+
+def _frame(timestamps, prices):
+    # Same shape as fetcher.fetch_market_chart
+    df = pd.DataFrame({"timestamp": np.asarray(timestamps, dtype="int64"),
+                       "price": np.asarray(prices, dtype="float64")})
+    df["date"] = pd.to_datetime(df["timestamp"], unit="ms")
+    return df
+
+
+def _range(timestamps, prices, start_ms, end_ms):
+    """Points in [start, end], like a market_chart/range request."""
+    end = np.searchsorted(timestamps, end_ms, side="right")
+    start = np.searchsorted(timestamps, start_ms, side="left")
+    if end <= start:
+        return None
+    return _frame(timestamps[start:end], prices[start:end])
+
+
+def _window(timestamps, prices, now_ms, days):
+    """Points in (now - days, now], like a `days=` market_chart request."""
+    return _range(timestamps, prices, now_ms - float(days) * MS_PER_DAY, now_ms)
+
+
+# -------------------------------------------------
+# LIVE (COINGECKO)
+# -------------------------------------------------
+
+class LiveSource:
+    name = "live"
+
+    def fetch(self, coin_id, days=config.DEFAULT_DAYS,
+              vs_currency=config.DEFAULT_CURRENCY, **kwargs):
+        return fetch_market_chart(coin_id, days, vs_currency, **kwargs)
+
+    def fetch_many(self, coin_ids, days=config.DEFAULT_DAYS,
+                   vs_currency=config.DEFAULT_CURRENCY, **kwargs):
+        return fetch_many(coin_ids, days, vs_currency, **kwargs)
+
+    def fetch_range(self, coin_id, start_ms, end_ms,
+                    vs_currency=config.DEFAULT_CURRENCY, **kwargs):
+        # fetch_many's pool options do not apply to a single request
+        kwargs.pop("max_workers", None)
+        kwargs.pop("rate_limit", None)
+        return fetch_market_chart_range(coin_id, start_ms, end_ms, vs_currency, **kwargs)
+
+
+class _LocalSource:
+    """Shared `fetch_many` for sources that answer from memory.
+
+    Keyword arguments meant for the HTTP fetcher (session, max_workers, ...)
+    are accepted and ignored.
+    """
+
+    def fetch_many(self, coin_ids, days=config.DEFAULT_DAYS,
+                   vs_currency=config.DEFAULT_CURRENCY, **kwargs):
+        frames = {}
+        for coin_id in coin_ids:
+            coin_days = days.get(coin_id) if isinstance(days, dict) else days
+            frames[coin_id] = self.fetch(coin_id, coin_days, vs_currency)
+        return frames
+
+
+# -------------------------------------------------
+# REPLAY OF STORED HISTORY
+# -------------------------------------------------
+
+def _read_legacy_csv(path):
+    """Timestamps for the old date,price CSVs (one date per row, no time).
+
+    Rows within a day are spread evenly over that day, which is how the
+    hourly points were sampled in the first place.
+    """
+    df = pd.read_csv(path)
+    if "timestamp" in df.columns:
+        return df["timestamp"].to_numpy("int64"), df["price"].to_numpy("float64")
+
+    day_ms = pd.to_datetime(df["date"]).to_numpy("datetime64[ms]").astype("int64")
+    position = df.groupby("date").cumcount().to_numpy()
+    per_day = df.groupby("date")["date"].transform("size").to_numpy()
+
+    timestamps = day_ms + (position * MS_PER_DAY // per_day)
+    return timestamps.astype("int64"), df["price"].to_numpy("float64")
+
+
+def load_archive(path):
+    """coin_id -> (timestamps, prices) from a PriceStore root or legacy CSVs.
+
+    A directory with a `manifest.<backend>.json` is read as a recorded
+    PriceStore (e.g. a copy of data/); otherwise `<coin>_price_*_days.csv`
+    files are used.
+    """
+    history = {}
+
+    manifests = sorted(glob.glob(os.path.join(path, "manifest.*.json")))
+    if manifests:
+        backend = get_backend(os.path.basename(manifests[0]).split(".")[1], path)
+        with open(manifests[0]) as f:
+            coin_ids = sorted(json.load(f))
+        for coin_id in coin_ids:
+            if backend.exists(coin_id):
+                timestamps, prices = backend.read(coin_id)
+                history[coin_id] = (np.array(timestamps), np.array(prices))
+        return history
+
+    for csv_path in sorted(glob.glob(os.path.join(path, "*_price_*_days.csv"))):
+        coin_id = os.path.basename(csv_path).split("_price_")[0]
+        history[coin_id] = _read_legacy_csv(csv_path)
+
+    return history
+
+
+class ReplaySource(_LocalSource):
+    """Serves recorded history as if it were arriving live.
+
+    The virtual clock starts `lead_days` after the earliest recorded point and
+    runs `speed` times faster than real time (3600 = one recorded hour per
+    second), stopping at the last recorded point. `speed=0` serves the whole
+    archive at once.
+    """
+
+    name = "replay"
+
+    def __init__(self, path=None, speed=None, lead_days=1.0):
+        self.path = path or config.REPLAY_PATH
+        self.speed = config.REPLAY_SPEED if speed is None else speed
+        self.history = load_archive(self.path)
+
+        if not self.history:
+            raise ValueError(f"No recorded prices found in '{self.path}'")
+
+        self.first_ms = min(int(ts[0]) for ts, _ in self.history.values() if len(ts))
+        self.last_ms = max(int(ts[-1]) for ts, _ in self.history.values() if len(ts))
+        self.start_ms = min(self.first_ms + lead_days * MS_PER_DAY, self.last_ms)
+        self._wall_start = time.time()
+
+    def now_ms(self):
+        if not self.speed:
+            return self.last_ms
+        elapsed_ms = (time.time() - self._wall_start) * 1000 * self.speed
+        return min(self.start_ms + elapsed_ms, self.last_ms)
+
+    def fetch(self, coin_id, days=config.DEFAULT_DAYS,
+              vs_currency=config.DEFAULT_CURRENCY, **kwargs):
+        if coin_id not in self.history:
+            return None
+        timestamps, prices = self.history[coin_id]
+        return _window(timestamps, prices, self.now_ms(), days)
+
+    def fetch_range(self, coin_id, start_ms, end_ms,
+                    vs_currency=config.DEFAULT_CURRENCY, **kwargs):
+        if coin_id not in self.history:
+            return None
+        timestamps, prices = self.history[coin_id]
+        return _range(timestamps, prices, start_ms, min(end_ms, self.now_ms()))
+
+
+# -------------------------------------------------
+# SYNTHETIC GENERATOR
+# -------------------------------------------------
+
+class SyntheticSource(_LocalSource):
+    """GBM-with-jumps prices for any coin id, extended as time passes.
+
+    Each coin's path is seeded from (`seed`, coin id), so a coin looks the
+    same in every process. `history_days` of hourly history exist when the
+    source is created; after that the clock runs `speed` times real time.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, seed=None, history_days=None, speed=1.0, step_ms=HOUR_MS):
+        self.seed = config.SYNTHETIC_SEED if seed is None else seed
+        self.history_days = config.SYNTHETIC_HISTORY_DAYS if history_days is None else history_days
+        self.speed = speed
+        self.step_ms = step_ms
+
+        self.start_ms = int(time.time() * 1000) // step_ms * step_ms
+        self._wall_start = time.time()
+        self._paths = {}   # coin_id -> [timestamps, prices, rng, params]
+
+    def now_ms(self):
+        return self.start_ms + (time.time() - self._wall_start) * 1000 * self.speed
+
+    def _extend(self, coin_id, until_ms):
+        path = self._paths.get(coin_id)
+
+        if path is None:
+            rng = np.random.default_rng([self.seed, zlib.crc32(coin_id.encode("utf-8"))])
+            params = coin_params(rng)
+            first_ms = self.start_ms - int(self.history_days * MS_PER_DAY)
+            path = [np.array([first_ms], dtype="int64"),
+                    np.array([params.pop("start_price")]), rng, params]
+            self._paths[coin_id] = path
+
+        timestamps, prices, rng, params = path
+        n_new = int((until_ms - timestamps[-1]) // self.step_ms)
+
+        if n_new > 0:
+            # Generate from the last price; drop the repeated first point
+            new_prices = gbm_with_jumps(n_new + 1, self.step_ms / YEAR_MS, rng=rng,
+                                        start_price=prices[-1], **params)[1:]
+            new_times = timestamps[-1] + self.step_ms * np.arange(1, n_new + 1, dtype="int64")
+            path[0] = np.concatenate([timestamps, new_times])
+            path[1] = np.concatenate([prices, new_prices])
+
+        return path[0], path[1]
+
+    def fetch(self, coin_id, days=config.DEFAULT_DAYS,
+              vs_currency=config.DEFAULT_CURRENCY, **kwargs):
+        now_ms = self.now_ms()
+        timestamps, prices = self._extend(coin_id, now_ms)
+        return _window(timestamps, prices, now_ms, days)
+
+    def fetch_range(self, coin_id, start_ms, end_ms,
+                    vs_currency=config.DEFAULT_CURRENCY, **kwargs):
+        end_ms = min(end_ms, self.now_ms())
+        timestamps, prices = self._extend(coin_id, end_ms)
+        return _range(timestamps, prices, start_ms, end_ms)
+
+
+SOURCES = {
+    LiveSource.name: LiveSource,
+    ReplaySource.name: ReplaySource,
+    SyntheticSource.name: SyntheticSource
+}
+
+
+def store_root(name=None, root="data"):
+    """PriceStore root for a source: `root` for live prices, `root/<name>` otherwise."""
+    name = name or config.DATA_SOURCE
+    return root if name == LiveSource.name else os.path.join(root, name)
+
+
+def get_source(name=None, **options):
+    name = name or config.DATA_SOURCE
+    try:
+        source_class = SOURCES[name]
+    except KeyError:
+        raise ValueError(f"Unknown data source '{name}' "
+                         f"(choose from {', '.join(SOURCES)})")
+    return source_class(**options)
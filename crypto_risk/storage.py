@@ -0,0 +1,289 @@
+import os
+import stat
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:   # Windows: only threads of one process are serialized
+    fcntl = None
+
+# Column types shared by every backend
+TIMESTAMP_DTYPE = np.dtype("<i8")   # epoch milliseconds
+PRICE_DTYPE = np.dtype("<f8")
+
+LOCK_FILE = ".lock"
+
+
+# -------------------------------------------------
+# ONE WRITER PER DATA ROOT
+# -------------------------------------------------
+
+class RootLock:
+    """Exclusive lock on a data root across threads and processes.
+
+    The scheduler, the CLI commands and the dashboard can all write the same
+    root. Column appends/replaces and every JSON read-modify-write (manifest,
+    coverage, model cache) run under this lock: an `fcntl.flock` on
+    `<root>/.lock` between processes, an RLock between threads. Re-entrant
+    within a thread, so `merge` can call `append`.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        try:
+            if self._depth == 0 and fcntl is not None:
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                except BaseException:
+                    os.close(fd)
+                    raise
+                self._fd = fd
+        except BaseException:
+            self._thread_lock.release()
+            raise
+
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+
+_root_locks = {}
+_root_locks_guard = threading.Lock()
+
+
+def root_lock(root):
+    """The shared RootLock of `root` (one per directory in this process)."""
+    os.makedirs(root, exist_ok=True)
+    path = os.path.abspath(os.path.join(root, LOCK_FILE))
+    with _root_locks_guard:
+        return _root_locks.setdefault(path, RootLock(path))
+
+
+# -------------------------------------------------
+# CSV BACKEND (text, kept for export / inspection)
+# -------------------------------------------------
+
+class CsvBackend:
+    """One `<coin>_prices.csv` per coin with timestamp and price columns."""
+
+    name = "csv"
+
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, coin_id):
+        return os.path.join(self.root, f"{coin_id}_prices.csv")
+
+    def exists(self, coin_id):
+        return os.path.exists(self.path(coin_id))
+
+    def read(self, coin_id):
+        df = pd.read_csv(self.path(coin_id),
+                         dtype={"timestamp": TIMESTAMP_DTYPE, "price": PRICE_DTYPE})
+        return df["timestamp"].to_numpy(), df["price"].to_numpy()
+
+    def append(self, coin_id, timestamps, prices):
+        path = self.path(coin_id)
+        df = pd.DataFrame({"timestamp": timestamps, "price": prices})
+        df.to_csv(path, mode="a", header=not os.path.exists(path), index=False)
+
+    def replace(self, coin_id, timestamps, prices):
+        tmp_path = self.path(coin_id) + ".tmp"
+        pd.DataFrame({"timestamp": timestamps, "price": prices}).to_csv(tmp_path, index=False)
+        os.replace(tmp_path, self.path(coin_id))
+
+
+# -------------------------------------------------
+# MEMORY-MAPPED NUMPY BACKEND (typed binary columns)
+# -------------------------------------------------
+
+class NumpyBackend:
+    """Two raw little-endian column files per coin, read via np.memmap.
+
+    `<coin>.ts.i8` holds int64 epoch-ms timestamps and `<coin>.px.f8` holds
+    float64 prices. Appending is a plain byte append and reading maps the
+    files straight into arrays without parsing or copying.
+
+    A `replace` writes both new columns to `.tmp` files first and only then
+    drops a `<coin>.replace` marker and renames them into place. An
+    interrupted replace is finished (marker present) or discarded (no
+    marker) before the next write, so the two columns always belong to the
+    same version.
+    """
+
+    name = "npy"
+
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, coin_id):
+        return os.path.join(self.root, f"{coin_id}.ts.i8")
+
+    def _price_path(self, coin_id):
+        return os.path.join(self.root, f"{coin_id}.px.f8")
+
+    def _marker_path(self, coin_id):
+        return os.path.join(self.root, f"{coin_id}.replace")
+
+    def exists(self, coin_id):
+        return os.path.exists(self.path(coin_id))
+
+    @staticmethod
+    def _map(path, dtype):
+        if os.path.getsize(path) == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r")
+
+    def read(self, coin_id):
+        # A replace being published may rename a .tmp column away mid-read
+        for attempt in range(3):
+            try:
+                return self._read_columns(coin_id)
+            except FileNotFoundError:
+                if attempt == 2:
+                    raise
+
+    def _read_columns(self, coin_id):
+        pending = os.path.exists(self._marker_path(coin_id))
+
+        columns = []
+        for path, dtype in ((self.path(coin_id), TIMESTAMP_DTYPE),
+                            (self._price_path(coin_id), PRICE_DTYPE)):
+            # While a replace is published, a column not yet renamed is still in .tmp
+            if pending and os.path.exists(path + ".tmp"):
+                path += ".tmp"
+            columns.append(self._map(path, dtype))
+        timestamps, prices = columns
+
+        # A crash between the two writes can leave one column longer
+        n = min(len(timestamps), len(prices))
+        return timestamps[:n], prices[:n]
+
+    def _finish_replace(self, coin_id):
+        """Complete a replace that got as far as its marker; drop any other leftovers."""
+        marker = self._marker_path(coin_id)
+        pending = os.path.exists(marker)
+
+        for path in (self._price_path(coin_id), self.path(coin_id)):
+            if os.path.exists(path + ".tmp"):
+                if pending:
+                    os.replace(path + ".tmp", path)
+                else:
+                    os.remove(path + ".tmp")
+
+        if pending:
+            os.remove(marker)
+
+    def _repair(self, coin_id):
+        """Cut the longer column back to the shorter one before writing.
+
+        `read` already hides an unequal tail, but appending to both files as
+        they are would pair every later timestamp with the wrong price.
+        """
+        ts_path, px_path = self.path(coin_id), self._price_path(coin_id)
+        if not (os.path.exists(ts_path) and os.path.exists(px_path)):
+            for path in (ts_path, px_path):
+                if os.path.exists(path):
+                    os.truncate(path, 0)
+            return
+
+        n = min(os.path.getsize(ts_path) // TIMESTAMP_DTYPE.itemsize,
+                os.path.getsize(px_path) // PRICE_DTYPE.itemsize)
+        for path, dtype in ((ts_path, TIMESTAMP_DTYPE), (px_path, PRICE_DTYPE)):
+            if os.path.getsize(path) != n * dtype.itemsize:
+                os.truncate(path, n * dtype.itemsize)
+
+    def append(self, coin_id, timestamps, prices):
+        self._finish_replace(coin_id)
+        self._repair(coin_id)
+        with open(self._price_path(coin_id), "ab") as f:
+            f.write(np.ascontiguousarray(prices, dtype=PRICE_DTYPE).tobytes())
+        with open(self.path(coin_id), "ab") as f:
+            f.write(np.ascontiguousarray(timestamps, dtype=TIMESTAMP_DTYPE).tobytes())
+
+    def replace(self, coin_id, timestamps, prices):
+        # Rewrite both columns (e.g. after a backfill) as one version
+        self._finish_replace(coin_id)
+
+        columns = ((self._price_path(coin_id), prices, PRICE_DTYPE),
+                   (self.path(coin_id), timestamps, TIMESTAMP_DTYPE))
+        for path, values, dtype in columns:
+            with open(path + ".tmp", "wb") as f:
+                f.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+        # Both new columns are complete: from here on the replace is committed
+        with open(self._marker_path(coin_id), "w"):
+            pass
+
+        for path, _, _ in columns:
+            os.replace(path + ".tmp", path)
+        os.remove(self._marker_path(coin_id))
+
+
+BACKENDS = {
+    CsvBackend.name: CsvBackend,
+    NumpyBackend.name: NumpyBackend
+}
+
+
+def get_backend(name, root):
+    try:
+        return BACKENDS[name](root)
+    except KeyError:
+        raise ValueError(f"Unknown storage backend '{name}' "
+                         f"(choose from {', '.join(BACKENDS)})")
+
+
+# -------------------------------------------------
+# ATOMIC PUBLISH
+# -------------------------------------------------
+
+def _publish_mode(path):
+    """Mode for a file replacing `path`: its current one, else what open() would give."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def write_csv_atomic(df, path):
+    """Write `df` to a temp file beside `path`, then rename it into place.
+
+    Readers see either the previous file or the complete new one, never a
+    half-written CSV. The file keeps its permissions (mkstemp alone would
+    leave it 0600 after the first publish).
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".csv", dir=directory)
+
+    try:
+        os.chmod(tmp_path, _publish_mode(path))
+        with os.fdopen(fd, "w", newline="") as f:
+            df.to_csv(f, index=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,181 @@
+import math
+from collections import deque
+
+
+# -------------------------------------------------
+# RUNNING MEAN / VARIANCE (O(1) PER VALUE)
+# -------------------------------------------------
+
+class RunningMoments:
+    """Mean and M2 (sum of squared deviations) of a stream of values.
+
+    Without `size` every value counts (Welford) and nothing is stored. With
+    `size` only the last `size` values count: a sliding Welford update over
+    a ring buffer, recomputed from the buffer once per full turn of it so
+    rounding errors cannot pile up (O(1) amortized).
+    """
+
+    __slots__ = ("size", "count", "mean", "m2", "_buffer", "_slides")
+
+    def __init__(self, size=None):
+        self.size = size
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self._buffer = deque(maxlen=size) if size else None
+        self._slides = 0
+
+    def add(self, x):
+        if self._buffer is None or self.count < self.size:
+            if self._buffer is not None:
+                self._buffer.append(x)
+            self.count += 1
+            delta = x - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (x - self.mean)
+            return
+
+        old = self._buffer[0]
+        self._buffer.append(x)
+        old_mean = self.mean
+        self.mean += (x - old) / self.size
+        self.m2 = max(self.m2 + (x - old) * (x - self.mean + old - old_mean), 0.0)
+
+        self._slides += 1
+        if self._slides >= self.size:
+            self._slides = 0
+            self.mean = math.fsum(self._buffer) / self.size
+            self.m2 = math.fsum((v - self.mean) ** 2 for v in self._buffer)
+
+    @property
+    def full(self):
+        return self.size is not None and self.count == self.size
+
+    @property
+    def std(self):
+        """Sample standard deviation; None below two values."""
+        if self.count < 2:
+            return None
+        return math.sqrt(self.m2 / (self.count - 1))
+
+
+# -------------------------------------------------
+# ONLINE VOLATILITY FOR ONE COIN (O(1) PER TICK)
+# -------------------------------------------------
+
+class StreamingVolatility:
+    """Incremental version of the risk_engine statistics for one coin.
+
+    Each `update(price)` turns the new price into a return and folds it into
+    RunningMoments for:
+
+    * the returns (overall volatility),
+    * the last `window` returns (rolling volatility),
+    * every full-window rolling volatility (the "average rolling
+      volatility" used by the Risk Score).
+
+    By default the first and last cover the whole stream, like the batch
+    run over one history. With `overall_window` they only cover the last
+    `overall_window` returns (and the rolling volatilities inside them), so
+    a long-running stream scores current conditions rather than all it has
+    ever seen.
+
+    All values are in percent, matching `risk_engine.compute_risk`.
+    """
+
+    __slots__ = ("window", "weights", "overall_window", "last_price",
+                 "_overall", "_window", "_rolling")
+
+    def __init__(self, window=7, weights=(0.6, 0.4), overall_window=None):
+        self.window = window
+        self.weights = weights
+        self.overall_window = overall_window
+        self.last_price = None
+
+        self._overall = RunningMoments(overall_window)
+        self._window = RunningMoments(window)
+        self._rolling = RunningMoments(None if overall_window is None
+                                       else max(overall_window - window + 1, 1))
+
+    def update(self, price):
+        """Feed one price; returns the current snapshot (see `snapshot`)."""
+        if self.last_price is not None:
+            self._add_return(price / self.last_price - 1)
+
+        self.last_price = price
+        return self.snapshot()
+
+    def _add_return(self, r):
+        self._overall.add(r)
+        self._window.add(r)
+
+        window_volatility = self.window_volatility
+        if window_volatility is not None:
+            self._rolling.add(window_volatility)
+
+    # ---------------- CURRENT VALUES ----------------
+
+    @property
+    def overall_volatility(self):
+        std = self._overall.std
+        return None if std is None else std * 100
+
+    @property
+    def window_volatility(self):
+        if not self._window.full or self.window < 2:
+            return None
+        return self._window.std * 100
+
+    @property
+    def avg_rolling_volatility(self):
+        return self._rolling.mean if self._rolling.count else None
+
+    @property
+    def risk_score(self):
+        overall = self.overall_volatility
+        rolling = self.avg_rolling_volatility
+        if overall is None or rolling is None:
+            return None
+        return (overall * self.weights[0]) + (rolling * self.weights[1])
+
+    def snapshot(self):
+        return {
+            "Overall Volatility (%)": self.overall_volatility,
+            "Window Volatility (%)": self.window_volatility,
+            "Avg Rolling Volatility (%)": self.avg_rolling_volatility,
+            "Risk Score": self.risk_score
+        }
+
+
+# -------------------------------------------------
+# ONE ESTIMATOR PER COIN
+# -------------------------------------------------
+
+class StreamingRiskMonitor:
+    """Keeps a StreamingVolatility per coin and routes ticks to it."""
+
+    def __init__(self, window=7, weights=(0.6, 0.4), overall_window=None):
+        self.window = window
+        self.weights = weights
+        self.overall_window = overall_window
+        self.estimators = {}
+
+    def estimator(self, coin):
+        estimator = self.estimators.get(coin)
+        if estimator is None:
+            estimator = self.estimators[coin] = StreamingVolatility(
+                self.window, self.weights, self.overall_window)
+        return estimator
+
+    def update(self, coin, price):
+        return self.estimator(coin).update(price)
+
+    def seed(self, coin, prices):
+        """Replay a price history (e.g. from PriceStore) into a coin's estimator."""
+        snapshot = None
+        for price in prices:
+            snapshot = self.update(coin, float(price))
+        return snapshot
+
+    def snapshot(self):
+        return {coin: estimator.snapshot() for coin, estimator in self.estimators.items()}
@@ -0,0 +1,140 @@
+"""Local stand-in for the CoinGecko `market_chart` and `market_chart/range` endpoints.
+
+Serves deterministic hourly prices so the fetch -> compute -> publish
+pipeline can run with no network access:
+
+    python -m crypto_risk.stub_api --port 8000
+    COINGECKO_API_URL=http://127.0.0.1:8000 python risk_analysis.py
+
+It also accepts alert webhooks (POST /alerts) and prints each event.
+`--fail-first N` answers the first N requests for each URL path with
+`--fail-status` (and `--retry-after`, if given), to exercise the client's
+retries.
+"""
+import argparse
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+HOUR_MS = 60 * 60 * 1000
+
+
+def synthetic_prices(coin_id, start_ms, end_ms):
+    """Hourly [timestamp, price] pairs that are stable across calls."""
+    seed = zlib.crc32(coin_id.encode("utf-8"))
+    hours = np.arange(start_ms // HOUR_MS + 1, end_ms // HOUR_MS + 1, dtype="int64")
+
+    base = 1 + seed % 50000
+    amplitude = 0.02 + (seed % 7) / 100
+    noise = ((hours * 2654435761 + seed) % 2 ** 32) / 2 ** 32 - 0.5
+
+    log_price = (amplitude * np.sin(hours / 24 * (1 + seed % 5))
+                 + amplitude / 2 * np.sin(hours / 170)
+                 + 0.01 * noise)
+
+    prices = base * np.exp(log_price)
+    return [[int(h * HOUR_MS), float(p)] for h, p in zip(hours, prices)]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _should_fail(self, path):
+        server = self.server
+        with server.lock:
+            server.attempts[path] = server.attempts.get(path, 0) + 1
+            return server.attempts[path] <= server.fail_first
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = url.path.strip("/").split("/")
+
+        if self._should_fail(url.path):
+            body = b"{}"
+            self.send_response(self.server.fail_status)
+            if self.server.retry_after is not None:
+                self.send_header("Retry-After", str(self.server.retry_after))
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        if parts[:1] != ["coins"] or parts[2:] not in (["market_chart"], ["market_chart", "range"]):
+            self._send_json(404, {"error": "not found"})
+            return
+
+        query = parse_qs(url.query)
+        now_ms = int(time.time() * 1000)
+
+        if parts[-1] == "range":
+            # from / to are epoch seconds; nothing after "now" exists yet
+            start_ms = int(float(query["from"][0]) * 1000) - 1
+            end_ms = min(int(float(query["to"][0]) * 1000), now_ms)
+            prices = synthetic_prices(parts[1], start_ms, end_ms)
+        else:
+            days = float(query.get("days", ["30"])[0])
+            prices = synthetic_prices(parts[1], now_ms - int(days * 24 * HOUR_MS), now_ms)
+
+        self._send_json(200, {"prices": prices})
+
+    def do_POST(self):
+        if urlparse(self.path).path.strip("/") != "alerts":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        event = json.loads(self.rfile.read(length) or b"{}")
+        print(f"webhook: {event.get('coin')} {event.get('from')} -> {event.get('to')}")
+        self._send_json(200, {"received": True})
+
+
+def serve(host="127.0.0.1", port=8000, background=False, fail_first=0, fail_status=429,
+          retry_after=None):
+    """Run the stub; with `background`, return the server (port 0 = any free port)."""
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.fail_first = fail_first
+    server.fail_status = fail_status
+    server.retry_after = retry_after
+    server.attempts = {}   # URL path -> requests seen
+    server.lock = threading.Lock()
+
+    if background:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    print(f"Stub CoinGecko API on http://{host}:{port}")
+    server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local CoinGecko stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--fail-first", type=int, default=0,
+                        help="fail the first N requests for each URL path")
+    parser.add_argument("--fail-status", type=int, default=429)
+    parser.add_argument("--retry-after", type=float, default=None,
+                        help="Retry-After seconds sent with each failure")
+    args = parser.parse_args(argv)
+
+    serve(args.host, args.port, fail_first=args.fail_first,
+          fail_status=args.fail_status, retry_after=args.retry_after)
+
+
+if __name__ == "__main__":
+    main()
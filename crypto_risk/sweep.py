@@ -0,0 +1,199 @@
+"""Risk Score sensitivity sweep over windows, weights and quantile cut-offs.
+
+    python -m crypto_risk sweep --windows 3:90:1 --weights 0:1:0.1 \\
+        --quantiles 0.3/0.7 0.2/0.8 --output data/sweep_cube.npz
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from crypto_risk import config
+from crypto_risk.price_store import PriceStore
+from crypto_risk.risk_engine import RISK_LEVELS, price_matrix, returns_matrix
+
+CUBE_FILE = "data/sweep_cube.npz"
+
+
+# -------------------------------------------------
+# WORKERS (READ RETURNS / WRITE RESULTS VIA SHARED MEMORY)
+# -------------------------------------------------
+
+_shared = {}
+
+
+def _attach(returns_name, shape, rolling_name, n_windows):
+    returns_shm = shared_memory.SharedMemory(name=returns_name)
+    rolling_shm = shared_memory.SharedMemory(name=rolling_name)
+
+    _shared["handles"] = (returns_shm, rolling_shm)
+    _shared["returns"] = np.ndarray(shape, dtype="float64", buffer=returns_shm.buf)
+    _shared["rolling"] = np.ndarray((n_windows, shape[1]), dtype="float64",
+                                    buffer=rolling_shm.buf)
+
+
+def _rolling_job(window_index, window):
+    # Wraps the shared buffer without copying; same reduction as risk_engine
+    returns = pd.DataFrame(_shared["returns"], copy=False)
+    avg_rolling = (returns.rolling(window=window).std() * 100).mean()
+    _shared["rolling"][window_index] = avg_rolling.to_numpy()
+    return window_index
+
+
+# -------------------------------------------------
+# SWEEP
+# -------------------------------------------------
+
+def run_sweep(prices, windows, weights, quantiles, max_workers=None):
+    """Scores and Risk Levels for every (window, weight, quantile pair).
+
+    Returns a dict of arrays ready for `np.savez`:
+    scores[window, weight, coin] and levels[window, weight, quantile, coin]
+    (indices into RISK_LEVELS, -1 where the score is undefined).
+    """
+    windows = np.asarray(windows, dtype="int64")
+    weights = np.asarray(weights, dtype="float64")
+    quantiles = np.asarray(quantiles, dtype="float64").reshape(-1, 2)
+
+    returns = np.ascontiguousarray(returns_matrix(prices).to_numpy(dtype="float64"))
+    n_coins = returns.shape[1]
+
+    overall = np.nanstd(returns, axis=0, ddof=1) * 100
+
+    returns_shm = shared_memory.SharedMemory(create=True, size=max(returns.nbytes, 1))
+    rolling_shm = shared_memory.SharedMemory(create=True,
+                                             size=max(len(windows) * n_coins * 8, 1))
+    try:
+        np.ndarray(returns.shape, dtype="float64", buffer=returns_shm.buf)[:] = returns
+
+        init_args = (returns_shm.name, returns.shape, rolling_shm.name, len(windows))
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_attach,
+                                 initargs=init_args) as pool:
+            list(pool.map(_rolling_job, range(len(windows)), windows))
+
+        avg_rolling = np.ndarray((len(windows), n_coins), dtype="float64",
+                                 buffer=rolling_shm.buf).copy()
+    finally:
+        returns_shm.close()
+        returns_shm.unlink()
+        rolling_shm.close()
+        rolling_shm.unlink()
+
+    # scores[window, weight, coin]; rolling weight is 1 - overall weight
+    w = weights[None, :, None]
+    scores = np.round(overall[None, None, :] * w + avg_rolling[:, None, :] * (1 - w), 2)
+
+    # Percentile thresholds per (window, weight, quantile pair)
+    low = np.nanquantile(scores, quantiles[:, 0], axis=-1)    # (Q, W, K)
+    high = np.nanquantile(scores, quantiles[:, 1], axis=-1)
+    low = np.moveaxis(low, 0, 2)[..., None]                   # (W, K, Q, 1)
+    high = np.moveaxis(high, 0, 2)[..., None]
+
+    s = scores[:, :, None, :]
+    levels = np.where(s <= low, 0, np.where(s <= high, 1, 2)).astype("int8")
+    levels[np.broadcast_to(np.isnan(s), levels.shape)] = -1
+
+    return {
+        "coins": np.asarray(prices.columns, dtype=str),
+        "windows": windows,
+        "weights": weights,
+        "quantiles": quantiles,
+        "overall_volatility": overall,
+        "avg_rolling_volatility": avg_rolling,
+        "scores": scores,
+        "levels": levels
+    }
+
+
+def save_cube(cube, path=CUBE_FILE):
+    tmp_path = path + ".tmp.npz"
+    np.savez_compressed(tmp_path, **cube)
+    os.replace(tmp_path, path)
+
+
+# -------------------------------------------------
+# READING THE CUBE (NO RECOMPUTATION)
+# -------------------------------------------------
+
+class SweepCube:
+    """Loaded results cube; `table()` slices one scenario as a risk table."""
+
+    def __init__(self, path=CUBE_FILE):
+        with np.load(path) as data:
+            self.data = {key: data[key] for key in data.files}
+
+        self.coins = self.data["coins"].tolist()
+        self.windows = self.data["windows"].tolist()
+        self.weights = self.data["weights"].tolist()
+        self.quantiles = [tuple(q) for q in self.data["quantiles"].tolist()]
+
+    def table(self, window, weight, quantiles):
+        i = self.windows.index(window)
+        j = int(np.argmin(np.abs(self.data["weights"] - weight)))
+        q = self.quantiles.index(tuple(quantiles))
+
+        levels = np.asarray(RISK_LEVELS + [None], dtype=object)[self.data["levels"][i, j, q]]
+
+        return pd.DataFrame({
+            "Coin": self.coins,
+            "Overall Volatility (%)": self.data["overall_volatility"].round(2),
+            "Avg Rolling Volatility (%)": self.data["avg_rolling_volatility"][i].round(2),
+            "Risk Score": self.data["scores"][i, j],
+            "Risk Level": levels
+        })
+
+    def level_changes(self, baseline, scenario):
+        """Coins whose Risk Level differs between two (window, weight, quantiles)."""
+        before = self.table(*baseline)
+        after = self.table(*scenario)
+
+        changed = before["Risk Level"] != after["Risk Level"]
+        return pd.DataFrame({
+            "Coin": before["Coin"][changed],
+            "Baseline": before["Risk Level"][changed],
+            "Scenario": after["Risk Level"][changed]
+        }).reset_index(drop=True)
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+
+def _float_range(spec):
+    start, stop, step = (float(x) for x in spec.split(":"))
+    return np.round(np.arange(start, stop + step / 2, step), 6)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Risk Score sensitivity sweep")
+    parser.add_argument("--windows", default="3:90:1", help="start:stop:step (inclusive)")
+    parser.add_argument("--weights", default="0:1:0.1",
+                        help="overall-volatility weight start:stop:step")
+    parser.add_argument("--quantiles", nargs="+", default=["0.3/0.7", "0.2/0.8", "0.1/0.9"],
+                        help="low/high percentile cut-offs")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default=CUBE_FILE)
+    args = parser.parse_args(argv)
+
+    windows = _float_range(args.windows).astype("int64")
+    weights = _float_range(args.weights)
+    quantiles = [tuple(float(x) for x in pair.split("/")) for pair in args.quantiles]
+
+    store = PriceStore()
+    frames = {name: store.load(coin_id, days=args.days) for name, coin_id in config.COINS.items()}
+    prices = price_matrix(frames)
+
+    if prices.empty:
+        print("No stored prices; run `python -m crypto_risk fetch` first.")
+        return 1
+
+    cube = run_sweep(prices, windows, weights, quantiles, max_workers=args.workers)
+    save_cube(cube, args.output)
+
+    print(f"Saved {len(windows)} windows x {len(weights)} weights x "
+          f"{len(quantiles)} cut-offs x {prices.shape[1]} coins to {args.output}")
+    return 0
@@ -0,0 +1,240 @@
+"""Value-at-Risk and Expected Shortfall (CVaR) per coin and for portfolios.
+
+Losses are reported as positive percentages of value over `horizon` return
+periods (one period = one step of the return series risk_analysis uses).
+
+Methods:
+    historical  empirical quantile of the observed returns
+    parametric  normal distribution fitted to the returns
+    bootstrap   Monte Carlo paths built by resampling each coin's returns
+
+    python -m crypto_risk var --method bootstrap --paths 1000000 --horizon 24
+    python -m crypto_risk var --portfolio Bitcoin=0.6 Ethereum=0.4
+"""
+import argparse
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+METHODS = ("historical", "parametric", "bootstrap")
+
+# Elements (paths x coins) simulated per chunk; bounds per-chunk memory
+CHUNK_ELEMENTS = 4_000_000
+
+
+# -------------------------------------------------
+# HISTORICAL / PARAMETRIC (VECTORIZED OVER COINS)
+# -------------------------------------------------
+
+def historical_var(returns, confidence=0.95):
+    """VaR and CVaR (both in %) for every column of a returns matrix."""
+    losses = -np.asarray(returns, dtype="float64")
+
+    var = np.nanquantile(losses, confidence, axis=0)
+    tail = np.where(losses >= var, losses, np.nan)
+    cvar = np.nanmean(tail, axis=0)
+
+    return var * 100, cvar * 100
+
+
+def parametric_var(returns, confidence=0.95):
+    """Normal (variance-covariance) VaR and CVaR in %."""
+    returns = np.asarray(returns, dtype="float64")
+    mu = np.nanmean(returns, axis=0)
+    sigma = np.nanstd(returns, axis=0, ddof=1)
+
+    z = NormalDist().inv_cdf(1 - confidence)
+    tail_density = NormalDist().pdf(z) / (1 - confidence)
+
+    var = -(mu + z * sigma)
+    cvar = -mu + sigma * tail_density
+
+    return var * 100, cvar * 100
+
+
+# -------------------------------------------------
+# BOOTSTRAP MONTE CARLO (CHUNKED, MULTI-CORE, SEEDED)
+# -------------------------------------------------
+
+_worker = {}
+
+
+def _init_worker(values, offsets, counts, horizon, tail_size):
+    _worker["values"] = values
+    _worker["offsets"] = offsets
+    _worker["counts"] = counts
+    _worker["horizon"] = horizon
+    _worker["tail_size"] = tail_size
+
+
+def _top_losses(losses, k):
+    # Largest k losses per column, unordered
+    if len(losses) <= k:
+        return losses
+    return np.partition(losses, len(losses) - k, axis=0)[-k:]
+
+
+def _simulate_chunk(seed_sequence, n_paths):
+    values = _worker["values"]
+    offsets = _worker["offsets"]
+    counts = _worker["counts"]
+
+    rng = np.random.default_rng(seed_sequence)
+
+    # Each coin draws from its own valid returns (packed one after another)
+    growth = np.ones((n_paths, len(counts)))
+    for _ in range(_worker["horizon"]):
+        growth *= 1 + values[offsets + rng.integers(0, counts, size=(n_paths, len(counts)))]
+
+    return _top_losses(1 - growth, _worker["tail_size"])
+
+
+def bootstrap_var(returns, confidence=0.95, n_paths=1_000_000, horizon=1,
+                  seed=0, chunk_size=None, max_workers=None):
+    """Monte Carlo VaR/CVaR (in %) by resampling every column of `returns`.
+
+    Each coin is resampled over its own non-NaN returns, so a young coin
+    does not shorten the history of the others; coins without any valid
+    return get NaN. Paths are simulated in fixed-size chunks, each with its own child of
+    `SeedSequence(seed)`, so results are identical for any worker count.
+    Only the worst `(1 - confidence) * n_paths` losses per column are kept
+    between chunks, which bounds memory regardless of `n_paths`.
+    """
+    returns = np.asarray(returns, dtype="float64")
+    valid = ~np.isnan(returns)
+    counts = valid.sum(axis=0)
+    n_coins = returns.shape[1]
+
+    var = np.full(n_coins, np.nan)
+    cvar = np.full(n_coins, np.nan)
+    simulated = counts > 0
+    if not simulated.any():
+        return var, cvar
+
+    # Valid returns of the simulated coins, column after column
+    values = returns.T[valid.T & simulated[:, None]]
+    counts = counts[simulated]
+    offsets = np.r_[0, np.cumsum(counts)[:-1]]
+
+    tail_size = max(1, math.ceil((1 - confidence) * n_paths))
+    chunk_size = chunk_size or max(1000, CHUNK_ELEMENTS // len(counts))
+
+    sizes = [chunk_size] * (n_paths // chunk_size)
+    if n_paths % chunk_size:
+        sizes.append(n_paths % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    init_args = (values, offsets, counts, horizon, tail_size)
+    if max_workers == 1 or len(sizes) == 1:
+        _init_worker(*init_args)
+        tails = [_simulate_chunk(s, n) for s, n in zip(seeds, sizes)]
+    else:
+        max_workers = max_workers or min(len(sizes), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=init_args) as pool:
+            tails = list(pool.map(_simulate_chunk, seeds, sizes))
+
+    worst = _top_losses(np.concatenate(tails), tail_size)
+
+    var[simulated] = worst.min(axis=0)
+    cvar[simulated] = worst.mean(axis=0)
+
+    return var * 100, cvar * 100
+
+
+# -------------------------------------------------
+# TABLES FOR COINS AND PORTFOLIOS
+# -------------------------------------------------
+
+def _compute(returns, method, confidence, **kwargs):
+    if method == "historical":
+        return historical_var(returns, confidence)
+    if method == "parametric":
+        return parametric_var(returns, confidence)
+    if method == "bootstrap":
+        return bootstrap_var(returns, confidence, **kwargs)
+    raise ValueError(f"Unknown VaR method '{method}' (choose from {', '.join(METHODS)})")
+
+
+def column_names(confidence=0.95):
+    level = f"{confidence * 100:g}%"
+    return f"VaR {level} (%)", f"CVaR {level} (%)"
+
+
+def var_table(returns, method="historical", confidence=0.95, **kwargs):
+    """Per-coin VaR/CVaR for a time x coin returns DataFrame."""
+    var, cvar = _compute(returns.to_numpy(), method, confidence, **kwargs)
+    var_col, cvar_col = column_names(confidence)
+
+    return pd.DataFrame({
+        "Coin": returns.columns,
+        var_col: np.round(var, 2),
+        cvar_col: np.round(cvar, 2)
+    })
+
+
+def portfolio_var(returns, weights, method="historical", confidence=0.95, **kwargs):
+    """VaR/CVaR (in %) of a weighted portfolio of the columns of `returns`.
+
+    `weights` maps coin -> weight and is normalised to sum to 1. The
+    portfolio is rebalanced every period.
+    """
+    weights = pd.Series(weights, dtype="float64").reindex(returns.columns).fillna(0.0)
+    weights = weights / weights.sum()
+
+    # Only periods where every coin has a return, so correlation is preserved
+    # (the bootstrap then resamples these complete rows)
+    portfolio = (returns.dropna().to_numpy() @ weights.to_numpy())[:, None]
+
+    var, cvar = _compute(portfolio, method, confidence, **kwargs)
+    return float(var[0]), float(cvar[0])
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+
+def main(argv=None):
+    # Imported here so the maths above has no dependency on the store
+    from crypto_risk import config
+    from crypto_risk.price_store import PriceStore
+    from crypto_risk.risk_engine import price_matrix, returns_matrix
+
+    parser = argparse.ArgumentParser(description="VaR / CVaR per coin or portfolio")
+    parser.add_argument("--method", choices=METHODS, default="historical")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--paths", type=int, default=1_000_000)
+    parser.add_argument("--horizon", type=int, default=1, help="return periods per path")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--portfolio", nargs="+", metavar="COIN=WEIGHT",
+                        help="report one weighted portfolio instead of every coin")
+    args = parser.parse_args(argv)
+
+    store = PriceStore()
+    frames = {name: store.load(coin_id, days=args.days) for name, coin_id in config.COINS.items()}
+    returns = returns_matrix(price_matrix(frames))
+
+    if returns.empty:
+        print("No stored prices; run `python -m crypto_risk fetch` first.")
+        return 1
+
+    kwargs = {}
+    if args.method == "bootstrap":
+        kwargs = dict(n_paths=args.paths, horizon=args.horizon, seed=args.seed,
+                      max_workers=args.workers)
+
+    if args.portfolio:
+        weights = {coin: float(w) for coin, w in (item.split("=") for item in args.portfolio)}
+        var, cvar = portfolio_var(returns, weights, args.method, args.confidence, **kwargs)
+        var_col, cvar_col = column_names(args.confidence)
+        print(f"Portfolio {weights}: {var_col} {var:.2f}, {cvar_col} {cvar:.2f}")
+    else:
+        print(var_table(returns, args.method, args.confidence, **kwargs))
+
+    return 0
@@ -1,7 +1,6 @@
 import streamlit as st
-import pandas as pd
-import os
-from datetime import datetime
+
+from crypto_risk.login_store import LoginStore
 
 # ---------------- PAGE CONFIG ----------------
 st.set_page_config(page_title="Login | Crypto Analyzer", layout="centered")
@@ -9,12 +8,13 @@ st.set_page_config(page_title="Login | Crypto Analyzer", layout="centered")
 st.title("🔐 Login")
 st.subheader("Enter details to continue")
 
-# ---------------- USER DATA FILE ----------------
-USER_FILE = "users.csv"
+# ---------------- USER DATA STORE ----------------
+USER_DB = "users.db"
 
-# Create file if not exists
-if not os.path.exists(USER_FILE):
-    pd.DataFrame(columns=["Username", "Email", "Login Time"]).to_csv(USER_FILE, index=False)
+# Append-only login log (imports the old users.csv on first run)
+@st.cache_resource
+def get_login_store():
+    return LoginStore(USER_DB, legacy_csv="users.csv")
 
 # ---------------- LOGIN FORM ----------------
 with st.form("login_form"):
@@ -28,9 +28,7 @@ if submit:
         st.error("Please enter both Username and Email")
     else:
         # Save user data
-        df = pd.read_csv(USER_FILE)
-        df.loc[len(df)] = [username, email, datetime.now().strftime("%Y-%m-%d %H:%M:%S")]
-        df.to_csv(USER_FILE, index=False)
+        get_login_store().record(username, email)
 
         # Store login session
         st.session_state["logged_in"] = True
@@ -1,48 +1,126 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
+import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 import os
-import requests
-
-# ---------------- LIVE DATA FETCH FUNCTION ----------------
-@st.cache_data(ttl=3600)
-def fetch_live_data(coin_name):
-    coin_map = {
-        "Bitcoin": "bitcoin",
-        "Ethereum": "ethereum",
-        "Solana": "solana",
-        "Cardano": "cardano",
-        "Dogecoin": "dogecoin"
-    }
-
-    coin_id = coin_map.get(coin_name)
-
-    if not coin_id:
-        return None
 
-    url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart"
-    params = {
-        "vs_currency": "usd",
-        "days": "30"
-    }
-
-    try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-    except requests.exceptions.RequestException:
+from crypto_risk import perf
+from crypto_risk.config import COINS, CURRENCIES, DATA_SOURCE, INTERACTIVE_RETRY
+from crypto_risk.fetcher import create_session
+from crypto_risk.price_store import MS_PER_DAY, PriceStore
+from crypto_risk.bars import bar_panel
+from crypto_risk.downsample import downsample
+from crypto_risk.risk_engine import returns_matrix
+from crypto_risk.scheduler import read_status
+from crypto_risk.sources import get_source
+
+# The planner, forecast, portfolio, snapshot and sweep modules (and what
+# they pull in) are imported inside the loaders that use them, so the page
+# starts rendering before they are needed
+
+# ---------------- SHARED HTTP SESSION & PRICE STORE ----------------
+@perf.cached(st.cache_resource)
+def get_session():
+    return create_session()
+
+@perf.cached(st.cache_resource)
+def get_store():
+    # CRYPTO_RISK_SOURCE feeds the store; offline sources get data/<source>/
+    return PriceStore(source=get_source(DATA_SOURCE))
+
+# ---------------- SHARED MARKET DATA PANEL ----------------
+# Once per TTL the loaders below plan against the store: nothing is fetched
+# while the scheduler keeps it fresh, and only the missing range otherwise
+# (everything, in one concurrent batch, on a fresh deploy)
+@perf.cached(st.cache_data(ttl=3600))
+def load_daily_panel(coin_names):
+    from crypto_risk.planner import QueryPlanner
+
+    coin_ids = {name: COINS[name] for name in coin_names if name in COINS}
+    store = get_store()
+    QueryPlanner(store).execute([(coin_id, 30, "usd") for coin_id in coin_ids.values()],
+                                session=get_session(), **INTERACTIVE_RETRY)
+
+    # Daily bars are materialized at ingest, so no groupby over raw ticks here
+    bars = {name: store.bars(coin_id, "1d", days=30) for name, coin_id in coin_ids.items()}
+
+    # Date x coin mean daily price, shared by every section below
+    return bar_panel(bars, column="mean")
+
+# ---------------- DOWNSAMPLED TREND SERIES ----------------
+# Roughly the pixel width of the wide-layout chart; every range is sent as
+# at most this many points per trace, so payloads stay constant-size
+TREND_POINTS = 1000
+
+@perf.cached(st.cache_data(ttl=3600))
+def load_trend(coin_name, days, currency="usd", points=TREND_POINTS, method="lttb"):
+    from crypto_risk.planner import QueryPlanner
+
+    coin_id = COINS.get(coin_name)
+    planner = QueryPlanner(get_store())
+    if coin_id:
+        # No-op when the store already covers the range (and FX series)
+        planner.execute([(coin_id, days, currency)], session=get_session(), **INTERACTIVE_RETRY)
+
+    # Stored points in `currency`: hourly, preceded by the daily backfill on long ranges
+    df = planner.points(coin_id, days, currency) if coin_id else None
+    if df is None or len(df) < 2:
+        return None, None
+
+    timestamps, prices = df["timestamp"].to_numpy(), df["price"].to_numpy()
+    keep = downsample(timestamps, prices, points, method)
+    price_df = pd.DataFrame({
+        "Date": pd.to_datetime(np.asarray(timestamps)[keep], unit="ms"),
+        "price": np.asarray(prices)[keep]
+    })
+
+    # Rolling 3-day volatility of daily returns, as before
+    daily = planner.bars(coin_id, "1d", days, currency)
+    volatility = (daily["mean"].pct_change().rolling(window=3).std() * 100).to_numpy()
+    valid = ~np.isnan(volatility)
+    vol_dates = daily["date"].to_numpy()[valid]
+    volatility = volatility[valid]
+
+    keep = downsample(vol_dates.astype("int64"), volatility, points, method)
+    vol_df = pd.DataFrame({"Date": vol_dates[keep], "rolling_volatility": volatility[keep]})
+
+    return price_df, vol_df
+
+def history_days(coin_name):
+    # Stored timestamps only (daily backfill included); no caching needed
+    from crypto_risk.planner import QueryPlanner
+
+    coin_id = COINS.get(coin_name)
+    if coin_id is None:
+        return 0
+    first = QueryPlanner(get_store()).first_timestamp(coin_id)
+    last = get_store().last_timestamp(coin_id)
+    if first is None or last is None:
+        return 0
+    return int(np.ceil((last - first) / MS_PER_DAY))
+
+# ---------------- VOLATILITY FORECAST BAND ----------------
+@perf.cached(st.cache_data(ttl=3600))
+def load_forecast_band(coin_name, days=7):
+    from crypto_risk.forecast import ModelCache, forecast_volatility, model_key, volatility_path
+
+    coin_id = COINS.get(coin_name)
+    store = get_store()
+
+    # Prices only; no per-coin timestamp/date frame is needed for the fit
+    arrays = store.arrays(coin_id, days=30) if coin_id else None
+    if arrays is None or len(arrays[1]) < 10:
         return None
 
+    # Fitted parameters are cached per coin / window / currency + data
+    # watermark in <store root>/models.json
+    cache = ModelCache(root=store.root)
+    returns = returns_matrix(pd.DataFrame({coin_name: np.asarray(arrays[1])}))
+    forecast_volatility(returns, {coin_name: store.last_timestamp(coin_id)}, cache=cache,
+                        days=30, currency="usd")
 
-    if "prices" not in data:
-        return None
-
-    df_live = pd.DataFrame(data["prices"], columns=["timestamp", "price"])
-    df_live["date"] = pd.to_datetime(df_live["timestamp"], unit="ms")
-
-    return df_live
+    return volatility_path(cache.entries[model_key(coin_name, 30, "usd")], days)
 
 # ---------------- LOGIN CHECK ----------------
 if "logged_in" not in st.session_state:
@@ -55,6 +133,10 @@ st.set_page_config(
     layout="wide"
 )
 
+# Per-rerun timings; a no-op unless CRYPTO_RISK_PERF=1 (see crypto_risk/perf.py)
+perf_run = perf.start_run("dashboard")
+perf.section("intro")
+
 # ---------------- TITLE ----------------
 import streamlit as st
 
@@ -136,92 +218,164 @@ with st.expander("Click to see system capabilities"):
 st.success("✅ System is ready for analysis. Please proceed to the dashboard section.")
 
 # ---------------- LOAD DATA ----------------
-df = pd.read_csv("final_risk_analysis.csv")
+perf.section("load snapshot")
+
+# Metrics, risk buckets and figures precomputed by the pipeline
+# (crypto_risk/snapshot.py); loaded once per file change for every session
+@perf.cached(st.cache_resource)
+def load_snapshot(csv_mtime, snapshot_mtime):
+    from crypto_risk.snapshot import Snapshot, build_snapshot, read_snapshot
+
+    # The mtimes are only cache keys, so a new pipeline run is picked up
+    data = read_snapshot() if snapshot_mtime >= csv_mtime else None
+
+    if data is None:
+        # No snapshot yet (or an older one): build it from the CSV, once
+        results = pd.read_csv("final_risk_analysis.csv")
+        data = build_snapshot(results, load_daily_panel(tuple(results["Coin"])))
+
+    return Snapshot(data)
+
+def current_snapshot():
+    from crypto_risk.snapshot import SNAPSHOT_FILE
+
+    return load_snapshot(
+        os.path.getmtime("final_risk_analysis.csv"),
+        os.path.getmtime(SNAPSHOT_FILE) if os.path.exists(SNAPSHOT_FILE) else 0
+    )
+
+snapshot = current_snapshot()
+df = snapshot.table
+
+if snapshot.watermark:
+    st.caption(
+        f"📦 Results snapshot built {snapshot.created} from prices up to "
+        f"{pd.to_datetime(snapshot.watermark, unit='ms'):%Y-%m-%d %H:%M} UTC"
+    )
+
+# Freshness of the background refresh (see crypto_risk/scheduler.py)
+refresh_status = read_status()
+if refresh_status and refresh_status["staleness_seconds"] is not None:
+    st.caption(
+        f"🕒 Data refreshed {refresh_status['staleness_seconds'] / 60:.0f} min ago "
+        f"(last run took {refresh_status['last_run_duration_seconds']}s)"
+    )
+
+# Offline sources are for load testing; make that obvious on the page
+if DATA_SOURCE != "live":
+    st.caption(f"🧪 Prices served by the **{DATA_SOURCE}** data source (CRYPTO_RISK_SOURCE), "
+               f"stored in `{get_store().root}`")
 
 # ---------------- COIN SELECTOR ----------------
 st.subheader("🔍 Select Cryptocurrency")
-coin_list = df["Coin"].tolist()
+coin_list = snapshot.coins
 selected_coin = st.selectbox("Choose a coin to analyze:", coin_list)
 
-selected_df = df[df["Coin"] == selected_coin]
+selected = snapshot.metrics[selected_coin]
 
 # ---------------- SELECTED COIN DETAILS ----------------
 st.subheader(f"📊 Risk Analysis for {selected_coin}")
 
 col1, col2, col3, col4 = st.columns(4)
 
-col1.metric("Overall Volatility (%)", round(selected_df["Overall Volatility (%)"].values[0], 2))
-col2.metric("Avg Rolling Volatility (%)", round(selected_df["Avg Rolling Volatility (%)"].values[0], 2))
-col3.metric("Risk Score", round(selected_df["Risk Score"].values[0], 2))
-col4.metric("Risk Level", selected_df["Risk Level"].values[0])
+col1.metric("Overall Volatility (%)", round(selected["Overall Volatility (%)"], 2))
+col2.metric("Avg Rolling Volatility (%)", round(selected["Avg Rolling Volatility (%)"], 2))
+col3.metric("Risk Score", round(selected["Risk Score"], 2))
+col4.metric("Risk Level", selected["Risk Level"])
+
+# VaR / CVaR columns are present once risk_analysis has been rerun
+var_cols = [c for c in selected if c.startswith(("VaR ", "CVaR "))]
+if var_cols:
+    for col, name in zip(st.columns(len(var_cols)), var_cols):
+        col.metric(name, round(selected[name], 2))
 
 
 # =====================================================
 # ✅ FIXED: CLEAN DAILY PRICE & VOLATILITY TREND
 # =====================================================
 
+perf.section("trend chart")
 st.subheader("📈 Price & Volatility Trends")
 
+# Slider reaches as far back as the store has history (multi-year once backfilled);
+# `fetch --days N` / CRYPTO_RISK_HISTORY_DAYS sets how far that is
 days = st.slider(
     "Select number of days to view",
     min_value=7,
-    max_value=30,
+    max_value=max(30, history_days(selected_coin)),
     value=14
 )
 
-hist_df = fetch_live_data(selected_coin)
+currency = st.selectbox("Currency", CURRENCIES, format_func=str.upper)
 
-if hist_df is not None:
+show_forecast = st.checkbox("Show 7-day volatility forecast band (GARCH)", value=True)
 
-    # Convert to datetime
-    hist_df["date"] = pd.to_datetime(hist_df["date"])
+price_df, vol_df = load_trend(selected_coin, days, currency)
 
-    # 🔥 Aggregate to DAILY data
-    daily_df = (
-        hist_df
-        .groupby(hist_df["date"].dt.date)
-        .agg({"price": "mean"})
-        .reset_index()
-    )
+if price_df is not None:
 
-    daily_df.rename(columns={"date": "Date"}, inplace=True)
-    daily_df = daily_df.tail(days)
-
-    # Calculate rolling volatility
-    daily_df["daily_return"] = daily_df["price"].pct_change()
-    daily_df["rolling_volatility"] = (
-        daily_df["daily_return"].rolling(window=3).std() * 100
-    )
+    # Markers only while the range is short enough to see them
+    mode = "lines+markers" if len(price_df) <= 60 else "lines"
 
     # Plotly figure
     fig = go.Figure()
 
     fig.add_trace(
         go.Scatter(
-            x=daily_df["Date"],
-            y=daily_df["price"],
-            name="Price (USD)",
-            mode="lines+markers",
+            x=price_df["Date"],
+            y=price_df["price"],
+            name=f"Price ({currency.upper()})",
+            mode=mode,
             line=dict(width=3)
         )
     )
 
     fig.add_trace(
         go.Scatter(
-            x=daily_df["Date"],
-            y=daily_df["rolling_volatility"],
+            x=vol_df["Date"],
+            y=vol_df["rolling_volatility"],
             name="Volatility (%)",
-            mode="lines+markers",
+            mode="lines+markers" if len(vol_df) <= 60 else "lines",
             yaxis="y2",
             line=dict(width=3, dash="dot")
         )
     )
 
+    # Projected ±1σ price band from the GARCH(1,1) / EWMA forecast
+    band = load_forecast_band(selected_coin) if show_forecast else None
+
+    if band is not None:
+        last_date = pd.Timestamp(price_df["Date"].iloc[-1])
+        last_price = price_df["price"].iloc[-1]
+        band_dates = [last_date + pd.Timedelta(days=d) for d in range(len(band) + 1)]
+        band_sigma = np.array([0.0] + band)
+
+        fig.add_trace(
+            go.Scatter(
+                x=band_dates,
+                y=last_price * np.exp(band_sigma),
+                name="Forecast +1σ",
+                mode="lines",
+                line=dict(width=1, dash="dash")
+            )
+        )
+
+        fig.add_trace(
+            go.Scatter(
+                x=band_dates,
+                y=last_price * np.exp(-band_sigma),
+                name="Forecast −1σ",
+                mode="lines",
+                fill="tonexty",
+                line=dict(width=1, dash="dash")
+            )
+        )
+
     fig.update_layout(
         template="plotly_dark",
         title=f"{selected_coin} Price & Volatility Trends",
         xaxis=dict(title="Date"),
-        yaxis=dict(title="Price (USD)"),
+        yaxis=dict(title=f"Price ({currency.upper()})"),
         yaxis2=dict(
             title="Volatility (%)",
             overlaying="y",
@@ -234,55 +388,24 @@ if hist_df is not None:
     st.plotly_chart(fig, use_container_width=True)
 
 else:
-    st.warning("Live data could not be fetched for the selected coin.")
+    st.warning("No price history for the selected coin: it is not in the local store "
+               "and could not be fetched.")
 
 
 # ---------------- RISK METRICS TABLE ----------------
+perf.section("risk table")
 st.subheader("📌 Risk Metrics Summary")
 
-def color_risk_level(val):
-    if val == "Stable":
-        return "background-color: #2ecc71; color: black"
-    elif val == "Alert":
-        return "background-color: #f1c40f; color: black"
-    else:
-        return "background-color: #e74c3c; color: white"
-
-styled_df = df.style.map(color_risk_level, subset=["Risk Level"])
-st.dataframe(styled_df, use_container_width=True)
+# Cell colours come precomputed with the snapshot; only the (per-session)
+# Styler is built here
+from crypto_risk.snapshot import styled_table
+st.dataframe(styled_table(df, snapshot.level_css), use_container_width=True)
 
 # ---------------- INTERACTIVE BAR CHART ----------------
+perf.section("bar chart")
 st.subheader("📈 Risk Score Comparison ")
 
-# Define color mapping for risk levels
-risk_colors = {
-    "Stable": "#2ecc71",
-    "Alert": "#f1c40f",
-    "Extreme": "#e74c3c"
-}
-
-fig = px.bar(
-    df,
-    x="Coin",
-    y="Risk Score",
-    color="Risk Level",
-    color_discrete_map=risk_colors,
-    text="Risk Score",
-    title="Risk Score Comparison Across Cryptocurrencies",
-    template="plotly_dark"
-)
-
-fig.update_traces(
-    texttemplate='%{text:.2f}',
-    textposition='outside'
-)
-
-fig.update_layout(
-    xaxis_title="Cryptocurrency",
-    yaxis_title="Risk Score",
-    hovermode="x unified",
-    height=450
-)
+fig = snapshot.figures["risk_score"]
 
 st.plotly_chart(fig, use_container_width=True)
 
@@ -292,108 +415,123 @@ st.plotly_chart(fig, use_container_width=True)
 
 import plotly.express as px
 
+perf.section("risk-return chart")
 st.subheader("⚖️ Risk–Return Analysis")
 
-risk_return_data = []
-
-for coin in df["Coin"]:
-    temp_df = fetch_live_data(coin)
+# Built by the pipeline from the same daily panel (see crypto_risk/snapshot.py)
+fig_rr = snapshot.figures.get("risk_return")
 
-    if temp_df is not None:
-        temp_df["date"] = pd.to_datetime(temp_df["date"])
+if fig_rr is not None:
+    st.plotly_chart(fig_rr, use_container_width=True)
+else:
+    st.warning("Not enough daily price history for the risk–return chart.")
 
-        # Daily average price
-        daily_df = (
-            temp_df
-            .groupby(temp_df["date"].dt.date)
-            .agg({"price": "mean"})
-            .reset_index()
-        )
+# =====================================================
+# ✅ CORRELATION MATRIX & PORTFOLIO VOLATILITY
+# =====================================================
 
-        # Daily returns
-        daily_df["daily_return"] = daily_df["price"].pct_change()
-
-        avg_return = daily_df["daily_return"].mean() * 100
-        volatility = daily_df["daily_return"].std() * 100
-
-        risk_return_data.append({
-            "Coin": coin,
-            "Return (%)": avg_return,
-            "Volatility (%)": volatility
-        })
-
-# Create DataFrame
-rr_df = pd.DataFrame(risk_return_data)
-
-# 🔧 FIX: Bubble size must be positive
-rr_df["Bubble Size"] = rr_df["Return (%)"].abs()
-
-# ---------------- PLOTLY SCATTER ----------------
-fig_rr = px.scatter(
-    rr_df,
-    x="Volatility (%)",
-    y="Return (%)",
-    color="Coin",
-    size="Bubble Size",
-    hover_name="Coin",
-    template="plotly_dark",
-    title="Risk–Return Comparison Across Cryptocurrencies",
-    height=450
-)
+perf.section("correlation")
+st.subheader("🔗 Correlation Matrix")
 
-fig_rr.update_traces(
-    marker=dict(
-        line=dict(width=1, color="white"),
-        sizemode="area",
-        sizeref=2. * rr_df["Bubble Size"].max() / (40 ** 2),
-        sizemin=8
+@perf.cached(st.cache_data(ttl=3600))
+def load_covariance(coin_names, estimator):
+    """Coins, correlation matrix and equal-weight portfolio volatility."""
+    from crypto_risk.portfolio import (
+        STATE_FILE as COVARIANCE_STATE, IncrementalCovariance, aligned_returns, correlation,
+        ewma_covariance, portfolio_volatility, sample_covariance, shrinkage_covariance
     )
-)
 
-fig_rr.update_layout(
-    xaxis_title="Volatility (%)",
-    yaxis_title="Return (%)",
-    hovermode="closest"
+    coin_ids = {name: COINS[name] for name in coin_names if name in COINS}
+
+    # Incremental EWMA state is maintained by the background scheduler
+    cov = None
+    if estimator == "EWMA (incremental)" and os.path.exists(COVARIANCE_STATE):
+        state = IncrementalCovariance.load(COVARIANCE_STATE)
+        if state.coins == list(coin_ids):
+            coins, cov = state.coins, state.ewma
+
+    if cov is None:
+        returns = aligned_returns(get_store(), coin_ids, freq="1h", days=30)
+        if returns.empty:
+            return [], None, None
+
+        if estimator == "Shrinkage (Ledoit-Wolf)":
+            cov, _ = shrinkage_covariance(returns)
+        elif estimator.startswith("EWMA"):
+            cov = ewma_covariance(returns)
+        else:
+            cov = sample_covariance(returns)
+        coins = list(returns.columns)
+
+    return coins, correlation(cov), portfolio_volatility(cov, [1] * len(coins))
+
+estimator = st.radio(
+    "Estimator",
+    ["Sample", "EWMA (incremental)", "Shrinkage (Ledoit-Wolf)"],
+    horizontal=True
 )
 
-st.plotly_chart(fig_rr, use_container_width=True)
+corr_coins, corr, equal_weight_volatility = load_covariance(tuple(df["Coin"]), estimator)
+
+if corr is not None:
+    fig_corr = px.imshow(
+        corr,
+        x=corr_coins,
+        y=corr_coins,
+        zmin=-1,
+        zmax=1,
+        color_continuous_scale="RdBu_r",
+        text_auto=".2f" if len(corr_coins) <= 20 else False,
+        template="plotly_dark",
+        title="Hourly Return Correlation (last 30 days)",
+        height=450
+    )
+    st.plotly_chart(fig_corr, use_container_width=True)
+
+    st.metric(
+        "Equal-Weight Portfolio Volatility (%)",
+        f"{equal_weight_volatility:.2f}"
+    )
+else:
+    st.warning("Not enough aligned price history to compute correlations.")
 
 # =====================================================
 # ✅ RISK CLASSIFICATION DASHBOARD (MILESTONE)
 # =====================================================
 
+perf.section("classification cards")
 st.subheader("🚦 Risk Classification Dashboard")
 
-# Group data by Risk Level
-high_risk = df[df["Risk Level"] == "Extreme"]
-medium_risk = df[df["Risk Level"] == "Alert"]
-low_risk = df[df["Risk Level"] == "Stable"]
+# Coins grouped by Risk Level in the snapshot: [coin, score] pairs
+high_risk = snapshot.buckets["Extreme"]
+medium_risk = snapshot.buckets["Alert"]
+low_risk = snapshot.buckets["Stable"]
 
 # ---------------- RISK CARDS ----------------
 c1, c2, c3 = st.columns(3)
 
 with c1:
     st.markdown("### 🔴 High Risk")
-    for _, row in high_risk.iterrows():
-        st.markdown(f"**{row['Coin']}** — {row['Risk Score']:.2f}%")
+    for coin, score in high_risk:
+        st.markdown(f"**{coin}** — {score:.2f}%")
 
 with c2:
     st.markdown("### 🟡 Medium Risk")
-    for _, row in medium_risk.iterrows():
-        st.markdown(f"**{row['Coin']}** — {row['Risk Score']:.2f}%")
+    for coin, score in medium_risk:
+        st.markdown(f"**{coin}** — {score:.2f}%")
 
 with c3:
     st.markdown("### 🟢 Low Risk")
-    for _, row in low_risk.iterrows():
-        st.markdown(f"**{row['Coin']}** — {row['Risk Score']:.2f}%")
+    for coin, score in low_risk:
+        st.markdown(f"**{coin}** — {score:.2f}%")
 
 st.divider()
 
 # ---------------- RISK SUMMARY REPORT ----------------
 st.subheader("📌 Risk Summary Report")
 
-total_coins = len(df)
-avg_risk = df["Risk Score"].mean()
+total_coins = snapshot.summary["total"]
+avg_risk = snapshot.summary["avg_risk"]
 
 col4, col5, col6 = st.columns(3)
 
@@ -405,29 +543,59 @@ col6.metric(
 )
 
 # ---------------- DONUT CHART ----------------
-risk_dist_df = pd.DataFrame({
-    "Risk Level": ["High", "Medium", "Low"],
-    "Count": [len(high_risk), len(medium_risk), len(low_risk)]
-})
-
-fig_donut = px.pie(
-    risk_dist_df,
-    names="Risk Level",
-    values="Count",
-    hole=0.55,
-    color="Risk Level",
-    color_discrete_map={
-        "High": "#e74c3c",
-        "Medium": "#f1c40f",
-        "Low": "#2ecc71"
-    },
-    title="Risk Distribution",
-    template="plotly_dark"
-)
+fig_donut = snapshot.figures["risk_distribution"]
 
 st.plotly_chart(fig_donut, use_container_width=True)
 
+# =====================================================
+# ✅ SCENARIO EXPLORER (PRECOMPUTED SWEEP CUBE)
+# =====================================================
+
+perf.section("scenario explorer")
+
+@perf.cached(st.cache_resource)
+def load_sweep_cube(path, mtime):
+    from crypto_risk.sweep import SweepCube
+
+    # `mtime` is only part of the cache key, so a new sweep is picked up
+    return SweepCube(path)
+
+def current_sweep_cube():
+    from crypto_risk.sweep import CUBE_FILE
+
+    if not os.path.exists(CUBE_FILE):
+        return None
+    return load_sweep_cube(CUBE_FILE, os.path.getmtime(CUBE_FILE))
+
+cube = current_sweep_cube()
+
+if cube is not None:
+    st.subheader("🧪 Scenario Explorer")
+    st.caption("Slices of `python -m crypto_risk sweep`; nothing is recomputed here.")
+
+    # Closest cube point to the production settings (7-point window, 0.6 weight)
+    default_window = min(cube.windows, key=lambda w: abs(w - 7))
+    default_weight = min(cube.weights, key=lambda w: abs(w - 0.6))
+
+    s1, s2, s3 = st.columns(3)
+    sweep_window = s1.select_slider("Rolling window", options=cube.windows,
+                                    value=default_window)
+    sweep_weight = s2.select_slider("Overall volatility weight", options=cube.weights,
+                                    value=default_weight)
+    sweep_quantiles = s3.selectbox("Stable / Extreme cut-offs", cube.quantiles,
+                                   format_func=lambda q: f"{q[0]:.0%} / {q[1]:.0%}")
+
+    scenario_df = cube.table(sweep_window, sweep_weight, sweep_quantiles)
+    st.dataframe(styled_table(scenario_df), use_container_width=True)
+
+    baseline = (default_window, default_weight, cube.quantiles[0])
+    changes = cube.level_changes(baseline, (sweep_window, sweep_weight, sweep_quantiles))
+    st.write(f"{len(changes)} coin(s) change Risk Level versus the default settings")
+    if len(changes):
+        st.dataframe(changes, use_container_width=True)
+
 # ---------------- EXPORT OPTIONS ----------------
+perf.section("export")
 st.subheader("📤 Export Results")
 
 c7, c8 = st.columns(2)
@@ -435,7 +603,7 @@ c7, c8 = st.columns(2)
 with c7:
     st.download_button(
         "⬇ Download CSV",
-        data=df.to_csv(index=False),
+        data=snapshot.csv,
         file_name="final_risk_analysis.csv",
         mime="text/csv"
     )
@@ -444,108 +612,58 @@ with c7:
 # ✅ FULL DASHBOARD PDF EXPORT (WITH VISUALS)
 # =====================================================
 
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle, Image
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from io import BytesIO
-from datetime import datetime
-import tempfile
-
 st.subheader("📄 Download Full Dashboard Report (PDF)")
 
-def generate_full_pdf(df, fig_rr, fig_donut, fig_bar):
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    styles = getSampleStyleSheet()
-    elements = []
-
-    # Title
-    elements.append(Paragraph(
-        "<b>Crypto Volatility & Risk Analyzer – Final Dashboard Report</b>",
-        styles["Title"]
-    ))
-
-    elements.append(Paragraph(
-        f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-        styles["Normal"]
-    ))
-
-    elements.append(Paragraph("<br/>", styles["Normal"]))
-
-    # -------- Risk Classification Summary --------
-    elements.append(Paragraph("<b>Risk Classification Summary</b>", styles["Heading2"]))
-
-    stable = df[df["Risk Level"] == "Stable"]["Coin"].tolist()
-    alert = df[df["Risk Level"] == "Alert"]["Coin"].tolist()
-    extreme = df[df["Risk Level"] == "Extreme"]["Coin"].tolist()
-
-    elements.append(Paragraph(
-        f"<b>Stable:</b> {', '.join(stable) if stable else 'None'}<br/>"
-        f"<b>Alert:</b> {', '.join(alert) if alert else 'None'}<br/>"
-        f"<b>Extreme:</b> {', '.join(extreme) if extreme else 'None'}",
-        styles["Normal"]
-    ))
-
-    elements.append(Paragraph("<br/>", styles["Normal"]))
-
-
-    # -------- Risk Metrics Table --------
-    elements.append(Paragraph("<b>Final Risk Metrics</b>", styles["Heading2"]))
-
-    table_data = [list(df.columns)] + df.values.tolist()
-    table = Table(table_data, repeatRows=1)
-    table.setStyle(TableStyle([
-        ("GRID", (0,0), (-1,-1), 1, colors.black),
-        ("BACKGROUND", (0,0), (-1,0), colors.darkgray),
-        ("TEXTCOLOR", (0,0), (-1,0), colors.whitesmoke),
-        ("ALIGN", (0,0), (-1,-1), "CENTER"),
-    ]))
-    elements.append(table)
-
-    elements.append(Paragraph("<br/>", styles["Normal"]))
-
-    # -------- Risk Score Comparison --------
-    with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_bar:
-        fig_bar.write_image(tmp_bar.name)
-        elements.append(Paragraph("<b>Risk Score Comparison</b>", styles["Heading2"]))
-        elements.append(Image(tmp_bar.name, width=400, height=300))
-
-    elements.append(Paragraph("<br/>", styles["Normal"]))
-
-    # -------- Save Plotly Charts as Images --------
-    with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp1:
-        fig_rr.write_image(tmp1.name)
-        elements.append(Paragraph("<b>Risk–Return Comparison</b>", styles["Heading2"]))
-        elements.append(Image(tmp1.name, width=400, height=300))
-
-    elements.append(Paragraph("<br/>", styles["Normal"]))
-
-    with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp2:
-        fig_donut.write_image(tmp2.name)
-        elements.append(Paragraph("<b>Risk Distribution</b>", styles["Heading2"]))
-        elements.append(Image(tmp2.name, width=300, height=300))
-
-    # Footer
-    elements.append(Paragraph("<br/><br/>", styles["Normal"]))
-    elements.append(Paragraph(
-        "Internship Project | Crypto Volatility & Risk Analyzer",
-        styles["Normal"]
-    ))
-
-    doc.build(elements)
-    buffer.seek(0)
-    return buffer
-
-pdf_file = generate_full_pdf(df, fig_rr, fig_donut, fig)
-
-st.download_button(
-    "⬇ Download Complete Dashboard PDF",
-    data=pdf_file,
-    file_name="Crypto_Dashboard_Report.pdf",
-    mime="application/pdf"
-)
+# Cached by content: Streamlit hashes the DataFrame and the figure JSON specs,
+# so the render + ReportLab work only reruns when the inputs change.
+@perf.cached(st.cache_data(max_entries=8, show_spinner=False))
+def generate_full_pdf(df, fig_rr_json, fig_donut_json, fig_bar_json):
+    # ReportLab and kaleido are only imported once a PDF is actually requested
+    from crypto_risk.report import build_pdf
+
+    charts = [
+        ("Risk Score Comparison", fig_bar_json, 400, 300),
+        ("Risk–Return Comparison", fig_rr_json, 400, 300),
+        ("Risk Distribution", fig_donut_json, 300, 300),
+    ]
+    return build_pdf(df, [chart for chart in charts if chart[1] is not None])
+
+# Build the PDF only once the user asks for it, and only for the snapshot
+# it was asked for: a newer snapshot needs a new click
+if st.button("🛠 Generate Dashboard PDF"):
+    st.session_state["pdf_requested"] = snapshot.created
+
+if st.session_state.get("pdf_requested") == snapshot.created:
+    with st.spinner("Building PDF report..."):
+        pdf_file = generate_full_pdf(
+            df,
+            snapshot.figure_json.get("risk_return"),
+            snapshot.figure_json["risk_distribution"],
+            snapshot.figure_json["risk_score"]
+        )
+
+    st.download_button(
+        "⬇ Download Complete Dashboard PDF",
+        data=pdf_file,
+        file_name="Crypto_Dashboard_Report.pdf",
+        mime="application/pdf"
+    )
 # ---------------- FOOTER ----------------
 
 st.markdown("---")
 st.caption("Internship Project | Crypto Volatility & Risk Analyzer")
+
+# ---------------- PERFORMANCE PANEL ----------------
+if perf.end_run(perf_run):
+    with st.expander("⏱️ Performance (this rerun)"):
+        st.caption(f"Total {perf_run.total_ms:.0f} ms · logged to {perf.LOG_FILE}")
+
+        spans_df = pd.DataFrame(perf_run.spans)
+        spans_df["name"] = ["  " * d + n for n, d in zip(spans_df["name"], spans_df["depth"])]
+        st.dataframe(spans_df[["name", "ms"]], use_container_width=True)
+
+        if perf_run.cache:
+            st.dataframe(
+                pd.DataFrame(perf_run.cache).T.rename_axis("cache").reset_index(),
+                use_container_width=True
+            )
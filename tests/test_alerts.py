@@ -0,0 +1,63 @@
+import threading
+import time
+
+import numpy as np
+
+from crypto_risk.alerts import AlertEngine, QueueSink, WebhookSink
+
+
+class BlockingSession:
+    """Stands in for requests.Session; every post waits for `release`."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.posted = []
+
+    def post(self, url, json=None, timeout=None):
+        self.release.wait()
+        self.posted.append(json)
+        return self
+
+    def raise_for_status(self):
+        pass
+
+
+def test_webhook_emit_does_not_wait_for_delivery():
+    session = BlockingSession()
+    sink = WebhookSink("http://example.invalid/alerts", session=session, maxsize=3)
+
+    start = time.perf_counter()
+    for i in range(10):
+        sink.emit({"n": i})
+    assert time.perf_counter() - start < 0.5
+
+    # One event is in flight, three wait in the queue, the rest are dropped
+    session.release.set()
+    sink.close()
+    assert sink.dropped == 10 - len(session.posted)
+    assert 3 <= len(session.posted) <= 4
+    assert [event["n"] for event in session.posted] == sorted(event["n"] for event in session.posted)
+
+
+def test_queue_sink_counts_overflow():
+    sink = QueueSink(maxsize=2)
+    for i in range(5):
+        sink.emit(i)
+    assert sink.queue.qsize() == 2
+    assert sink.dropped == 3
+
+
+def test_engine_scores_follow_current_volatility():
+    rng = np.random.default_rng(0)
+    returns = np.r_[rng.normal(0, 0.05, 2000), rng.normal(0, 0.001, 2000)]
+    prices = 100 * np.cumprod(1 + returns)
+
+    windowed = AlertEngine(overall_window=48)
+    expanding = AlertEngine(overall_window=None)
+    for engine in (windowed, expanding):
+        engine.seed("bitcoin", prices)
+
+    # Only the calm last 48 hours count for the windowed engine
+    calm = np.std(returns[-48:], ddof=1) * 100
+    assert windowed.monitor.estimator("bitcoin").overall_volatility < 2 * calm
+    assert expanding.monitor.estimator("bitcoin").overall_volatility > 10 * calm
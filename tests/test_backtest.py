@@ -0,0 +1,53 @@
+import numpy as np
+
+from crypto_risk.backtest import run_backtest, window_std
+
+
+def random_prices(n_points=24 * 60, n_coins=6, seed=0):
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0, 0.01, (n_points, n_coins)) * rng.uniform(0.5, 3, n_coins)
+    return 100 * np.cumprod(1 + returns, axis=0)
+
+
+def test_window_std_matches_numpy():
+    x = np.random.default_rng(1).normal(size=(50, 3))
+    std = window_std(x, 10)
+
+    assert np.isnan(std[:9]).all()
+    np.testing.assert_allclose(std[9:, 0], [x[t - 9:t + 1, 0].std(ddof=1) for t in range(9, 50)])
+
+
+def test_windows_touching_filled_cells_are_not_scored():
+    prices = random_prices()
+    observed = np.ones(prices.shape, dtype=bool)
+
+    # Coin 0 has a 2-day hole, forward-filled as a flat stretch
+    hole = slice(24 * 30, 24 * 32)
+    prices[hole, 0] = prices[hole.start - 1, 0]
+    observed[hole, 0] = False
+
+    result = run_backtest(prices, 24, days=10, horizon=3, observed=observed)
+    ends = result["ends"]
+
+    # Returns hole.start .. hole.stop are padded or span the gap; the step
+    # at row e is scored on returns e - lookback + 1 .. e and judged on e + 1 .. e + ahead
+    first_bad, last_bad = hole.start, hole.stop
+    touches = (ends >= first_bad) & (ends - 24 * 10 + 1 <= last_bad)
+    touches |= (ends + 1 <= last_bad) & (ends + 24 * 3 >= first_bad)
+
+    assert touches.any() and (~touches).any()
+    assert (result["levels"][touches, 0] == -1).all()
+    assert (result["realized"][touches, 0] == -1).all()
+    assert (result["levels"][~touches, 0] >= 0).all()
+
+    # Other coins are scored at every step
+    assert (result["levels"][:, 1:] >= 0).all()
+
+
+def test_without_mask_the_flat_stretch_is_scored():
+    prices = random_prices()
+    hole = slice(24 * 30, 24 * 32)
+    prices[hole, 0] = prices[hole.start - 1, 0]
+
+    result = run_backtest(prices, 24, days=10, horizon=3)
+    assert (result["levels"][:, 0] >= 0).all()
@@ -0,0 +1,60 @@
+import time
+
+import pytest
+import requests
+
+from crypto_risk import config
+from crypto_risk.fetcher import create_session, fetch_market_chart, get_json
+from crypto_risk.stub_api import serve
+
+PATH = "/coins/bitcoin/market_chart"
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    servers = []
+
+    def start(**options):
+        server = serve(port=0, background=True, **options)
+        servers.append(server)
+        monkeypatch.setattr(config, "API_URL", f"http://127.0.0.1:{server.server_address[1]}")
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_retries_until_the_server_recovers(stub):
+    server = stub(fail_first=2, fail_status=503)
+
+    data = get_json(create_session(1), PATH, {"vs_currency": "usd", "days": "2"}, backoff=0.01)
+    assert len(data["prices"]) >= 47
+    assert server.attempts[PATH] == 3
+
+
+def test_retry_after_is_honoured(stub):
+    stub(fail_first=1, retry_after=0.5)
+
+    start = time.perf_counter()
+    get_json(create_session(1), PATH, {"vs_currency": "usd", "days": "2"}, backoff=0.01)
+    assert 0.5 <= time.perf_counter() - start < 2
+
+
+def test_gives_up_after_the_last_retry(stub):
+    server = stub(fail_first=10, fail_status=503)
+
+    with pytest.raises(requests.HTTPError):
+        get_json(create_session(1), PATH, {"vs_currency": "usd", "days": "2"},
+                 retries=2, backoff=0.01)
+    assert server.attempts[PATH] == 3
+
+
+def test_interactive_settings_do_not_wait_out_a_long_retry_after(stub):
+    server = stub(fail_first=10, retry_after=30)
+
+    start = time.perf_counter()
+    assert fetch_market_chart("bitcoin", 2, **config.INTERACTIVE_RETRY) is None
+    assert time.perf_counter() - start < 2
+    assert server.attempts[PATH] == 1
@@ -0,0 +1,56 @@
+import csv
+import threading
+
+from crypto_risk.login_store import LoginStore
+
+THREADS = 8
+LOGINS = 50
+
+
+def run_threads(target):
+    barrier = threading.Barrier(THREADS)
+    errors = []
+
+    def worker(n):
+        try:
+            barrier.wait()
+            target(n)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+def test_concurrent_first_use_imports_the_legacy_csv_once(tmp_path):
+    legacy = tmp_path / "users.csv"
+    with open(legacy, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Username", "Email", "Login Time"])
+        writer.writerows([["old", "old@example.com", "2024-01-01 00:00:00"]] * 3)
+
+    db_path = str(tmp_path / "users.db")
+    run_threads(lambda n: LoginStore(db_path, legacy_csv=str(legacy)))
+
+    assert LoginStore(db_path, legacy_csv=str(legacy)).count() == 3
+
+
+def test_concurrent_logins_are_all_recorded_once(tmp_path):
+    db_path = str(tmp_path / "users.db")
+
+    def login_many(n):
+        store = LoginStore(db_path, legacy_csv=None)
+        for i in range(LOGINS):
+            store.record(f"user{n}", f"user{n}@example.com", f"2024-01-01 00:00:{i:02d}")
+
+    run_threads(login_many)
+
+    store = LoginStore(db_path, legacy_csv=None)
+    assert store.count() == THREADS * LOGINS
+    for n in range(THREADS):
+        recent = store.recent(f"user{n}", limit=3)
+        assert [row[2] for row in recent] == [f"2024-01-01 00:00:{i:02d}" for i in (49, 48, 47)]
@@ -0,0 +1,38 @@
+import numpy as np
+
+from crypto_risk.panel import PricePanel
+
+HOUR_MS = 60 * 60 * 1000
+
+
+def hourly(start_hour, prices):
+    timestamps = (start_hour + np.arange(len(prices), dtype="int64")) * HOUR_MS
+    return timestamps, np.asarray(prices, dtype="float64")
+
+
+def test_coin_that_ends_early_is_not_filled_to_the_end():
+    panel = PricePanel.from_arrays({
+        "full": hourly(0, np.arange(1.0, 13.0)),
+        "short": hourly(0, [5.0, 6.0, 7.0, 8.0])
+    })
+
+    short = panel["short"]
+    assert len(panel) == 12
+    np.testing.assert_array_equal(short[:4], [5.0, 6.0, 7.0, 8.0])
+    assert np.isnan(short[4:]).all()
+
+    # No flat tail, so no zero returns after the history stops
+    returns = panel.returns()[:, panel.coins.index("short")]
+    assert np.isnan(returns[4:]).all()
+
+
+def test_gaps_inside_history_are_filled_and_late_start_stays_nan():
+    timestamps = np.array([0, 1, 4, 5], dtype="int64") * HOUR_MS
+    panel = PricePanel.from_arrays({
+        "gappy": (timestamps, np.array([1.0, 2.0, 3.0, 4.0])),
+        "late": hourly(3, [9.0, 10.0, 11.0])
+    })
+
+    np.testing.assert_array_equal(panel["gappy"], [1.0, 2.0, 2.0, 2.0, 3.0, 4.0])
+    assert np.isnan(panel["late"][:3]).all()
+    np.testing.assert_array_equal(panel["late"][3:], [9.0, 10.0, 11.0])
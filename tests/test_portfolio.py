@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from crypto_risk.portfolio import IncrementalCovariance
+
+COINS = ["bitcoin", "ethereum", "solana"]
+
+
+def random_returns(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.normal(0.001, 0.02, (n, len(COINS))) @ rng.uniform(0.5, 1.5, (3, 3))
+    values[rng.choice(n, 20, replace=False), rng.integers(0, 3, 20)] = np.nan
+    index = pd.date_range("2024-01-01", periods=n, freq="h")
+    return pd.DataFrame(values, index=index, columns=COINS)
+
+
+def feed(state, returns, batch_sizes):
+    start = 0
+    for size in batch_sizes:
+        state.update(returns.iloc[start:start + size])
+        start += size
+    return returns.iloc[:start]
+
+
+def test_windowed_covariance_matches_numpy_on_the_window():
+    returns = random_returns()
+    state = IncrementalCovariance(COINS, window=50)
+
+    start = 0
+    for size in [1, 7, 30, 3, 60, 2, 100, 1, 40, 90, 66]:
+        state.update(returns.iloc[start:start + size])
+        start += size
+
+        complete = returns.iloc[:start].dropna().to_numpy()[-50:]
+        if len(complete) > 1:
+            np.testing.assert_allclose(state.covariance, np.cov(complete, rowvar=False),
+                                       rtol=1e-9, atol=1e-15)
+
+
+def test_expanding_covariance_matches_numpy():
+    returns = random_returns(seed=1)
+    state = IncrementalCovariance(COINS)
+    seen = feed(state, returns, [10, 90, 3, 200])
+
+    np.testing.assert_allclose(state.covariance, np.cov(seen.dropna().to_numpy(), rowvar=False),
+                               rtol=1e-9)
+
+
+def test_windowed_state_survives_save_and_load(tmp_path):
+    returns = random_returns(seed=2)
+    path = str(tmp_path / "state.npz")
+
+    state = IncrementalCovariance(COINS, window=50)
+    feed(state, returns, [120, 15])
+    state.save(path)
+
+    resumed = IncrementalCovariance.load(path)
+    assert resumed.window == 50
+    resumed.update(returns.iloc[135:160])
+
+    complete = returns.iloc[:160].dropna().to_numpy()[-50:]
+    np.testing.assert_allclose(resumed.covariance, np.cov(complete, rowvar=False), rtol=1e-9)
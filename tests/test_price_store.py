@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+
+from crypto_risk.price_store import HOURLY_MAX_DAYS, MIN_FETCH_DAYS, MS_PER_DAY, PriceStore
+from crypto_risk.sources import SyntheticSource
+
+HOUR_MS = 60 * 60 * 1000
+
+
+class RecordingSource(SyntheticSource):
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.ranges = []
+
+    def fetch_range(self, coin_id, start_ms, end_ms, vs_currency="usd", **kwargs):
+        self.ranges.append((start_ms, end_ms))
+        return super().fetch_range(coin_id, start_ms, end_ms, vs_currency, **kwargs)
+
+
+def test_long_gap_is_fetched_whole_in_hourly_ranges(tmp_path):
+    source = RecordingSource(seed=0, history_days=400, speed=0)
+    store = PriceStore(str(tmp_path), source=source)
+
+    # A store last updated more than a year ago
+    first_ms = source.start_ms - 400 * MS_PER_DAY
+    store.append("bitcoin", source.fetch_range("bitcoin", first_ms, first_ms + 3 * MS_PER_DAY))
+    source.ranges.clear()
+
+    written = store.update(["bitcoin"])
+
+    timestamps, _ = store.backend.read("bitcoin")
+    assert written["bitcoin"] > 0
+    assert np.diff(timestamps).max() == HOUR_MS
+    assert timestamps[-1] == source.start_ms
+
+    spans = [(end - start) / MS_PER_DAY for start, end in source.ranges]
+    assert len(spans) == 5
+    assert all(MIN_FETCH_DAYS <= span <= HOURLY_MAX_DAYS for span in spans)
+
+
+def test_short_gap_keeps_one_days_request(tmp_path):
+    source = RecordingSource(seed=0, history_days=60, speed=0)
+    store = PriceStore(str(tmp_path), source=source)
+
+    first_ms = source.start_ms - 60 * MS_PER_DAY
+    store.append("bitcoin", source.fetch_range("bitcoin", first_ms, first_ms + 3 * MS_PER_DAY))
+    source.ranges.clear()
+
+    assert store.missing_days("bitcoin", source.start_ms) == 57
+    store.update(["bitcoin"])
+
+    timestamps, _ = store.backend.read("bitcoin")
+    assert source.ranges == []
+    assert np.diff(timestamps).max() == HOUR_MS
+    assert timestamps[-1] == source.start_ms
+
+
+def test_planner_fills_a_gap_longer_than_the_horizon(tmp_path):
+    from crypto_risk.planner import QueryPlanner
+
+    source = RecordingSource(seed=0, history_days=200, speed=0)
+    store = PriceStore(str(tmp_path), source=source)
+
+    # 7-day history that went stale 150 days ago
+    first_ms = source.start_ms - 157 * MS_PER_DAY
+    store.append("bitcoin", source.fetch_range("bitcoin", first_ms, first_ms + 7 * MS_PER_DAY))
+    source.ranges.clear()
+
+    QueryPlanner(store).execute([("bitcoin", 7, "usd")])
+
+    timestamps, _ = store.backend.read("bitcoin")
+    assert np.diff(timestamps).max() == HOUR_MS
+    assert timestamps[-1] == source.start_ms
+    assert len(source.ranges) == 2
+
+
+def test_offline_sources_get_their_own_root(tmp_path, monkeypatch):
+    from crypto_risk.sources import LiveSource
+
+    monkeypatch.chdir(tmp_path)
+    assert PriceStore(source=LiveSource()).root == "data"
+    assert PriceStore(source=SyntheticSource(speed=0)).root == os.path.join("data", "synthetic")
+    assert PriceStore("scratch", source=SyntheticSource(speed=0)).root == "scratch"
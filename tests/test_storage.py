@@ -0,0 +1,89 @@
+import os
+import stat
+
+import numpy as np
+import pandas as pd
+
+from crypto_risk.storage import NumpyBackend, write_csv_atomic
+
+
+def write_tmp_columns(backend, coin_id, timestamps, prices):
+    for path, values, dtype in ((backend._price_path(coin_id), prices, "<f8"),
+                                (backend.path(coin_id), timestamps, "<i8")):
+        with open(path + ".tmp", "wb") as f:
+            f.write(np.asarray(values, dtype=dtype).tobytes())
+
+
+def test_replace_then_append(tmp_path):
+    backend = NumpyBackend(str(tmp_path))
+    backend.append("coin", np.array([3, 4]), np.array([30.0, 40.0]))
+    backend.replace("coin", np.array([1, 2, 3, 4]), np.array([10.0, 20.0, 30.0, 40.0]))
+    backend.append("coin", np.array([5]), np.array([50.0]))
+
+    timestamps, prices = backend.read("coin")
+    np.testing.assert_array_equal(timestamps, [1, 2, 3, 4, 5])
+    np.testing.assert_array_equal(prices, [10.0, 20.0, 30.0, 40.0, 50.0])
+    assert sorted(os.listdir(tmp_path)) == ["coin.px.f8", "coin.ts.i8"]
+
+
+def test_replace_interrupted_after_commit_is_finished(tmp_path):
+    backend = NumpyBackend(str(tmp_path))
+    backend.append("coin", np.array([3, 4]), np.array([30.0, 40.0]))
+
+    # Died after the marker and the first rename: prices new, timestamps still in .tmp
+    write_tmp_columns(backend, "coin", [1, 2, 3, 4], [10.0, 20.0, 30.0, 40.0])
+    open(backend._marker_path("coin"), "w").close()
+    os.replace(backend._price_path("coin") + ".tmp", backend._price_path("coin"))
+
+    # Readers already see the new version as a whole
+    timestamps, prices = backend.read("coin")
+    np.testing.assert_array_equal(timestamps, [1, 2, 3, 4])
+    np.testing.assert_array_equal(prices, [10.0, 20.0, 30.0, 40.0])
+
+    backend.append("coin", np.array([5]), np.array([50.0]))
+    timestamps, prices = backend.read("coin")
+    np.testing.assert_array_equal(timestamps, [1, 2, 3, 4, 5])
+    np.testing.assert_array_equal(prices, timestamps * 10.0)
+    assert not os.path.exists(backend._marker_path("coin"))
+
+
+def test_replace_interrupted_before_commit_is_discarded(tmp_path):
+    backend = NumpyBackend(str(tmp_path))
+    backend.append("coin", np.array([3, 4]), np.array([30.0, 40.0]))
+    write_tmp_columns(backend, "coin", [1, 2, 3, 4], [10.0, 20.0, 30.0, 40.0])
+
+    backend.append("coin", np.array([5]), np.array([50.0]))
+    timestamps, prices = backend.read("coin")
+    np.testing.assert_array_equal(timestamps, [3, 4, 5])
+    np.testing.assert_array_equal(prices, [30.0, 40.0, 50.0])
+    assert sorted(os.listdir(tmp_path)) == ["coin.px.f8", "coin.ts.i8"]
+
+
+def test_unequal_columns_are_cut_back_before_appending(tmp_path):
+    backend = NumpyBackend(str(tmp_path))
+    backend.append("coin", np.array([1, 2]), np.array([10.0, 20.0]))
+    with open(backend._price_path("coin"), "ab") as f:
+        f.write(np.array([99.0]).tobytes())
+
+    backend.append("coin", np.array([3]), np.array([30.0]))
+    timestamps, prices = backend.read("coin")
+    np.testing.assert_array_equal(prices, timestamps * 10.0)
+
+
+def test_write_csv_atomic_keeps_permissions(tmp_path):
+    path = str(tmp_path / "results.csv")
+    df = pd.DataFrame({"Coin": ["Bitcoin"], "Risk Score": [1.0]})
+
+    # New file: the usual umask-derived mode, not mkstemp's 0600
+    umask = os.umask(0o022)
+    try:
+        write_csv_atomic(df, path)
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+
+    # Existing file: its mode is kept
+    os.chmod(path, 0o640)
+    write_csv_atomic(df, path)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+    assert pd.read_csv(path).equals(df)
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from crypto_risk.streaming import StreamingRiskMonitor, StreamingVolatility
+
+
+def random_prices(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100 * np.cumprod(1 + rng.normal(0, 0.02, n))
+
+
+def replay(prices, window=7):
+    estimator = StreamingVolatility(window=window)
+    snapshots = [estimator.update(float(price)) for price in prices]
+    return estimator, snapshots
+
+
+def test_overall_volatility_matches_pandas():
+    prices = random_prices()
+    estimator, _ = replay(prices)
+
+    expected = pd.Series(prices).pct_change().std() * 100
+    assert estimator.overall_volatility == pytest.approx(expected, rel=1e-9)
+
+
+def test_window_volatility_matches_rolling_std():
+    prices = random_prices()
+    _, snapshots = replay(prices, window=7)
+
+    # Each tick's window volatility is the rolling std ending at that price
+    expected = pd.Series(prices).pct_change().rolling(window=7).std() * 100
+    streamed = [s["Window Volatility (%)"] for s in snapshots]
+
+    for got, want in zip(streamed, expected):
+        if np.isnan(want):
+            assert got is None
+        else:
+            assert got == pytest.approx(want, rel=1e-6)
+
+
+def test_risk_score_matches_batch_formula():
+    prices = random_prices(seed=1)
+    estimator, _ = replay(prices, window=7)
+
+    returns = pd.Series(prices).pct_change()
+    overall = returns.std() * 100
+    avg_rolling = (returns.rolling(window=7).std() * 100).mean()
+
+    assert estimator.avg_rolling_volatility == pytest.approx(avg_rolling, rel=1e-6)
+    assert estimator.risk_score == pytest.approx(overall * 0.6 + avg_rolling * 0.4, rel=1e-6)
+
+
+def test_not_enough_prices():
+    estimator, _ = replay([100.0, 101.0])
+
+    assert estimator.overall_volatility is None
+    assert estimator.window_volatility is None
+    assert estimator.risk_score is None
+
+
+def test_monitor_keeps_one_estimator_per_coin():
+    monitor = StreamingRiskMonitor(window=7)
+    monitor.seed("bitcoin", random_prices(seed=2))
+    monitor.seed("ethereum", random_prices(seed=3))
+
+    expected = pd.Series(random_prices(seed=3)).pct_change().std() * 100
+    assert set(monitor.snapshot()) == {"bitcoin", "ethereum"}
+    assert monitor.estimators["ethereum"].overall_volatility == pytest.approx(expected, rel=1e-9)
+
+
+def test_window_volatility_does_not_drift():
+    # Large swings followed by a long quiet stretch: the sliding update
+    # alone loses precision here
+    rng = np.random.default_rng(4)
+    returns = np.r_[rng.normal(0, 0.5, 2000), rng.normal(0, 1e-6, 200000)]
+    estimator, _ = replay(100 * np.cumprod(1 + returns), window=24)
+
+    expected = np.std(list(estimator._window._buffer), ddof=1) * 100
+    assert estimator.window_volatility == pytest.approx(expected, rel=1e-9)
+
+
+def test_overall_window_matches_pandas_on_the_last_returns():
+    prices = random_prices(n=2000, seed=5)
+    estimator = StreamingVolatility(window=7, overall_window=240)
+    for price in prices:
+        estimator.update(float(price))
+
+    returns = pd.Series(prices).pct_change().iloc[-240:]
+    overall = returns.std() * 100
+    avg_rolling = (returns.rolling(window=7).std() * 100).mean()
+
+    assert estimator.overall_volatility == pytest.approx(overall, rel=1e-9)
+    assert estimator.avg_rolling_volatility == pytest.approx(avg_rolling, rel=1e-9)
+    assert estimator.risk_score == pytest.approx(overall * 0.6 + avg_rolling * 0.4, rel=1e-9)